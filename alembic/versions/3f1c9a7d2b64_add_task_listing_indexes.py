@@ -0,0 +1,59 @@
+"""add task listing indexes
+
+Revision ID: 3f1c9a7d2b64
+Revises: 5a724b990c3a
+Create Date: 2026-10-17 10:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b64'
+down_revision: Union[str, None] = '5a724b990c3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_STATUSES = ('new', 'in_progress', 'completed')
+
+COMPOSITE_INDEXES = {
+    'ix_tasks_user_id_created_at_id': ['user_id', 'created_at', 'id'],
+    'ix_tasks_user_id_status_created_at_id': ['user_id', 'status', 'created_at', 'id'],
+    'ix_tasks_created_at_id': ['created_at', 'id'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, columns in COMPOSITE_INDEXES.items():
+            op.create_index(
+                name, 'tasks', columns,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        # Partial indexes for the global listing filtered by status.
+        for status in TASK_STATUSES:
+            op.create_index(
+                f'ix_tasks_{status}_created_at_id', 'tasks', ['created_at', 'id'],
+                postgresql_where=sa.text(f"status = '{status}'"),
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for status in TASK_STATUSES:
+            op.drop_index(
+                f'ix_tasks_{status}_created_at_id', table_name='tasks',
+                postgresql_concurrently=True, if_exists=True,
+            )
+        for name in COMPOSITE_INDEXES:
+            op.drop_index(
+                name, table_name='tasks',
+                postgresql_concurrently=True, if_exists=True,
+            )
@@ -0,0 +1,48 @@
+"""add task title trigram index
+
+Revision ID: c4d7e2a9f5b1
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-17 15:12:48.530771
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e2a9f5b1'
+down_revision: Union[str, None] = '8b2e4d6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    available = op.get_bind().scalar(sa.text(
+        "SELECT true FROM pg_available_extensions WHERE name = 'pg_trgm'"))
+    if not available:
+        # Suggestions still work, by scanning the user's tasks.
+        logger.warning("pg_trgm is not available; skipping ix_tasks_title_trgm")
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_title_trgm', 'tasks', ['title'],
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_title_trgm', table_name='tasks',
+            postgresql_concurrently=True, if_exists=True,
+        )
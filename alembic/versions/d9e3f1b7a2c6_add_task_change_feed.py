@@ -0,0 +1,50 @@
+"""add task change feed
+
+Revision ID: d9e3f1b7a2c6
+Revises: c4d7e2a9f5b1
+Create Date: 2026-10-17 17:05:19.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e3f1b7a2c6'
+down_revision: Union[str, None] = 'c4d7e2a9f5b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_tombstones',
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('NOW()')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    )
+    op.create_index(
+        'ix_task_tombstones_user_id_deleted_at_id', 'task_tombstones',
+        ['user_id', 'deleted_at', 'id'],
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_user_id_updated_at_id', 'tasks', ['user_id', 'updated_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_user_id_updated_at_id', table_name='tasks',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_index('ix_task_tombstones_user_id_deleted_at_id', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
@@ -0,0 +1,58 @@
+"""add task stats counters
+
+Revision ID: e2a8c5f0b4d7
+Revises: d9e3f1b7a2c6
+Create Date: 2026-10-17 19:42:06.183554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a8c5f0b4d7'
+down_revision: Union[str, None] = 'd9e3f1b7a2c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('completed_at', sa.TIMESTAMP(), nullable=True))
+    op.create_table(
+        'task_status_counts',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'status'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    )
+    op.create_table(
+        'task_daily_counts',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('created', sa.Integer(), nullable=False),
+        sa.Column('completed', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'day'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    )
+    # Existing tasks were completed at an unknown time and count as
+    # completed when created.
+    op.execute(
+        "INSERT INTO task_status_counts (user_id, status, count) "
+        "SELECT user_id, status, count(*) FROM tasks GROUP BY user_id, status"
+    )
+    op.execute(
+        "INSERT INTO task_daily_counts (user_id, day, created, completed) "
+        "SELECT user_id, created_at::date, count(*), count(*) FILTER (WHERE status = 'completed') "
+        "FROM tasks GROUP BY user_id, created_at::date"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_daily_counts')
+    op.drop_table('task_status_counts')
+    op.drop_column('tasks', 'completed_at')
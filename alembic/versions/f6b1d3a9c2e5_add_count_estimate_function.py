@@ -0,0 +1,37 @@
+"""add count estimate function
+
+Revision ID: f6b1d3a9c2e5
+Revises: e2a8c5f0b4d7
+Create Date: 2026-10-17 21:08:44.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b1d3a9c2e5'
+down_revision: Union[str, None] = 'e2a8c5f0b4d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION count_estimate(query text) RETURNS bigint
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            plan jsonb;
+        BEGIN
+            EXECUTE 'EXPLAIN (FORMAT JSON) ' || query INTO plan;
+            RETURN (plan -> 0 -> 'Plan' ->> 'Plan Rows')::bigint;
+        END
+        $$
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION count_estimate(text)")
@@ -0,0 +1,111 @@
+"""
+Compares a client "save" of mixed task writes sent as one request per
+operation against the same operations in one ``POST /batch``.
+
+Each save creates ``--creates`` tasks, renames ``--updates`` of them and
+deletes ``--deletes``. ``--rtt-ms`` adds a simulated network round trip to
+every HTTP request, as a mobile client would see it. Transactions are
+counted on the engine: one per request, against one per batch.
+
+Usage::
+
+    python -m benchmarks.bench_batch --saves 50 --rtt-ms 80
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import event
+
+from benchmarks.common import create_schema, get_bench_user_id
+from src.db import SessionLocal, engine
+from src.main import app
+from src.users.auth import create_access_token
+
+
+class DelayedTransport(httpx.AsyncBaseTransport):
+    """ASGI transport adding a fixed round trip to every request."""
+
+    def __init__(self, rtt: float) -> None:
+        self.rtt = rtt
+        self.transport = httpx.ASGITransport(app=app)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.rtt)
+        return await self.transport.handle_async_request(request)
+
+
+async def save_one_by_one(client: httpx.AsyncClient, n: int, creates: int, updates: int, deletes: int) -> None:
+    ids = []
+    for index in range(creates):
+        response = await client.post(
+            "/tasks/create", json={"title": f"Save {n}.{index}", "description": "bench_batch"})
+        ids.append(response.raise_for_status().json()["id"])
+    for task_id in ids[:updates]:
+        response = await client.put("/tasks/update", json={"id": task_id, "title": f"Renamed {task_id}"})
+        response.raise_for_status()
+    for task_id in ids[-deletes:] if deletes else []:
+        (await client.delete(f"/tasks/{task_id}")).raise_for_status()
+
+
+async def save_in_batches(client: httpx.AsyncClient, n: int, creates: int, updates: int, deletes: int) -> None:
+    # Updates and deletes need the IDs of the created tasks, so a save is
+    # one batch of creates and one of the writes depending on them.
+    response = await client.post("/batch", json={"atomic": True, "operations": [
+        {"method": "POST", "path": "/tasks/create", "body": {"title": f"Save {n}.{index}", "description": "bench_batch"}}
+        for index in range(creates)
+    ]})
+    ids = [result["body"]["id"] for result in response.raise_for_status().json()["results"]]
+    response = await client.post("/batch", json={"atomic": True, "operations": [
+        *({"method": "PUT", "path": "/tasks/update", "body": {"id": task_id, "title": f"Renamed {task_id}"}}
+          for task_id in ids[:updates]),
+        *({"method": "DELETE", "path": f"/tasks/{task_id}"} for task_id in (ids[-deletes:] if deletes else [])),
+    ]})
+    assert response.raise_for_status().json()["committed"]
+
+
+async def run(save, client: httpx.AsyncClient, saves: int, *counts: int) -> tuple[float, int]:
+    """Runs ``saves`` saves; returns milliseconds per save and transactions committed."""
+    commits = 0
+
+    def count_commit(connection) -> None:
+        nonlocal commits
+        commits += 1
+
+    event.listen(engine.sync_engine, "commit", count_commit)
+    try:
+        start = time.perf_counter()
+        for n in range(saves):
+            await save(client, n, *counts)
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine.sync_engine, "commit", count_commit)
+    return elapsed / saves * 1000, commits
+
+
+async def main(saves: int, creates: int, updates: int, deletes: int, rtt_ms: float) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session)
+
+    headers = {"Authorization": create_access_token(user_id)}
+    transport = DelayedTransport(rtt_ms / 1000)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        counts = (creates, updates, deletes)
+        await run(save_in_batches, client, 1, *counts)  # warm up
+        for name, save in (("one request each", save_one_by_one), ("POST /batch", save_in_batches)):
+            per_save, commits = await run(save, client, saves, *counts)
+            print(f"{name:<17}: {per_save:8.1f}ms per save, {commits / saves:5.1f} commits per save")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--saves", type=int, default=50)
+    parser.add_argument("--creates", type=int, default=6)
+    parser.add_argument("--updates", type=int, default=4)
+    parser.add_argument("--deletes", type=int, default=2)
+    parser.add_argument("--rtt-ms", type=float, default=80)
+    args = parser.parse_args()
+    asyncio.run(main(args.saves, args.creates, args.updates, args.deletes, args.rtt_ms))
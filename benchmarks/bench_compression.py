@@ -0,0 +1,88 @@
+"""
+Reports what compressing task responses costs in CPU against the bytes it
+saves, for each content coding and a few levels, with no database involved:
+
+* JSON list pages of 10, 100 and 1000 tasks, compressed in one go;
+* an NDJSON export, compressed chunk by chunk as it is streamed.
+
+Titles and descriptions are drawn from a small vocabulary, so they repeat
+about as much as real task text does.
+
+Usage::
+
+    python -m benchmarks.bench_compression --export-rows 100000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from src.base.compression import COMPRESSORS
+from src.base.responses import SchemaResponse
+from src.tasks.export import encode_ndjson
+from src.tasks.schemas import TaskResponseSchema, TaskStatus
+
+LEVELS = {"zstd": (1, 3, 9), "br": (1, 4, 9), "gzip": (1, 6, 9)}
+WORDS = (
+    "review update report meeting client budget draft invoice deploy release fix bug "
+    "call email plan design test migrate backup cleanup sprint notes follow up with "
+    "team about the new old weekly monthly quarterly for and before after friday"
+).split()
+
+
+def task_rows(count: int, seed: int = 42) -> Iterator[dict]:
+    rng = random.Random(seed)
+    now = datetime.now()
+    statuses = [status.value for status in TaskStatus]
+    for n in range(count):
+        yield {
+            "id": n + 1,
+            "title": " ".join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(0, 60))),
+            "status": rng.choice(statuses),
+            "user_id": 7,
+            "created_at": now - timedelta(minutes=n),
+            "updated_at": now - timedelta(minutes=n // 2),
+        }
+
+
+def compress(encoding: str, level: int, chunks: list[bytes]) -> tuple[int, float]:
+    """Compresses ``chunks`` as one stream; returns compressed bytes and CPU seconds."""
+    started = time.process_time()
+    compressor = COMPRESSORS[encoding](level)
+    size = sum(len(compressor.compress(chunk)) for chunk in chunks) + len(compressor.flush())
+    return size, time.process_time() - started
+
+
+def report(name: str, chunks: list[bytes], repeat: int) -> None:
+    raw = sum(len(chunk) for chunk in chunks)
+    print(f"{name}: {raw} bytes")
+    for encoding in COMPRESSORS:
+        for level in LEVELS[encoding]:
+            runs = [compress(encoding, level, chunks) for _ in range(repeat)]
+            size = runs[0][0]
+            cpu = min(seconds for _, seconds in runs)
+            print(
+                f"  {encoding:<4} {level:>2}: {size:>9} bytes ({raw / size:4.1f}x)"
+                f" {cpu * 1000:8.2f}ms CPU, {(raw - size) / 1024 / max(cpu, 1e-9) / 1024:7.1f}MB saved per CPU second"
+            )
+
+
+def main(page_sizes: list[int], export_rows: int, batch_size: int, repeat: int) -> None:
+    for page_size in page_sizes:
+        body = SchemaResponse(list(task_rows(page_size)), list[TaskResponseSchema]).render_body()
+        report(f"page of {page_size}", [body], repeat)
+    rows = list(task_rows(export_rows))
+    chunks = [encode_ndjson(rows[start:start + batch_size]) for start in range(0, export_rows, batch_size)]
+    report(f"export of {export_rows} in chunks of {batch_size}", chunks, max(1, repeat // 10))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--export-rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.page_sizes, args.export_rows, args.batch_size, args.repeat)
@@ -0,0 +1,63 @@
+"""
+Compares full responses with 304s to conditional requests on
+``GET /tasks/user/me`` and ``GET /tasks/{task_id}``. The task and list
+caches are turned off, so both paths go to the database.
+
+Usage::
+
+    python -m benchmarks.bench_conditional --rows 10000 --page-size 100
+"""
+import argparse
+import asyncio
+
+import httpx
+from sqlalchemy import text
+
+from benchmarks.bench_get_task import NoCache, task_service_with
+from benchmarks.common import create_schema, get_bench_user_id, measure, seed_tasks
+from src.db import SessionLocal, engine
+from src.dependencies import get_task_service
+from src.main import app
+from src.users.auth import create_access_token
+
+
+async def main(rows: int, page_size: int, repeat: int) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session)
+        await seed_tasks(session, user_id, rows)
+        task_id = await session.scalar(
+            text("SELECT max(id) FROM tasks WHERE user_id = :user_id"), {"user_id": user_id})
+
+    app.dependency_overrides[get_task_service] = task_service_with(
+        task_cache=NoCache(), list_cache=NoCache())
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": create_access_token(user_id)}
+    print(f"{'request':>22} {'status':>6} {'p50':>10} {'p95':>10} {'bytes':>8}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for name, url in (
+                ("list", f"/tasks/user/me?elements_per_page={page_size}"),
+                ("detail", f"/tasks/{task_id}"),
+        ):
+            etag = (await client.get(url)).headers["ETag"]
+            for variant, extra in (("", {}), (" + If-None-Match", {"If-None-Match": etag})):
+                last = None
+
+                async def request():
+                    nonlocal last
+                    last = await client.get(url, headers=extra)
+
+                stats = await measure(request, repeat)
+                print(f"{name + variant:>22} {last.status_code:>6} {stats['median']:>8.2f}ms "
+                      f"{stats['p95']:>8.2f}ms {len(last.content):>8}")
+    app.dependency_overrides = {}
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.repeat))
@@ -0,0 +1,75 @@
+"""
+Measures ``POST /tasks/create`` throughput with and without the post-insert
+refresh that task creation used to issue.
+
+Usage::
+
+    python -m benchmarks.bench_create --requests 2000 --concurrency 8
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import create_schema, get_bench_user_id
+from src.db import SessionLocal, engine
+from src.main import app
+from src.tasks.repository import TaskRepository
+from src.users.auth import create_access_token
+
+
+async def add_task_with_refresh(self: TaskRepository, task):
+    """The previous ``add`` -> ``commit`` -> ``refresh`` create path."""
+    self.add(task)
+    await self.commit()
+    await self.refresh(task)
+    return task
+
+
+async def run(client: httpx.AsyncClient, total: int, concurrency: int) -> float:
+    """Sends ``total`` create requests and returns requests per second."""
+    queue = iter(range(total))
+
+    async def worker():
+        for n in queue:
+            response = await client.post(
+                "/tasks/create",
+                json={"title": f"Bench {n}", "description": "created by bench_create"},
+            )
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+async def main(total: int, concurrency: int) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session)
+
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": create_access_token(user_id)}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        await run(client, concurrency, concurrency)  # warm up
+
+        current = TaskRepository.add_task
+        TaskRepository.add_task = add_task_with_refresh
+        try:
+            before = await run(client, total, concurrency)
+        finally:
+            TaskRepository.add_task = current
+        after = await run(client, total, concurrency)
+
+    print(f"add + commit + refresh : {before:8.1f} req/s")
+    print(f"INSERT ... RETURNING   : {after:8.1f} req/s ({(after / before - 1) * 100:+.1f}%)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,83 @@
+"""
+Measures task event fan-out: how long publishing takes as subscribers pile
+up, whether a stalled subscriber slows it down, and end-to-end latency over
+Postgres ``LISTEN``/``NOTIFY`` between two relays.
+
+Usage::
+
+    python -m benchmarks.bench_events --subscribers 10000 --events 300000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from src.base.events import EventHub, PostgresEventRelay
+from src.config import Settings
+from src.tasks.events import TASK_EVENTS_CHANNEL
+from src.tasks.schemas import TaskEventSchema, TaskEventType
+
+RESYNC = TaskEventSchema(type=TaskEventType.RESYNC)
+EVENT = TaskEventSchema(type=TaskEventType.UPDATED, ids=[42])
+
+
+def bench_fan_out(subscribers: int, events: int, queue_size: int, users: int) -> None:
+    """Publishes to users none of whose subscribers ever read."""
+    hub = EventHub(queue_size=queue_size, overflow=RESYNC)
+    tracemalloc.start()
+    contexts = [hub.subscribe(str(n % users)) for n in range(subscribers)]
+    subscriptions = [context.__enter__() for context in contexts]
+    started = time.perf_counter()
+    for n in range(events):
+        hub.publish(str(n % users), EVENT)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    overflows = sum(subscription.overflows for subscription in subscriptions)
+    print(f"fan-out: {events} events to {subscribers} stalled subscribers of {users} users")
+    print(f"  {elapsed / events * 1e6:.2f}us per publish, {overflows} overflows")
+    print(f"  peak memory {peak / 1024 / 1024:.1f}MB ({peak / subscribers:.0f}B per subscriber)")
+    for context in contexts:
+        context.__exit__(None, None, None)
+
+
+async def bench_relay(events: int) -> None:
+    """Times events from publish on one relay to delivery on another."""
+    dsn = Settings.DATABASE_URL.replace("+asyncpg", "")
+    hubs = [EventHub(queue_size=events, overflow=RESYNC) for _ in range(2)]
+    relays = [
+        PostgresEventRelay(
+            hub, dsn=dsn, channel=TASK_EVENTS_CHANNEL,
+            encode=TaskEventSchema.model_dump_json, decode=TaskEventSchema.model_validate_json,
+        )
+        for hub in hubs
+    ]
+    for relay in relays:
+        await relay.start()
+    await asyncio.gather(*(relay.listening.wait() for relay in relays))
+
+    samples = []
+    with hubs[1].subscribe("1") as subscription:
+        for _ in range(events):
+            started = time.perf_counter()
+            hubs[0].publish("1", EVENT)
+            await subscription.get()
+            samples.append((time.perf_counter() - started) * 1000)
+    for relay in relays:
+        await relay.stop()
+    samples.sort()
+    print(f"relay: {events} events between two workers over NOTIFY")
+    print(f"  p50 {statistics.median(samples):.2f}ms, p95 {samples[int(len(samples) * 0.95) - 1]:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--events", type=int, default=300_000)
+    parser.add_argument("--queue-size", type=int, default=Settings.TASKS_STREAM_QUEUE_SIZE)
+    parser.add_argument("--relay-events", type=int, default=1_000)
+    args = parser.parse_args()
+    bench_fan_out(args.subscribers, args.events, args.queue_size, args.users)
+    asyncio.run(bench_relay(args.relay_events))
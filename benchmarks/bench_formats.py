@@ -0,0 +1,59 @@
+"""
+Compares JSON and MessagePack task pages, with no database involved:
+payload size, server-side encoding with ``SchemaResponse`` and client-side
+decoding.
+
+Usage::
+
+    python -m benchmarks.bench_formats --page-sizes 10 100 1000
+"""
+import argparse
+import json
+import time
+from typing import Callable
+
+import msgpack
+
+from benchmarks.bench_serialization import SCHEMA, make_tasks
+from src.base.negotiation import JSON, MSGPACK, response_media_type
+from src.base.responses import SchemaResponse, type_adapter
+
+DECODERS = {JSON: json.loads, MSGPACK: msgpack.unpackb}
+
+
+def per_call(func: Callable[[], object], seconds: float) -> float:
+    """Runs ``func`` for about ``seconds`` and returns microseconds per call."""
+    func()
+    runs = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        func()
+        runs += 1
+    return elapsed / runs * 1e6
+
+
+def encode(tasks, media_type: str) -> bytes:
+    token = response_media_type.set(media_type)
+    try:
+        return SchemaResponse(tasks, SCHEMA).render_body()
+    finally:
+        response_media_type.reset(token)
+
+
+def main(page_sizes: list[int], seconds: float) -> None:
+    print(f"{'items':>5} {'format':<20} {'bytes':>9} {'encode':>10} {'decode':>10}")
+    for page_size in page_sizes:
+        tasks = type_adapter(SCHEMA).validate_python(make_tasks(page_size), from_attributes=True)
+        for media_type, decode in DECODERS.items():
+            body = encode(tasks, media_type)
+            encode_us = per_call(lambda: encode(tasks, media_type), seconds)
+            decode_us = per_call(lambda: decode(body), seconds)
+            print(f"{page_size:>5} {media_type:<20} {len(body):>9} {encode_us:>8.0f}us {decode_us:>8.0f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+    main(args.page_sizes, args.seconds)
@@ -0,0 +1,99 @@
+"""
+Compares ``GET /tasks/{task_id}`` with and without the task cache, polling
+a hot set of tasks the way detail pages do.
+
+Usage::
+
+    python -m benchmarks.bench_get_task --rows 100000 --hot 100
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import text
+
+from benchmarks.common import create_schema, get_bench_user_id, measure, seed_tasks
+from src.base.cache import Cache, CacheStats, MemoryCache
+from src.config import Settings
+from src.db import SessionLocal, engine
+from src.dependencies import get_task_repository, get_task_service
+from src.main import app
+from src.tasks import TaskRepository, TaskService
+from src.users.auth import create_access_token
+
+
+class NoCache(Cache):
+    """Cache that never holds anything."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> bytes | None:
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: bytes) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+
+def task_service_with(**caches: Cache):
+    """``get_task_service`` override using the given caches."""
+    async def get_service(
+            task_repository: TaskRepository = Depends(get_task_repository),
+    ) -> TaskService:
+        return TaskService(task_repository, **caches)
+
+    return get_service
+
+
+async def main(rows: int, hot: int, repeat: int) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session)
+        await seed_tasks(session, user_id, rows)
+        task_ids = (await session.scalars(text(
+            "SELECT id FROM tasks WHERE user_id = :user_id ORDER BY random() LIMIT :hot"
+        ), {"user_id": user_id, "hot": hot})).all()
+
+    caches = {
+        "no cache": NoCache(),
+        "memory": MemoryCache(
+            maxsize=Settings.TASKS_CACHE_MAX_ENTRIES,
+            max_bytes=Settings.TASKS_CACHE_MAX_BYTES,
+            ttl=Settings.TASKS_CACHE_TTL_SECONDS,
+        ),
+    }
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": create_access_token(user_id)}
+    print(f"{'cache':>9} {'p50':>10} {'p95':>10} {'cpu/req':>10} {'hits':>6} {'misses':>6}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for name, cache in caches.items():
+            app.dependency_overrides[get_task_service] = task_service_with(task_cache=cache)
+            ids = itertools.cycle(task_ids)
+
+            async def request():
+                response = await client.get(f"/tasks/{next(ids)}")
+                response.raise_for_status()
+
+            cpu_start = time.process_time()
+            stats = await measure(request, repeat)
+            cpu = (time.process_time() - cpu_start) * 1000 / (repeat + 1)
+            print(f"{name:>9} {stats['median']:>8.2f}ms {stats['p95']:>8.2f}ms {cpu:>8.2f}ms "
+                  f"{cache.stats.hits:>6} {cache.stats.misses:>6}")
+    app.dependency_overrides = {}
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--hot", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.hot, args.repeat))
@@ -0,0 +1,78 @@
+"""
+Compares task ingest rates: ORM unit-of-work inserts, the multi-row
+``add_tasks`` INSERT and the COPY-based import.
+
+Usage::
+
+    python -m benchmarks.bench_import --rows 200000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete
+
+from benchmarks.common import create_schema, get_bench_user_id
+from src.db import SessionLocal, engine
+from src.tasks.models import Task
+from src.tasks.repository import TaskRepository
+from src.tasks.service import TaskService
+
+CHUNK = 10_000
+
+
+async def records(rows: int):
+    for n in range(rows):
+        yield {"title": f"Import {n}", "description": "lorem ipsum dolor sit amet " * 4}
+
+
+async def orm_inserts(repository: TaskRepository, user_id: int, rows: int) -> None:
+    async for record in records(rows):
+        repository.add(Task(**record, status="new", user_id=user_id))
+    await repository.commit()
+
+
+async def multi_row_insert(repository: TaskRepository, user_id: int, rows: int) -> None:
+    chunk = []
+    async for record in records(rows):
+        chunk.append({**record, "status": "new", "user_id": user_id})
+        if len(chunk) == CHUNK:
+            await repository.add_tasks(chunk)
+            chunk = []
+    if chunk:
+        await repository.add_tasks(chunk)
+
+
+async def copy_import(repository: TaskRepository, user_id: int, rows: int) -> None:
+    await TaskService(repository).import_tasks(records(rows), user_id=user_id)
+
+
+async def main(rows: int, orm_rows: int) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session)
+
+    print(f"{'path':>18} {'rows':>9} {'rows/s':>10}")
+    for name, load, count in (
+            ("ORM add + commit", orm_inserts, orm_rows),
+            ("multi-row INSERT", multi_row_insert, rows),
+            ("COPY import", copy_import, rows),
+    ):
+        async with SessionLocal() as session:
+            repository = TaskRepository(session)
+            start = time.perf_counter()
+            await load(repository, user_id, count)
+            elapsed = time.perf_counter() - start
+            await session.execute(delete(Task).where(
+                Task.user_id == user_id, Task.title.startswith("Import ")))
+            await session.commit()
+        print(f"{name:>18} {count:>9} {count / elapsed:>10.0f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--orm-rows", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.orm_rows))
@@ -0,0 +1,79 @@
+"""
+Compares ``GET /tasks/user/me`` with and without the task list cache, for
+a client that reads its first pages much more often than it writes.
+
+Usage::
+
+    python -m benchmarks.bench_list_cache --rows 10000 --reads-per-write 20
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+import httpx
+
+from benchmarks.bench_get_task import NoCache, task_service_with
+from benchmarks.common import create_schema, get_bench_user_id, measure, seed_tasks
+from src.base.cache import Generations, MemoryCache
+from src.config import Settings
+from src.db import SessionLocal, engine
+from src.dependencies import get_task_service
+from src.main import app
+from src.users.auth import create_access_token
+
+
+async def main(rows: int, page_size: int, reads_per_write: int, repeat: int) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session)
+        await seed_tasks(session, user_id, rows)
+
+    caches = {
+        "no cache": NoCache(),
+        "memory": MemoryCache(
+            maxsize=Settings.TASKS_LIST_CACHE_MAX_ENTRIES,
+            max_bytes=Settings.TASKS_LIST_CACHE_MAX_BYTES,
+            ttl=Settings.TASKS_LIST_CACHE_TTL_SECONDS,
+        ),
+    }
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": create_access_token(user_id)}
+    print(f"{'cache':>9} {'p50':>10} {'p95':>10} {'cpu/req':>10} {'hit ratio':>10} {'bytes':>10}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for name, cache in caches.items():
+            app.dependency_overrides[get_task_service] = task_service_with(
+                list_cache=cache, list_generations=Generations(1000))
+            statuses = itertools.cycle([None, None, "new", None, "completed"])
+            requests = itertools.count(1)
+            created = []
+
+            async def request():
+                if next(requests) % reads_per_write == 0:
+                    response = await client.post(
+                        "/tasks/create", json={"title": "Bench write", "description": ""})
+                    created.append(response.json()["id"])
+                status = next(statuses)
+                params = {"elements_per_page": page_size, **({"status": status} if status else {})}
+                response = await client.get("/tasks/user/me", params=params)
+                response.raise_for_status()
+
+            cpu_start = time.process_time()
+            stats = await measure(request, repeat)
+            cpu = (time.process_time() - cpu_start) * 1000 / (repeat + 1)
+            print(f"{name:>9} {stats['median']:>8.2f}ms {stats['p95']:>8.2f}ms {cpu:>8.2f}ms "
+                  f"{cache.stats.hit_ratio:>10.2f} {cache.stats.size_bytes:>10}")
+            for task_id in created:
+                await client.delete(f"/tasks/{task_id}")
+    app.dependency_overrides = {}
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--reads-per-write", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.reads_per_write, args.repeat))
@@ -0,0 +1,66 @@
+"""
+Compares OFFSET and keyset (cursor) pagination latency at increasing depth.
+
+Usage::
+
+    python -m benchmarks.bench_pagination --rows 1000010 --page-size 10
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from benchmarks.common import create_schema, get_bench_user_id, measure, seed_tasks
+from src.db import SessionLocal, engine
+from src.tasks.models import Task
+from src.tasks.repository import TASK_SORT_KEY, TaskRepository
+
+PAGES = (1, 10, 100, 1_000, 10_000, 100_000)
+
+
+async def main(rows: int, page_size: int, repeat: int) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session)
+        await seed_tasks(session, user_id, rows)
+        repository = TaskRepository(session)
+
+        print(f"{'page':>8} {'offset p50':>12} {'offset p95':>12} {'keyset p50':>12} {'keyset p95':>12}")
+        for page in PAGES:
+            offset = (page - 1) * page_size
+            if offset >= rows:
+                break
+            # Keyset position of the row just before the requested page.
+            after = None
+            if offset:
+                after = tuple((await session.execute(
+                    select(*TASK_SORT_KEY)
+                    .where(Task.user_id == user_id)
+                    .order_by(*TASK_SORT_KEY)
+                    .offset(offset - 1)
+                    .limit(1)
+                )).one())
+
+            by_offset = await measure(
+                lambda: repository.get_user_tasks(user_id, limit=page_size, offset=offset),
+                repeat,
+            )
+            by_keyset = await measure(
+                lambda: repository.get_user_tasks(user_id, limit=page_size, after=after),
+                repeat,
+            )
+            session.expunge_all()
+            print(
+                f"{page:>8} {by_offset['median']:>10.2f}ms {by_offset['p95']:>10.2f}ms "
+                f"{by_keyset['median']:>10.2f}ms {by_keyset['p95']:>10.2f}ms"
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_010)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.repeat))
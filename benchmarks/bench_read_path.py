@@ -0,0 +1,84 @@
+"""
+Compares the per-request cost of ``GET /tasks/user/me`` through three read
+paths:
+
+* ``orm``: ORM entities hydrated into the identity map, then FastAPI's
+  ``response_model`` dump, re-validation and encoding;
+* ``columns``: column rows built into responses, still through
+  ``response_model``;
+* ``direct``: column rows serialized straight to JSON (the current path).
+
+Usage::
+
+    python -m benchmarks.bench_read_path --rows 10000 --page-size 100
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import select
+
+from benchmarks.common import create_schema, get_bench_user_id, measure, seed_tasks
+from src.db import SessionLocal, engine
+from src.main import app
+from src.tasks import router as task_router
+from src.tasks.models import Task
+from src.tasks.repository import TaskRepository
+from src.users.auth import create_access_token
+
+
+async def get_user_tasks_orm(self: TaskRepository, user_id, status=None, limit=100, offset=0, after=None):
+    """The previous ORM list query."""
+    query = select(Task).where(Task.user_id == user_id)
+    if status:
+        query = query.where(Task.status == status)
+    result = await self.session.execute(self._paginate(query, limit, offset, after))
+    return result.scalars().all()
+
+
+def task_list_response_model(tasks, next_cursor, schema=None, total=None):
+    """Hands the page back to FastAPI's ``response_model`` handling."""
+    return tasks
+
+
+async def main(rows: int, page_size: int, repeat: int) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session)
+        await seed_tasks(session, user_id, rows)
+
+    variants = {
+        "orm": (get_user_tasks_orm, task_list_response_model),
+        "columns": (TaskRepository.get_user_tasks, task_list_response_model),
+        "direct": (TaskRepository.get_user_tasks, task_router._task_list_response),
+    }
+    current = (TaskRepository.get_user_tasks, task_router._task_list_response)
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": create_access_token(user_id)}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        async def request():
+            response = await client.get("/tasks/user/me", params={"elements_per_page": page_size})
+            response.raise_for_status()
+
+        print(f"{'path':>8} {'p50':>10} {'p95':>10} {'cpu/req':>10}")
+        try:
+            for name, (get_user_tasks, task_list_response) in variants.items():
+                TaskRepository.get_user_tasks = get_user_tasks
+                task_router._task_list_response = task_list_response
+                cpu_start = time.process_time()
+                stats = await measure(request, repeat)
+                cpu = (time.process_time() - cpu_start) * 1000 / (repeat + 1)
+                print(f"{name:>8} {stats['median']:>8.2f}ms {stats['p95']:>8.2f}ms {cpu:>8.2f}ms")
+        finally:
+            TaskRepository.get_user_tasks, task_router._task_list_response = current
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.repeat))
@@ -0,0 +1,106 @@
+"""
+Measures task search latency on a large table with a varied vocabulary.
+
+Titles and descriptions are drawn from a few thousand made-up words with a
+skewed frequency, so the queries below range from terms that match a large
+share of the table to terms that match a handful of rows. Seeding 10M rows
+takes a while; it is only done once, later runs reuse the rows.
+
+Usage::
+
+    python -m benchmarks.bench_search --rows 10000000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from benchmarks.common import create_schema, get_bench_user_id, measure
+from src.db import SessionLocal, engine
+from src.tasks.repository import TaskRepository
+from src.tasks.service import TaskService
+
+SEARCH_USERNAME = "search-benchmark-user"
+SEED_BATCH = 1_000_000
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "vo", "zi", "be", "do", "fu", "ga", "hi", "ju", "pe", "so", "wa"]
+# The vocabulary holds every three-syllable word, ``word(n)`` at index ``n``;
+# lower indexes are drawn far more often.
+VOCABULARY = (
+    "SELECT array_agg(s[1 + n % 17] || s[1 + n / 17 % 17] || s[1 + n / 289 % 17] ORDER BY n) AS words "
+    "FROM CAST(:syllables AS text[]) AS s, generate_series(0, 4912) AS n"
+)
+DRAW = "vocabulary.words[1 + floor(4913 * power(random(), 3))::integer]"
+
+
+def word(n: int) -> str:
+    """Word ``n`` of the vocabulary."""
+    return SYLLABLES[n % 17] + SYLLABLES[n // 17 % 17] + SYLLABLES[n // 289 % 17]
+
+
+def words(count: int) -> str:
+    """SQL expression drawing ``count`` space separated words."""
+    return " || ' ' || ".join([DRAW] * count)
+
+
+async def seed_search_tasks(user_id: int, rows: int) -> None:
+    """Tops the search user up to ``rows`` tasks, committing every ``SEED_BATCH``."""
+    async with SessionLocal() as session:
+        existing = await session.scalar(
+            text("SELECT count(*) FROM tasks WHERE user_id = :user_id"), {"user_id": user_id})
+        for start in range(existing + 1, rows + 1, SEED_BATCH):
+            stop = min(start + SEED_BATCH - 1, rows)
+            started = time.perf_counter()
+            await session.execute(
+                text(
+                    "INSERT INTO tasks (title, description, status, user_id, created_at, updated_at) "
+                    f"SELECT {words(3)}, {words(12)}, "
+                    "(ARRAY['new', 'in_progress', 'completed'])[1 + n % 3], :user_id, "
+                    "now() - make_interval(secs => n), now() - make_interval(secs => n) "
+                    f"FROM ({VOCABULARY}) AS vocabulary, "
+                    "generate_series(CAST(:start AS integer), CAST(:stop AS integer)) AS n"
+                ),
+                {"syllables": SYLLABLES, "user_id": user_id, "start": start, "stop": stop},
+            )
+            await session.commit()
+            print(f"seeded {stop} rows ({time.perf_counter() - started:.1f}s)", flush=True)
+        await session.execute(text("ANALYZE tasks"))
+        await session.commit()
+
+
+async def main(rows: int, page_size: int, repeat: int) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session, SEARCH_USERNAME)
+    await seed_search_tasks(user_id, rows)
+
+    queries = {
+        "rare word": (word(4000), {}),
+        "mid word": (word(300), {}),
+        "common word": (word(3), {}),
+        "two words": (f"{word(40)} {word(90)}", {}),
+        "phrase": (f'"{word(5)} {word(6)}"', {}),
+        "word -word": (f"{word(20)} -{word(2)}", {}),
+        "mid + status": (word(300), {"status": "completed"}),
+        "mid + user": (word(300), {"user_id": user_id}),
+    }
+    print(f"{'query':>14} {'p50':>10} {'p95':>10}")
+    for name, (query, filters) in queries.items():
+        async with SessionLocal() as session:
+            service = TaskService(TaskRepository(session))
+
+            async def search():
+                await service.search_tasks(query, elements_per_page=page_size, **filters)
+
+            stats = await measure(search, repeat)
+        print(f"{name:>14} {stats['median']:>8.2f}ms {stats['p95']:>8.2f}ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.repeat))
@@ -0,0 +1,88 @@
+"""
+Measures task serialization throughput, with no database involved, for
+pages of ORM tasks (as returned by create/update) and of response schemas
+(as built by the list queries), through:
+
+* ``response_model``: FastAPI's handling of a returned value (validate,
+  dump to Python objects, ``jsonable_encoder``, ``json.dumps``);
+* ``schema``: ``SchemaResponse``, serialized by pydantic-core in one pass.
+
+Usage::
+
+    python -m benchmarks.bench_serialization --page-sizes 10 100 1000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.base.responses import SchemaResponse, type_adapter
+from src.tasks.models import Task
+from src.tasks.schemas import TaskResponseSchema, TaskStatus
+from src.users.models import User  # noqa: F401  (registers the mapper)
+
+SCHEMA = list[TaskResponseSchema]
+RESPONSE_FIELD = create_model_field("Response_list_tasks", SCHEMA, mode="serialization")
+
+
+def make_tasks(count: int) -> list[Task]:
+    now = datetime.now()
+    statuses = list(TaskStatus)
+    return [
+        Task(
+            id=n, title=f"Task {n}", description="lorem ipsum dolor sit amet " * (1 + n % 8),
+            status=statuses[n % 3].value, user_id=7,
+            created_at=now - timedelta(seconds=n), updated_at=now - timedelta(seconds=n),
+        )
+        for n in range(count)
+    ]
+
+
+async def response_model(tasks) -> bytes:
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=tasks)
+    return JSONResponse(content).body
+
+
+async def schema(tasks) -> bytes:
+    return SchemaResponse(tasks, SCHEMA).render_body()
+
+
+async def throughput(serialize, tasks, seconds: float) -> float:
+    """Serializes ``tasks`` for about ``seconds`` and returns items per second."""
+    assert await serialize(tasks)
+    runs = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        await serialize(tasks)
+        runs += 1
+    return runs * len(tasks) / elapsed
+
+
+async def main(page_sizes: list[int], seconds: float) -> None:
+    variants = {"response_model": response_model, "schema": schema}
+    for page_size in page_sizes:
+        orm_tasks = make_tasks(page_size)
+        inputs = {
+            "orm": orm_tasks,
+            "schemas": type_adapter(SCHEMA).validate_python(orm_tasks, from_attributes=True),
+        }
+        for input_name, tasks in inputs.items():
+            results = {name: await throughput(variant, tasks, seconds) for name, variant in variants.items()}
+            speedup = results["schema"] / results["response_model"]
+            print(
+                f"{page_size:>5} {input_name:<8}"
+                + "".join(f" {name}: {rate / 1000:8.1f}k items/s" for name, rate in results.items())
+                + f"  ({speedup:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.page_sizes, args.seconds))
@@ -0,0 +1,154 @@
+"""
+Counts what a request costs the connection pool and the database, with the
+previous request sessions and with the current ones:
+
+* ``before``: every request runs in a transaction that is committed, and
+  responses are encoded while the session still holds its connection;
+* ``after``: reads run in autocommit, with no BEGIN or COMMIT, and
+  responses are encoded once the connection is back in the pool.
+
+For each kind of request it reports, per request, the pool checkouts, the
+statements sent, the BEGIN/COMMIT/ROLLBACK round trips (counted on asyncpg,
+since in autocommit SQLAlchemy still emits its transaction events), how
+long a connection was held and the latency. The caches are disabled, so
+every read reaches the database.
+
+Usage::
+
+    python -m benchmarks.bench_sessions --rows 10000 --page-size 100
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import AsyncIterator, Iterator
+
+import httpx
+from asyncpg.transaction import Transaction
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.bench_get_task import NoCache, task_service_with
+from benchmarks.common import create_schema, get_bench_user_id, measure, seed_tasks
+from src.base.responses import SchemaResponse
+from src.db import SessionLocal, engine, get_session
+from src.dependencies import get_task_service
+from src.main import app
+from src.users.auth import create_access_token
+
+
+async def get_session_before() -> AsyncIterator[AsyncSession]:
+    """The previous ``get_session``: one committed transaction per request."""
+    async with SessionLocal() as session:
+        yield session
+        await session.commit()
+
+
+@contextmanager
+def encoded_when_built() -> Iterator[None]:
+    """Encodes ``SchemaResponse`` bodies in the route, as before."""
+    init = SchemaResponse.__init__
+
+    def eager_init(self, *args, **kwargs) -> None:
+        init(self, *args, **kwargs)
+        self.render_body()
+
+    SchemaResponse.__init__ = eager_init
+    try:
+        yield
+    finally:
+        SchemaResponse.__init__ = init
+
+
+@contextmanager
+def counting() -> Iterator[Counter]:
+    """Counts checkouts, statements and transaction round trips, and the connection hold time."""
+    counts = Counter()
+    checked_out = {}
+    originals = {name: getattr(Transaction, name) for name in ("start", "commit", "rollback")}
+
+    def wrap(name: str):
+        original = originals[name]
+
+        async def counted(self) -> None:
+            counts[name] += 1
+            await original(self)
+
+        return counted
+
+    def checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        counts["checkouts"] += 1
+        checked_out[id(dbapi_connection)] = time.perf_counter()
+
+    def checkin(dbapi_connection, connection_record) -> None:
+        start = checked_out.pop(id(dbapi_connection), None)
+        if start is not None:
+            counts["held_ms"] += (time.perf_counter() - start) * 1000
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        counts["statements"] += 1
+
+    for name in originals:
+        setattr(Transaction, name, wrap(name))
+    event.listen(engine.sync_engine.pool, "checkout", checkout)
+    event.listen(engine.sync_engine.pool, "checkin", checkin)
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counts
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.remove(engine.sync_engine.pool, "checkin", checkin)
+        event.remove(engine.sync_engine.pool, "checkout", checkout)
+        for name, original in originals.items():
+            setattr(Transaction, name, original)
+
+
+async def main(rows: int, page_size: int, repeat: int) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session)
+        await seed_tasks(session, user_id, rows)
+
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": create_access_token(user_id)}
+    app.dependency_overrides[get_task_service] = task_service_with(task_cache=NoCache(), list_cache=NoCache())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        page = (await client.get("/tasks/user/me", params={"elements_per_page": page_size})).json()
+        task_id = page[0]["id"]
+        requests = {
+            f"GET page of {page_size}": lambda: client.get(
+                "/tasks/user/me", params={"elements_per_page": page_size}),
+            "GET task fields": lambda: client.get(f"/tasks/{task_id}", params={"fields": "id,title"}),
+            "PUT update": lambda: client.put("/tasks/update", json={"id": task_id, "title": "Task renamed"}),
+            "GET rejected (400)": lambda: client.get("/tasks/user/me", params={"fields": "nope"}),
+        }
+
+        print(f"{'request':>20} {'mode':>7} {'checkouts':>10} {'statements':>11} {'BEGIN':>6} "
+              f"{'COMMIT':>7} {'ROLLBACK':>9} {'held':>9} {'p50':>9}")
+        for name, send in requests.items():
+            for mode in ("before", "after"):
+                if mode == "before":
+                    app.dependency_overrides[get_session] = get_session_before
+                else:
+                    app.dependency_overrides.pop(get_session, None)
+                with encoded_when_built() if mode == "before" else nullcontext():
+                    await send()  # warm up
+                    with counting() as counts:
+                        stats = await measure(send, repeat)
+                calls = repeat + 1
+                print(f"{name:>20} {mode:>7} {counts['checkouts'] / calls:>10.2f} "
+                      f"{counts['statements'] / calls:>11.2f} {counts['start'] / calls:>6.2f} "
+                      f"{counts['commit'] / calls:>7.2f} {counts['rollback'] / calls:>9.2f} "
+                      f"{counts['held_ms'] / calls:>7.3f}ms {stats['median']:>7.3f}ms")
+    app.dependency_overrides = {}
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.repeat))
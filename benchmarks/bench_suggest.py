@@ -0,0 +1,59 @@
+"""
+Measures ``TaskService.suggest_tasks`` latency for one user's tasks, with
+the per-user prefix cache cold (cleared before every call) and warm.
+
+Reuses the tasks seeded by ``bench_search``; without ``pg_trgm`` installed
+the title index is not built and suggestions scan the user's tasks.
+
+Usage::
+
+    python -m benchmarks.bench_suggest --rows 100000
+"""
+import argparse
+import asyncio
+
+from benchmarks.bench_search import SEARCH_USERNAME, seed_search_tasks, word
+from benchmarks.common import create_schema, get_bench_user_id, measure
+from src.base.cache import LRUCache
+from src.db import SessionLocal, engine
+from src.tasks.repository import TaskRepository
+from src.tasks.service import TaskService
+
+
+async def main(rows: int, limit: int, repeat: int) -> None:
+    await create_schema()
+    async with SessionLocal() as session:
+        user_id = await get_bench_user_id(session, SEARCH_USERNAME)
+    await seed_search_tasks(user_id, rows)
+
+    prefixes = {
+        "common, 2 chars": word(3)[:2],
+        "common word": word(3),
+        "rare word": word(4000),
+        "substring": word(300)[1:5],
+    }
+    print(f"{'prefix':>16} {'cold p50':>10} {'cold p95':>10} {'warm p95':>10}")
+    async with SessionLocal() as session:
+        service = TaskService(TaskRepository(session), suggestion_cache=LRUCache(10))
+        for name, prefix in prefixes.items():
+            async def cold():
+                service.suggestion_cache.clear()
+                await service.suggest_tasks(user_id, prefix, limit)
+
+            async def warm():
+                await service.suggest_tasks(user_id, prefix, limit)
+
+            cold_stats = await measure(cold, repeat)
+            warm_stats = await measure(warm, repeat)
+            print(f"{name:>16} {cold_stats['median']:>8.2f}ms {cold_stats['p95']:>8.2f}ms "
+                  f"{warm_stats['p95']:>8.3f}ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.limit, args.repeat))
@@ -0,0 +1,81 @@
+"""
+Shared helpers for the benchmarks.
+
+The database benchmarks run against the Postgres configured in ``src/.env``
+(``docker-compose up -d db`` is enough) and create their own throwaway user.
+"""
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db import Base, engine
+from src.tasks.models import Task  # noqa: F401  (registers the table)
+from src.users.models import User  # noqa: F401
+
+BENCH_USERNAME = "benchmark-user"
+
+
+async def create_schema() -> None:
+    """Creates the tables declared on the models if they do not exist."""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+
+async def get_bench_user_id(session: AsyncSession, username: str = BENCH_USERNAME) -> int:
+    """Gets (creating it if needed) the id of a benchmark user."""
+    user_id = await session.scalar(
+        text("SELECT id FROM users WHERE username = :username"),
+        {"username": username},
+    )
+    if user_id is None:
+        user_id = await session.scalar(
+            text(
+                "INSERT INTO users (first_name, last_name, username, password) "
+                "VALUES ('Bench', 'Mark', :username, '-') RETURNING id"
+            ),
+            {"username": username},
+        )
+        await session.commit()
+    return user_id
+
+
+async def seed_tasks(session: AsyncSession, user_id: int, rows: int) -> None:
+    """Tops the benchmark user up to ``rows`` tasks with server-side generated data."""
+    existing = await session.scalar(
+        text("SELECT count(*) FROM tasks WHERE user_id = :user_id"),
+        {"user_id": user_id},
+    )
+    if existing < rows:
+        await session.execute(
+            text(
+                "INSERT INTO tasks (title, description, status, user_id, created_at, updated_at) "
+                "SELECT 'Task ' || n, repeat('lorem ipsum dolor sit amet ', 1 + n % 8), "
+                "(ARRAY['new', 'in_progress', 'completed'])[1 + n % 3], :user_id, "
+                "now() - make_interval(secs => n), now() - make_interval(secs => n) "
+                "FROM generate_series(CAST(:start AS integer), CAST(:stop AS integer)) AS n"
+            ),
+            {"user_id": user_id, "start": existing + 1, "stop": rows},
+        )
+        await session.commit()
+    await session.execute(text("ANALYZE tasks"))
+
+
+async def measure(
+        func: Callable[[], Awaitable[object]],
+        repeat: int = 20,
+) -> dict[str, float]:
+    """Runs ``func`` ``repeat`` times and returns latency statistics in milliseconds."""
+    await func()  # warm up caches and the connection pool
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median": statistics.median(samples),
+        "p95": samples[max(0, int(len(samples) * 0.95) - 1)],
+    }
@@ -0,0 +1,185 @@
+import itertools
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Mapping, Sequence, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """In-process mapping that evicts the least recently used key past ``maxsize``."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._items: OrderedDict[K, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._items
+
+    def get(self, key: K, default: V = None) -> V:
+        """Gets a value, marking it as recently used."""
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def set(self, key: K, value: V) -> None:
+        """Stores a value, evicting the least recently used ones over ``maxsize``."""
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def pop(self, key: K, default: V = None) -> V:
+        """Removes a key, returning its value."""
+        return self._items.pop(key, default)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+class Generations(Generic[K]):
+    """Generation numbers of cache scopes, for versioned cache keys.
+
+    Bumping a scope's generation orphans every key built with the previous
+    one, and they age out of the cache. A scope that is unknown, or was
+    evicted, gets a number never handed out before, so an eviction cannot
+    bring orphaned keys back.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._numbers: LRUCache[K, int] = LRUCache(maxsize)
+        self._counter = itertools.count(1)
+
+    def get(self, scope: K) -> int:
+        """Gets the current generation of ``scope``."""
+        number = self._numbers.get(scope)
+        if number is None:
+            number = next(self._counter)
+            self._numbers.set(scope, number)
+        return number
+
+    def bump(self, scope: K) -> None:
+        """Moves ``scope`` to a new generation."""
+        self._numbers.set(scope, next(self._counter))
+
+    def clear(self) -> None:
+        """Moves every scope to a new generation."""
+        self._numbers.clear()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class Cache(ABC):
+    """Cache of serialized values by string key.
+
+    Values are bytes so that a shared backend (e.g. Redis) can implement
+    the same interface as the in-process one.
+    """
+    stats: CacheStats
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Gets a value, or ``None`` when it is missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        """Stores a value for the cache's time to live."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Removes keys, present or not."""
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        """Gets the values of ``keys``, in order, ``None`` for those missing.
+
+        A shared backend can override this to read them in one round trip.
+        """
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: Mapping[str, bytes]) -> None:
+        """Stores several values for the cache's time to live."""
+        for key, value in items.items():
+            await self.set(key, value)
+
+
+class MemoryCache(Cache):
+    """In-process LRU cache whose entries expire after ``ttl`` seconds.
+
+    Besides ``maxsize`` entries, the total size of keys and values is kept
+    under ``max_bytes``; values bigger than that are not stored.
+    """
+
+    def __init__(
+            self,
+            maxsize: int,
+            max_bytes: int,
+            ttl: float,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._items: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        item = self._items.get(key)
+        if item is None or item[0] <= self.clock():
+            if item is not None:
+                self._remove(key)
+            self.stats.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.stats.hits += 1
+        return item[1]
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._remove(key)
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        self._items[key] = (self.clock() + self.ttl, value)
+        self.stats.entries += 1
+        self.stats.size_bytes += size
+        while self.stats.entries > self.maxsize or self.stats.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._items)))
+            self.stats.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        self.discard(*keys)
+
+    def discard(self, *keys: str) -> None:
+        """Removes keys, present or not, without waiting: the cache is in-process."""
+        for key in keys:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.stats.entries = self.stats.size_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.stats.entries -= 1
+            self.stats.size_bytes -= len(key) + len(item[1])
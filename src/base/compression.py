@@ -0,0 +1,186 @@
+"""
+Response compression negotiated through ``Accept-Encoding``: zstd and
+brotli (when the optional ``zstandard`` and ``brotli`` packages are
+installed) or gzip.
+
+Bodies smaller than a threshold are sent as they are, and streamed bodies
+are compressed chunk by chunk as they are sent, never buffered whole.
+Routes tune or turn off compression with the ``compression`` decorator.
+"""
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable, Mapping, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.base.negotiation import quality_values
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Media types never compressed: compressors hold events back until they
+# have enough data, which would delay a stream.
+EXCLUDED_MEDIA_TYPES = ("text/event-stream",)
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class BrotliCompressor:
+    """``brotli.Compressor`` behind the ``zlib``-style ``Compressor`` interface."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+# Compressor factories by content coding, in the order the server prefers
+# them when a client accepts several equally.
+COMPRESSORS: dict[str, Callable[[int], Compressor]] = {
+    **({"zstd": lambda level: zstandard.ZstdCompressor(level=level).compressobj()} if zstandard is not None else {}),
+    **({"br": BrotliCompressor} if brotli is not None else {}),
+    "gzip": lambda level: zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16),
+}
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """How a route's responses are compressed; ``levels`` are per content coding."""
+    minimum_size: int | None = None
+    levels: Mapping[str, int] = field(default_factory=dict)
+    enabled: bool = True
+
+
+def compression(
+        minimum_size: int | None = None,
+        levels: Mapping[str, int] | None = None,
+        enabled: bool = True,
+) -> Callable[[Callable], Callable]:
+    """Decorates an endpoint with its own ``CompressionPolicy``.
+
+    Unset values fall back to those of the ``CompressionMiddleware``.
+    """
+    def decorate(endpoint: Callable) -> Callable:
+        endpoint.compression = CompressionPolicy(minimum_size, levels or {}, enabled)
+        return endpoint
+    return decorate
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Picks the content coding for an ``Accept-Encoding`` header, if any."""
+    if not accept_encoding:
+        return None
+    qualities = quality_values(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in COMPRESSORS:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """Compresses responses with the content coding the client prefers."""
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            minimum_size: int = 1024,
+            levels: Mapping[str, int] | None = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"zstd": 3, "br": 4, "gzip": 6, **(levels or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        await CompressionResponder(self, scope, encoding, send).run(receive)
+
+
+class CompressionResponder:
+    """Compresses one response, once its headers show whether it should be."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str | None, send: Send) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.send = send
+        self.start: Message | None = None
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+
+    async def run(self, receive: Receive) -> None:
+        await self.middleware.app(self.scope, receive, self.send_compressed)
+
+    def policy(self) -> CompressionPolicy:
+        # The router has added the matched endpoint to the scope by now.
+        policy = getattr(self.scope.get("endpoint"), "compression", CompressionPolicy())
+        return CompressionPolicy(
+            minimum_size=self.middleware.minimum_size if policy.minimum_size is None else policy.minimum_size,
+            levels={**self.middleware.levels, **policy.levels},
+            enabled=policy.enabled,
+        )
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith(EXCLUDED_MEDIA_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            # The first chunk decides: headers are held back until then.
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            policy = self.policy()
+            if policy.enabled and (more_body or len(body) >= policy.minimum_size):
+                headers.add_vary_header("Accept-Encoding")
+                if self.encoding is not None:
+                    self.compressor = COMPRESSORS[self.encoding](policy.levels[self.encoding])
+                    body = self.compress(body, more_body)
+                    headers["Content-Encoding"] = self.encoding
+                    if more_body:
+                        del headers["Content-Length"]
+                    else:
+                        headers["Content-Length"] = str(len(body))
+            await self.send(start)
+        elif self.compressor is not None:
+            body = self.compress(body, more_body)
+        await self.send({**message, "body": body})
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.flush()
+        return data
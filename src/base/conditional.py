@@ -0,0 +1,73 @@
+"""
+Helpers for conditional GETs (``ETag``/``If-None-Match`` and
+``Last-Modified``/``If-Modified-Since``).
+
+Validators are derived from the ``(id, updated_at)`` versions of the rows a
+response shows, so they can be computed, and checked, without building or
+serializing the response body.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable
+
+from fastapi import Request, Response
+from starlette import status
+
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Reads naive timestamps (``TIMESTAMP WITHOUT TIME ZONE``) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def validator_headers(versions: Iterable[tuple[int, datetime]]) -> dict[str, str]:
+    """Gets the ``ETag`` and ``Last-Modified`` of a response showing ``versions``.
+
+    The ETag is weak: it identifies the rows shown, not the exact bytes of
+    their encoding.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    last_modified = None
+    for row_id, updated_at in versions:
+        digest.update(f"{row_id}@{updated_at.isoformat()};".encode())
+        if last_modified is None or updated_at > last_modified:
+            last_modified = updated_at
+    headers = {"ETag": f'W/"{digest.hexdigest()}"'}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_conditional(request: Request) -> bool:
+    """Tells whether the request carries a validator to check."""
+    return any(header in request.headers for header in CONDITIONAL_HEADERS)
+
+
+def not_modified(request: Request, headers: dict[str, str]) -> bool:
+    """Checks the request's validators against a response's ``headers``.
+
+    ``If-None-Match`` is compared weakly and, when present, takes precedence
+    over ``If-Modified-Since``, which has a one second resolution.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or headers["ETag"].removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or "Last-Modified" not in headers:
+        return False
+    try:
+        since = _as_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    return parsedate_to_datetime(headers["Last-Modified"]) <= since
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    """Builds a ``304 Not Modified`` carrying the current validators."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
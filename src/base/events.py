@@ -0,0 +1,221 @@
+"""
+In-process fan-out of events to subscribers, optionally relayed across
+processes through Postgres ``LISTEN``/``NOTIFY``.
+
+Publishing never waits on subscribers: each subscription has a bounded
+queue, and one that falls behind has its backlog replaced by a single
+``overflow`` message telling the consumer to catch up by other means.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Generic, Iterator, TypeVar
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Postgres rejects ``NOTIFY`` payloads of 8000 bytes or more.
+NOTIFY_PAYLOAD_LIMIT = 8000
+# Errors after which the relay's connections are opened again.
+CONNECTION_ERRORS = (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError)
+
+
+class Subscription(Generic[T]):
+    """Bounded queue of the events of one topic, for one consumer."""
+
+    def __init__(self, maxsize: int, overflow: T) -> None:
+        self.overflow = overflow
+        self.overflows = 0
+        self._queue: asyncio.Queue[T] = asyncio.Queue(maxsize)
+
+    def put(self, message: T) -> None:
+        """Queues a message, dropping the backlog if the consumer fell behind."""
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.interrupt()
+
+    def interrupt(self) -> None:
+        """Replaces whatever is queued by the ``overflow`` message."""
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(self.overflow)
+        self.overflows += 1
+
+    async def get(self) -> T:
+        """Waits for the next message."""
+        return await self._queue.get()
+
+
+class EventHub(Generic[T]):
+    """Fans messages published on a topic out to the topic's subscriptions.
+
+    With a ``relay`` attached, published messages go through it, and the
+    relay hands them back with ``deliver`` in every process. Listeners are
+    called with every message delivered, whatever its topic, and with
+    ``None`` and the ``overflow`` message when messages may have been lost.
+    """
+
+    def __init__(self, queue_size: int, overflow: T) -> None:
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.relay: "PostgresEventRelay[T] | None" = None
+        self._subscriptions: dict[str, set[Subscription[T]]] = defaultdict(set)
+        self._listeners: list[Callable[[str | None, T], None]] = []
+
+    def __contains__(self, topic: str) -> bool:
+        """Tells whether messages of ``topic`` have anyone to be delivered to."""
+        return bool(self._listeners) or topic in self._subscriptions
+
+    def add_listener(self, listener: Callable[[str | None, T], None]) -> None:
+        """Calls ``listener`` with every message delivered in this process."""
+        self._listeners.append(listener)
+
+    @contextmanager
+    def subscribe(self, topic: str) -> Iterator[Subscription[T]]:
+        """Subscribes to a topic for the duration of the block."""
+        subscription = Subscription(self.queue_size, self.overflow)
+        self._subscriptions[topic].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscriptions[topic]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[topic]
+
+    def publish(self, topic: str, message: T) -> None:
+        """Publishes a message, through the relay if there is one."""
+        if self.relay is not None:
+            self.relay.send(topic, message)
+        else:
+            self.deliver(topic, message)
+
+    def deliver(self, topic: str, message: T) -> None:
+        """Queues a message for this process's subscribers of ``topic``."""
+        for listener in self._listeners:
+            listener(topic, message)
+        for subscription in self._subscriptions.get(topic, ()):
+            subscription.put(message)
+
+    def interrupt(self) -> None:
+        """Tells every subscriber and listener that messages may have been lost."""
+        for listener in self._listeners:
+            listener(None, self.overflow)
+        for subscribers in self._subscriptions.values():
+            for subscription in subscribers:
+                subscription.interrupt()
+
+
+class PostgresEventRelay(Generic[T]):
+    """Relays a hub's messages between processes over a ``NOTIFY`` channel.
+
+    Messages are sent from a bounded outbox by a background task, so
+    publishers never wait on the database; when the outbox is full,
+    messages are dropped and logged. Each process ``LISTEN``s on its own
+    connection and delivers what it hears to its hub, its own messages
+    included. After the listener reconnects, subscribers are interrupted,
+    as notifications sent meanwhile are lost.
+    """
+
+    def __init__(
+            self,
+            hub: EventHub[T],
+            dsn: str,
+            channel: str,
+            encode: Callable[[T], str],
+            decode: Callable[[str], T],
+            outbox_size: int = 10000,
+            batch_size: int = 100,
+            reconnect_delay: float = 1.0,
+    ) -> None:
+        self.hub = hub
+        self.dsn = dsn
+        self.channel = channel
+        self.encode = encode
+        self.decode = decode
+        self.batch_size = batch_size
+        self.reconnect_delay = reconnect_delay
+        self.dropped = 0
+        self.listening = asyncio.Event()
+        self._outbox: asyncio.Queue[tuple[str, str]] = asyncio.Queue(outbox_size)
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Attaches the relay to the hub and starts listening and sending."""
+        self.hub.relay = self
+        self._tasks = [
+            asyncio.create_task(self._listen()),
+            asyncio.create_task(self._send_outbox()),
+        ]
+
+    async def stop(self) -> None:
+        """Detaches the relay and closes its connections."""
+        self.hub.relay = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def send(self, topic: str, message: T) -> None:
+        """Queues a message for ``NOTIFY``, dropping it if the outbox is full."""
+        payload = f"{topic}\t{self.encode(message)}"
+        if len(payload.encode()) >= NOTIFY_PAYLOAD_LIMIT:
+            self.dropped += 1
+            logger.warning("Event for %s is too large to relay; dropped", topic)
+            return
+        try:
+            self._outbox.put_nowait((self.channel, payload))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Event outbox full; dropped a message for %s", topic)
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        topic, _, message = payload.partition("\t")
+        # Messages are only decoded where someone is subscribed or listening.
+        if topic in self.hub:
+            self.hub.deliver(topic, self.decode(message))
+
+    async def _listen(self) -> None:
+        connected_before = False
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                try:
+                    closed = asyncio.Event()
+                    connection.add_termination_listener(lambda _: closed.set())
+                    await connection.add_listener(self.channel, self._on_notification)
+                    if connected_before:
+                        self.hub.interrupt()
+                    connected_before = True
+                    self.listening.set()
+                    await closed.wait()
+                finally:
+                    self.listening.clear()
+                    await connection.close(timeout=self.reconnect_delay)
+            except CONNECTION_ERRORS as exc:
+                logger.warning("Event listener disconnected: %s", exc)
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _send_outbox(self) -> None:
+        connection = None
+        try:
+            while True:
+                batch = [await self._outbox.get()]
+                while len(batch) < self.batch_size and not self._outbox.empty():
+                    batch.append(self._outbox.get_nowait())
+                try:
+                    if connection is None or connection.is_closed():
+                        connection = await asyncpg.connect(self.dsn)
+                    await connection.executemany("SELECT pg_notify($1, $2)", batch)
+                except CONNECTION_ERRORS as exc:
+                    self.dropped += len(batch)
+                    logger.warning("Dropped %d events: %s", len(batch), exc)
+                    await asyncio.sleep(self.reconnect_delay)
+        finally:
+            if connection is not None:
+                await connection.close(timeout=self.reconnect_delay)
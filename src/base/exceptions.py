@@ -15,3 +15,8 @@ class UnAuthorizedException(HTTPException):
 class BadRequestException(HTTPException):
     def __init__(self, detail: str = "Bad request", status_code: int = status.HTTP_400_BAD_REQUEST):
         super().__init__(status_code=status_code, detail=detail)
+
+
+class GoneException(HTTPException):
+    def __init__(self, detail: str = "Resource no longer available", status_code: int = status.HTTP_410_GONE):
+        super().__init__(status_code=status_code, detail=detail)
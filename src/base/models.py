@@ -1,11 +1,23 @@
 from datetime import datetime
+from typing import Callable
 
-from sqlalchemy import func, Integer, DateTime
+from sqlalchemy import func, Integer, DateTime, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.db import Base
 
 
+def extension_available(name: str) -> Callable[..., bool]:
+    """``ddl_if``/``execute_if`` condition that holds when a Postgres extension can be installed."""
+    def available(ddl, target, bind, **kw) -> bool:
+        return bind.scalar(
+            text("SELECT true FROM pg_available_extensions WHERE name = :name"),
+            {"name": name},
+        ) is not None
+
+    return available
+
+
 class CustomBase(Base):
     """Base class for models"""
 
@@ -27,6 +39,9 @@ class CustomBase(Base):
 class TimestampMixin(CustomBase):
     """Mixin for timestamp columns"""
     __abstract__ = True
+    # Read generated timestamps back through INSERT/UPDATE ... RETURNING
+    # instead of a follow-up SELECT.
+    __mapper_args__ = {"eager_defaults": True}
 
     created_at: Mapped[datetime] = mapped_column(
         nullable=False,
@@ -0,0 +1,112 @@
+"""
+Content negotiation between JSON and MessagePack.
+
+Routes of a router built with ``route_class=NegotiatedRoute`` answer in
+MessagePack when the ``Accept`` header asks for it, and accept MessagePack
+request bodies; JSON stays the default both ways. Only ``SchemaResponse``
+bodies are negotiated; errors and streamed responses are always JSON.
+MessagePack needs the optional ``msgpack`` package; without it, every
+response is JSON and MessagePack bodies are refused with a 415.
+"""
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+from starlette import status
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+# Media types clients use for MessagePack, the first being the one answered with.
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack", "application/vnd.msgpack")
+
+# Media type ``SchemaResponse`` encodes to in the current request.
+response_media_type: ContextVar[str] = ContextVar("response_media_type", default=JSON)
+
+
+def quality_values(header: str) -> dict[str, float]:
+    """Gets the quality of each value of an ``Accept``-style header, e.g. ``Accept-Encoding``."""
+    ranges = {}
+    for part in header.split(","):
+        media_range, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_range:
+            ranges[media_range.lower()] = max(quality, ranges.get(media_range.lower(), 0.0))
+    return ranges
+
+
+def negotiate_media_type(accept: str | None) -> str:
+    """Picks the response media type for an ``Accept`` header.
+
+    MessagePack must be asked for by name; it is picked when no JSON range
+    has a higher quality, or an equal one naming JSON explicitly.
+    """
+    if not accept or msgpack is None:
+        return JSON
+    ranges = quality_values(accept)
+    msgpack_quality = max((ranges.get(media_type, 0.0) for media_type in MSGPACK_TYPES))
+    if msgpack_quality <= 0:
+        return JSON
+    if JSON in ranges:
+        return MSGPACK if msgpack_quality > ranges[JSON] else JSON
+    json_quality = max(ranges.get("application/*", 0.0), ranges.get("*/*", 0.0))
+    return MSGPACK if msgpack_quality >= json_quality else JSON
+
+
+def is_msgpack(content_type: str | None) -> bool:
+    return (content_type or "").split(";")[0].strip().lower() in MSGPACK_TYPES
+
+
+class MsgpackRequest(Request):
+    """Request whose MessagePack body is handed to FastAPI as parsed JSON would be.
+
+    FastAPI only parses bodies it sees as JSON, so the request presents
+    itself as such and ``json()`` unpacks the MessagePack instead.
+    """
+
+    def __init__(self, request: Request) -> None:
+        scope = dict(request.scope)
+        scope["headers"] = [
+            (name, value) for name, value in request.scope["headers"] if name != b"content-type"
+        ] + [(b"content-type", JSON.encode())]
+        super().__init__(scope, request.receive)
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """Route reading and answering in JSON or MessagePack, as the client asks."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            if is_msgpack(request.headers.get("content-type")):
+                if msgpack is None:
+                    raise HTTPException(
+                        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, "MessagePack request bodies are not supported")
+                request = MsgpackRequest(request)
+            token = response_media_type.set(negotiate_media_type(request.headers.get("accept")))
+            try:
+                response = await handler(request)
+            finally:
+                response_media_type.reset(token)
+            response.headers.append("Vary", "Accept")
+            return response
+
+        return negotiated_handler
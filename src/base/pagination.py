@@ -0,0 +1,66 @@
+"""
+Helpers for keyset (cursor) pagination.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Generic, Iterable, Sequence, TypeVar
+
+from src.base.exceptions import BadRequestException
+
+T = TypeVar("T")
+
+
+class TotalMode(str, Enum):
+    """How the number of items across all pages is counted."""
+    EXACT = "exact"
+    # The planner's row estimate: fast on large sets, but only as good as
+    # the table statistics.
+    ESTIMATE = "estimate"
+
+
+class Page(list, Generic[T]):
+    """Items of one page, with their ``total`` across pages when it was asked for."""
+
+    def __init__(self, items: Iterable[T] = (), total: int | None = None) -> None:
+        super().__init__(items)
+        self.total = total
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encodes keyset values into an opaque cursor string."""
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value
+         for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+        cursor: str,
+        *parsers: Callable[[Any], Any],
+) -> tuple:
+    """Decodes a cursor, converting each value with the matching parser."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise BadRequestException("Invalid cursor")
+
+
+def next_cursor(
+        items: Sequence[Any],
+        limit: int,
+        *fields: str,
+) -> str | None:
+    """Builds the cursor of the page after ``items``, if there may be one."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(*(getattr(last, field) for field in fields))
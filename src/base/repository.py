@@ -1,11 +1,31 @@
 from abc import ABC
-from dataclasses import dataclass
-from typing import TypeVar, Generic
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Self, TypeVar, Generic
 
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 T = TypeVar('T')
+Callback = Callable[[], Awaitable[None]]
+
+# Key of ``Session.info`` holding the ``Deferred`` work of a session shared
+# by a batch of operations, whose transaction the batch ends itself.
+DEFERRED = "deferred"
+# ``application_name`` of detached sessions, whose transactions are read
+# only: no write is ever stamped with their start time.
+DETACHED_APPLICATION_NAME = "detached-reader"
+
+
+@dataclass
+class Deferred:
+    """Callbacks held back until a batch's transaction ends.
+
+    ``on_commit`` ones only run if it commits, ``on_end`` ones either way.
+    """
+    on_commit: list[Callback] = field(default_factory=list)
+    on_end: list[Callback] = field(default_factory=list)
 
 
 @dataclass
@@ -25,8 +45,55 @@ class Repository(ABC, Generic[T]):
         await self.session.refresh(item)
 
     async def commit(self) -> None:
-        """Commits changes to the database session."""
-        await self.session.commit()
+        """Commits changes to the database session.
+
+        A session shared by a batch only flushes: the batch commits or rolls
+        back each operation as a whole.
+        """
+        if DEFERRED in self.session.info:
+            await self.session.flush()
+        else:
+            await self.session.commit()
+
+    async def after_commit(self, callback: Callback) -> None:
+        """Runs ``callback`` once the changes just committed are visible to others.
+
+        That is right away, unless the session is shared by a batch of
+        operations; then the batch runs it if its transaction commits.
+        """
+        deferred = self.session.info.get(DEFERRED)
+        if deferred is None:
+            await callback()
+        else:
+            deferred.on_commit.append(callback)
+
+    async def after_transaction(self, callback: Callback) -> None:
+        """Runs ``callback`` once the transaction of the changes just committed ends.
+
+        Like ``after_commit``, except that in a batch it also runs when
+        the batch's transaction is rolled back.
+        """
+        deferred = self.session.info.get(DEFERRED)
+        if deferred is None:
+            await callback()
+        else:
+            deferred.on_end.append(callback)
+
+    @asynccontextmanager
+    async def detached(self) -> AsyncIterator[Self]:
+        """Opens a copy of the repository on its own session.
+
+        Used by work that outlives the request, e.g. streamed responses,
+        which keep reading after the request session has been closed. The
+        copy always runs in a read only transaction, which server-side
+        cursors need, even when the request's session is in autocommit. It
+        is named ``DETACHED_APPLICATION_NAME`` until it ends.
+        """
+        async with AsyncSession(self.session.bind, expire_on_commit=False) as session:
+            await session.connection(execution_options={
+                "isolation_level": "READ COMMITTED", "postgresql_readonly": True})
+            await session.execute(select(func.set_config("application_name", DETACHED_APPLICATION_NAME, True)))
+            yield type(self)(session)
 
     async def rollback(self) -> None:
         """Rollbacks changes in the database session."""
@@ -0,0 +1,73 @@
+"""
+JSON responses serialized by pydantic-core straight from what a route has
+at hand: ORM objects, column rows, dicts or schema instances.
+
+Returning one from a route skips FastAPI's ``response_model`` handling
+(validate, dump to Python objects, ``jsonable_encoder``, ``json.dumps``).
+The ``response_model`` can stay on the route for the OpenAPI schema.
+Under a ``NegotiatedRoute``, the body is MessagePack when the client asks
+for it.
+
+Content is validated when the response is built, while the route's session
+is still open, but only encoded when the response is sent. By then the
+session has been closed and its connection returned to the pool.
+"""
+from functools import lru_cache
+from typing import Any, Mapping
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic.main import IncEx
+from starlette.types import Receive, Scope, Send
+
+from src.base.negotiation import MSGPACK, msgpack, response_media_type
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    """Gets the (cached) ``TypeAdapter`` of a schema or type, e.g. ``list[Schema]``."""
+    return TypeAdapter(schema)
+
+
+class SchemaResponse(JSONResponse):
+    """Response of ``content`` serialized as ``schema``.
+
+    Content is read with ``from_attributes``, so ORM objects and rows work
+    as well as dicts, while instances of ``schema`` pass through without
+    being validated again. Datetimes and enums are encoded natively, as
+    ISO 8601 strings and values, in MessagePack too. ``include`` narrows
+    the output as in ``model_dump``.
+    """
+
+    def __init__(
+            self,
+            content: Any,
+            schema: Any,
+            status_code: int = 200,
+            headers: Mapping[str, str] | None = None,
+            include: IncEx | None = None,
+    ) -> None:
+        self.schema = schema
+        self.include = include
+        self.content = type_adapter(schema).validate_python(content, from_attributes=True)
+        super().__init__(
+            None, status_code=status_code, headers=headers, media_type=response_media_type.get())
+
+    def render(self, content: Any) -> None:
+        # Nothing is encoded until the response is sent, see ``render_body``.
+        return None
+
+    def render_body(self) -> bytes:
+        """Encodes the content, once, and sets the ``Content-Length``."""
+        if self.body is None:
+            adapter = type_adapter(self.schema)
+            if self.media_type == MSGPACK:
+                self.body = msgpack.packb(adapter.dump_python(self.content, mode="json", include=self.include))
+            else:
+                self.body = adapter.dump_json(self.content, include=self.include)
+            self.headers["content-length"] = str(len(self.body))
+        return self.body
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.render_body()
+        await super().__call__(scope, receive, send)
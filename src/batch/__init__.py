@@ -0,0 +1 @@
+from src.batch.service import BatchService
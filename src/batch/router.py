@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Request
+
+from src.base.negotiation import NegotiatedRoute
+from src.base.responses import SchemaResponse
+from src.batch import BatchService
+from src.batch.schemas import BatchRequestSchema, BatchResponseSchema
+from src.dependencies import get_batch_service, get_current_user
+from src.users import TokenData
+
+router = APIRouter(
+    prefix="/batch",
+    tags=["batch"],
+    route_class=NegotiatedRoute,
+)
+
+
+@router.post("", response_model=BatchResponseSchema)
+async def run_batch(
+    schema: BatchRequestSchema,
+    request: Request,
+    _: TokenData = Depends(get_current_user),
+    batch_service: BatchService = Depends(get_batch_service),
+):
+    """Run task operations in order, in one request and one transaction.
+
+    Each operation gets the response it would get if sent alone, as the
+    same user. One that fails is rolled back alone, or with ``atomic``,
+    the whole batch is, and the operations after it get a 424.
+    """
+    result = await batch_service.run(schema, request.scope)
+    return SchemaResponse(result, BatchResponseSchema)
@@ -0,0 +1,28 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+
+class BatchOperationSchema(BaseModel):
+    """One request to a task route, e.g. ``PUT /tasks/update`` with its body."""
+    method: Literal["GET", "POST", "PUT", "DELETE"]
+    path: str
+    body: Any = None
+
+
+class BatchRequestSchema(BaseModel):
+    operations: list[BatchOperationSchema]
+    # Roll every operation back, and skip the rest, once one fails.
+    atomic: bool = False
+
+
+class BatchResultSchema(BaseModel):
+    """The response of one operation, with its JSON body decoded."""
+    status: int
+    headers: dict[str, str] = {}
+    body: Any = None
+
+
+class BatchResponseSchema(BaseModel):
+    results: list[BatchResultSchema]
+    committed: bool
@@ -0,0 +1,166 @@
+"""
+Batches of task operations, run in order in one transaction.
+
+Each operation is dispatched to the application as a request of its own,
+so it goes through the same validation, authorization and routes as when
+sent alone. All of them share one ``AsyncSession``, bound to a connection
+whose transaction the batch commits once at the end.
+"""
+from dataclasses import dataclass
+
+from pydantic_core import from_json, to_json
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Scope
+
+from src.base.exceptions import BadRequestException
+from src.base.repository import DEFERRED, Deferred
+from src.batch.schemas import (
+    BatchOperationSchema, BatchRequestSchema, BatchResponseSchema, BatchResultSchema,
+)
+from src.config import Settings
+from src.db import SCOPE_SESSION
+
+BATCH_PATH_PREFIX = "/tasks/"
+# Task routes that stream or hold their own sessions, which a batch cannot share.
+BATCH_EXCLUDED_PATHS = ("/tasks/stream", "/tasks/export", "/tasks/import")
+# Keys of the batch request's scope that its operations inherit.
+INHERITED_SCOPE_KEYS = ("asgi", "http_version", "scheme", "server", "client", "root_path", "state")
+# Request headers set per operation rather than inherited. Operations are
+# never compressed, since their bodies are embedded in the batch response.
+OPERATION_HEADERS = (b"accept", b"accept-encoding", b"content-length", b"content-type")
+# Response headers that describe the operation's own body, left out of results.
+RESULT_EXCLUDED_HEADERS = (b"content-length", b"content-type", b"vary")
+# Status of the operations an atomic batch skips after a failure.
+FAILED_DEPENDENCY = 424
+
+
+def check_operations(operations: list[BatchOperationSchema]) -> None:
+    """Rejects batches that are too long or that name routes a batch cannot run."""
+    if len(operations) > Settings.BATCH_MAX_OPERATIONS:
+        raise BadRequestException(
+            f"At most {Settings.BATCH_MAX_OPERATIONS} operations can be run in a batch")
+    for index, operation in enumerate(operations):
+        path = operation.path.partition("?")[0]
+        if not path.startswith(BATCH_PATH_PREFIX) or path in BATCH_EXCLUDED_PATHS:
+            raise BadRequestException(f"Operation {index} cannot be run in a batch: {operation.path}")
+
+
+@dataclass
+class BatchService:
+    app: ASGIApp
+    engine: AsyncEngine
+
+    async def run(self, schema: BatchRequestSchema, scope: Scope) -> BatchResponseSchema:
+        """Runs the operations in order in one transaction, as the user of ``scope``.
+
+        Each operation runs in a savepoint, and one that fails (with a 4xx
+        or 5xx) is rolled back as a whole, even past writes its routes
+        already committed: inside a batch, repositories only flush. With
+        ``atomic``, the whole batch is rolled back instead, and the
+        operations after it are skipped; no savepoints are needed then.
+        Caches are updated once the transaction ends, committed or not,
+        and task events are only published for the writes it commits.
+        """
+        check_operations(schema.operations)
+
+        deferred = Deferred()
+        results = []
+        failed = False
+        committed = False
+        try:
+            async with self.engine.connect() as connection:
+                transaction = await connection.begin()
+                async with AsyncSession(
+                        bind=connection,
+                        join_transaction_mode="rollback_only" if schema.atomic else "create_savepoint",
+                        expire_on_commit=False,
+                        info={DEFERRED: deferred},
+                ) as session:
+                    for operation in schema.operations:
+                        if failed and schema.atomic:
+                            results.append(BatchResultSchema(status=FAILED_DEPENDENCY))
+                            continue
+                        pending = len(deferred.on_commit)
+                        result = await self._dispatch(operation, scope, session)
+                        results.append(result)
+                        if result.status >= 400:
+                            failed = True
+                            await session.rollback()
+                            del deferred.on_commit[pending:]
+                        else:
+                            await session.commit()
+                if not (failed and schema.atomic):
+                    await transaction.commit()
+                    committed = True
+                elif transaction.is_active:
+                    await transaction.rollback()
+        finally:
+            for callback in deferred.on_end:
+                await callback()
+            if committed:
+                for callback in deferred.on_commit:
+                    await callback()
+        return BatchResponseSchema(results=results, committed=committed)
+
+    async def _dispatch(
+            self,
+            operation: BatchOperationSchema,
+            scope: Scope,
+            session: AsyncSession,
+    ) -> BatchResultSchema:
+        """Runs one operation through the application, on the batch's session."""
+        path, _, query = operation.path.partition("?")
+        body = b"" if operation.body is None else to_json(operation.body)
+        headers = [(name, value) for name, value in scope["headers"] if name not in OPERATION_HEADERS]
+        headers += [
+            (b"accept", b"application/json"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        operation_scope = {
+            **{key: scope[key] for key in INHERITED_SCOPE_KEYS if key in scope},
+            "type": "http",
+            "method": operation.method,
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": headers,
+            SCOPE_SESSION: session,
+        }
+        requests = [{"type": "http.request", "body": body, "more_body": False}]
+        start: Message = {}
+        chunks = []
+
+        async def receive() -> Message:
+            return requests.pop() if requests else {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.app(operation_scope, receive, send)
+        except Exception:
+            # The server error middleware has sent a 500 before re-raising.
+            if not start:
+                return BatchResultSchema(status=500)
+        content = b"".join(chunks)
+        response_headers = start.get("headers", [])
+        if not content:
+            body = None
+        elif Headers(raw=response_headers).get("content-type", "").startswith("application/json"):
+            body = from_json(content)
+        else:
+            body = content.decode(errors="replace")
+        return BatchResultSchema(
+            status=start["status"],
+            headers={
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in response_headers
+                if name not in RESULT_EXCLUDED_HEADERS
+            },
+            body=body,
+        )
@@ -16,6 +16,37 @@ class Settings:
     REFRESH_TOKEN_EXPIRE_MINUTES = int(
         os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES", 60 * 24 * 7))
 
+    # Tasks
+    TASKS_BULK_MAX_ITEMS = int(os.getenv("TASKS_BULK_MAX_ITEMS", 1000))
+    TASKS_EXPORT_BATCH_SIZE = int(os.getenv("TASKS_EXPORT_BATCH_SIZE", 1000))
+    TASKS_IMPORT_CHUNK_SIZE = int(os.getenv("TASKS_IMPORT_CHUNK_SIZE", 10000))
+    TASKS_IMPORT_MAX_ERRORS = int(os.getenv("TASKS_IMPORT_MAX_ERRORS", 100))
+    TASKS_CACHE_TTL_SECONDS = float(os.getenv("TASKS_CACHE_TTL_SECONDS", 30))
+    TASKS_CACHE_MAX_ENTRIES = int(os.getenv("TASKS_CACHE_MAX_ENTRIES", 10000))
+    TASKS_CACHE_MAX_BYTES = int(os.getenv("TASKS_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+    TASKS_LIST_CACHE_TTL_SECONDS = float(os.getenv("TASKS_LIST_CACHE_TTL_SECONDS", 300))
+    TASKS_LIST_CACHE_MAX_ENTRIES = int(os.getenv("TASKS_LIST_CACHE_MAX_ENTRIES", 10000))
+    TASKS_LIST_CACHE_MAX_BYTES = int(os.getenv("TASKS_LIST_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    TASKS_SUGGEST_LIMIT = int(os.getenv("TASKS_SUGGEST_LIMIT", 10))
+    TASKS_SUGGEST_CACHE_USERS = int(os.getenv("TASKS_SUGGEST_CACHE_USERS", 1000))
+    TASKS_SUGGEST_CACHE_PREFIXES = int(os.getenv("TASKS_SUGGEST_CACHE_PREFIXES", 50))
+    TASKS_CHANGES_MAX_PAGE_SIZE = int(os.getenv("TASKS_CHANGES_MAX_PAGE_SIZE", 1000))
+    TASKS_TOMBSTONE_RETENTION_DAYS = int(os.getenv("TASKS_TOMBSTONE_RETENTION_DAYS", 30))
+    TASKS_STATS_MAX_DAYS = int(os.getenv("TASKS_STATS_MAX_DAYS", 366))
+    TASKS_EVENTS_BACKEND = os.getenv("TASKS_EVENTS_BACKEND", "postgres")
+    TASKS_EVENTS_OUTBOX_SIZE = int(os.getenv("TASKS_EVENTS_OUTBOX_SIZE", 10000))
+    TASKS_STREAM_QUEUE_SIZE = int(os.getenv("TASKS_STREAM_QUEUE_SIZE", 100))
+    TASKS_STREAM_KEEPALIVE_SECONDS = float(os.getenv("TASKS_STREAM_KEEPALIVE_SECONDS", 15))
+
+    # Batches
+    BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", 50))
+
+    # Responses
+    COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3))
+    COMPRESSION_BROTLI_LEVEL = int(os.getenv("COMPRESSION_BROTLI_LEVEL", 4))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+
     # Database
     DB_HOST = os.getenv("POSTGRES_HOST")
     DB_PORT = os.getenv("POSTGRES_PORT", 5432)
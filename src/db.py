@@ -1,3 +1,6 @@
+from typing import AsyncIterator
+
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
@@ -7,6 +10,9 @@ engine = create_async_engine(
     Settings.DATABASE_URL,
     echo=Settings.DEBUG,
 )
+# The same pool, for requests that only read: their statements run in
+# autocommit, with no BEGIN or COMMIT round trips around them.
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -15,9 +21,28 @@ SessionLocal = sessionmaker(
 )
 Base = declarative_base()
 
+# Key of the ASGI scope holding the session shared by the operations of a
+# batch, which commits or rolls back its transaction itself.
+SCOPE_SESSION = "db_session"
+# Methods whose requests never write.
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
 
-async def get_session() -> AsyncSession:
-    """Get session for database"""
+async def get_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Get session for database, the batch's one inside a batch
+
+    No connection is checked out until the first query. Reads run in
+    autocommit and writes are committed; either way the connection goes
+    back to the pool before the response is encoded.
+    """
+    session = request.scope.get(SCOPE_SESSION)
+    if session is not None:
+        yield session
+        return
+    if request.method in READ_METHODS:
+        async with SessionLocal(bind=read_engine) as session:
+            yield session
+        return
     async with SessionLocal() as session:
         yield session
         await session.commit()
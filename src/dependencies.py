@@ -1,7 +1,8 @@
 from fastapi import Depends, Request
 
 from src.base.exceptions import UnAuthorizedException
-from src.db import get_session
+from src.batch import BatchService
+from src.db import engine, get_session
 from src.tasks import TaskRepository, TaskService
 from src.users import UserRepository, UserService, TokenData, get_payload_from_token
 
@@ -52,3 +53,10 @@ async def get_task_service(
 ) -> TaskService:
     """Gets a task service."""
     return TaskService(task_repository)
+
+
+async def get_batch_service(
+    request: Request,
+) -> BatchService:
+    """Gets a batch service running operations through this application."""
+    return BatchService(request.app, engine)
@@ -1,9 +1,32 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from src.base.compression import CompressionMiddleware
+from src.batch.router import router as batch_router
+from src.config import Settings
+from src.tasks.events import relay_task_events
 from src.users.router import router as user_router
 from src.tasks.router import router as task_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with relay_task_events():
+        yield
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=Settings.COMPRESSION_MINIMUM_SIZE,
+    levels={
+        "zstd": Settings.COMPRESSION_ZSTD_LEVEL,
+        "br": Settings.COMPRESSION_BROTLI_LEVEL,
+        "gzip": Settings.COMPRESSION_GZIP_LEVEL,
+    },
+)
 
 app.include_router(user_router)
 app.include_router(task_router)
+app.include_router(batch_router)
@@ -0,0 +1,62 @@
+"""
+Task events, pushed to the task owner's ``/tasks/stream`` connections.
+
+Events only name the tasks that changed; clients fetch them with
+``/tasks/changes``, which is also how they catch up after a ``resync``.
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Sequence
+
+from src.base.events import EventHub, PostgresEventRelay
+from src.config import Settings
+from src.tasks.schemas import TaskEventSchema, TaskEventType
+
+TASK_EVENTS_CHANNEL = "task_events"
+# IDs per event, which keeps a relayed event well under the NOTIFY payload limit.
+TASK_EVENT_MAX_IDS = 500
+
+TASK_EVENTS: EventHub[TaskEventSchema] = EventHub(
+    queue_size=Settings.TASKS_STREAM_QUEUE_SIZE,
+    overflow=TaskEventSchema(type=TaskEventType.RESYNC),
+)
+
+
+def task_events_topic(user_id: int) -> str:
+    """Gets the hub topic of a user's task events."""
+    return str(user_id)
+
+
+def task_events(event_type: TaskEventType, task_ids: Sequence[int]) -> list[TaskEventSchema]:
+    """Builds the events announcing ``task_ids``, split to fit a notification."""
+    if not task_ids:
+        return [TaskEventSchema(type=event_type)]
+    return [
+        TaskEventSchema(type=event_type, ids=list(task_ids[start:start + TASK_EVENT_MAX_IDS]))
+        for start in range(0, len(task_ids), TASK_EVENT_MAX_IDS)
+    ]
+
+
+def encode_task_event(event: TaskEventSchema) -> bytes:
+    """Encodes an event as a Server-Sent Event named after its type."""
+    return f"event: {event.type}\ndata: {event.model_dump_json()}\n\n".encode()
+
+
+@asynccontextmanager
+async def relay_task_events(hub: EventHub[TaskEventSchema] = TASK_EVENTS) -> AsyncIterator[None]:
+    """Relays task events between workers while the block runs, if configured to."""
+    if Settings.TASKS_EVENTS_BACKEND != "postgres":
+        yield
+        return
+    relay = PostgresEventRelay(
+        hub,
+        dsn=Settings.DATABASE_URL.replace("+asyncpg", ""),
+        channel=TASK_EVENTS_CHANNEL,
+        encode=TaskEventSchema.model_dump_json,
+        decode=TaskEventSchema.model_validate_json,
+        outbox_size=Settings.TASKS_EVENTS_OUTBOX_SIZE,
+    )
+    await relay.start()
+    try:
+        yield
+    finally:
+        await relay.stop()
@@ -0,0 +1,39 @@
+"""
+Encoders turning batches of task rows into export file chunks.
+"""
+import csv
+import io
+from typing import Iterable, Mapping
+
+from pydantic import TypeAdapter
+
+from src.tasks.repository import task_from_row
+from src.tasks.schemas import TaskFileFormat, TaskResponseSchema
+
+EXPORT_MEDIA_TYPES = {
+    TaskFileFormat.NDJSON: "application/x-ndjson",
+    TaskFileFormat.CSV: "text/csv",
+}
+EXPORT_FIELDS = tuple(TaskResponseSchema.model_fields)
+
+_task_adapter = TypeAdapter(TaskResponseSchema)
+
+
+def encode_ndjson(rows: Iterable[Mapping]) -> bytes:
+    """Encodes rows as newline-delimited JSON, one task per line."""
+    return b"".join(
+        _task_adapter.dump_json(task_from_row(row)) + b"\n" for row in rows)
+
+
+def encode_csv(rows: Iterable[Mapping], header: bool = False) -> bytes:
+    """Encodes rows as CSV, optionally preceded by the header line."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(
+        [row[field].isoformat() if field in ("created_at", "updated_at") else row[field]
+         for field in EXPORT_FIELDS]
+        for row in rows
+    )
+    return buffer.getvalue().encode()
@@ -0,0 +1,116 @@
+"""
+Incremental readers for task import files, and the import CLI.
+
+Usage::
+
+    python -m src.tasks.importer tasks.csv --user-id 1 --format csv
+"""
+import argparse
+import asyncio
+import codecs
+import csv
+import json
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from src.db import SessionLocal, engine
+from src.tasks.repository import TaskRepository
+from src.tasks.schemas import ImportTaskResultSchema, TaskFileFormat
+from src.tasks.service import TaskService
+
+READ_SIZE = 1 << 16
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Splits a stream of UTF-8 byte chunks into lines, keeping their endings."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Reads one JSON value per non-blank line.
+
+    Lines that are not valid JSON are yielded as the raw string, so they
+    fail validation and are reported like any other invalid row.
+    """
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line.rstrip("\r\n")
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict[str, str]]:
+    """Reads CSV rows keyed by the header line.
+
+    Quoted fields may span lines: a record ends on the first line break
+    outside quotes, i.e. once it holds an even number of quote characters.
+    """
+    header, record = None, ""
+    async for line in iter_lines(chunks):
+        record += line
+        if record.count('"') % 2:
+            continue
+        values = next(csv.reader([record]), [])
+        record = ""
+        if not values:
+            continue
+        if header is None:
+            header = values
+        else:
+            yield dict(zip(header, values))
+
+
+def iter_import_records(
+        chunks: AsyncIterator[bytes],
+        import_format: TaskFileFormat,
+) -> AsyncIterator[Any]:
+    """Reads the records of an import stream in ``import_format``."""
+    if import_format == TaskFileFormat.CSV:
+        return iter_csv_records(chunks)
+    return iter_ndjson_records(chunks)
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    """Reads a file in fixed-size chunks."""
+    with path.open("rb") as file:
+        while chunk := file.read(READ_SIZE):
+            yield chunk
+
+
+async def main(path: Path, user_id: int, import_format: TaskFileFormat, skip_invalid: bool) -> None:
+    def report(result: ImportTaskResultSchema) -> None:
+        print(f"chunk {result.chunks}: {result.imported} imported, {result.failed} failed", flush=True)
+
+    async with SessionLocal() as session:
+        service = TaskService(TaskRepository(session))
+        result = await service.import_tasks(
+            records=iter_import_records(read_file(path), import_format),
+            user_id=user_id,
+            skip_invalid=skip_invalid,
+            on_progress=report,
+        )
+    print(result.model_dump_json(indent=2))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import tasks from a CSV or NDJSON file.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--format", type=TaskFileFormat, choices=list(TaskFileFormat))
+    parser.add_argument("--skip-invalid", action="store_true")
+    args = parser.parse_args()
+    file_format = args.format or TaskFileFormat(
+        "csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    asyncio.run(main(args.path, args.user_id, file_format, args.skip_invalid))
@@ -0,0 +1,51 @@
+"""
+Periodic upkeep of the tasks tables, meant to be run from cron or a
+scheduler::
+
+    python -m src.tasks.maintenance prune-tombstones
+    python -m src.tasks.maintenance reconcile-stats
+"""
+import argparse
+import asyncio
+
+from src.db import SessionLocal, engine
+from src.tasks.repository import TaskRepository
+from src.tasks.service import TaskService
+from src.users.models import User  # noqa: F401  (registers the mapper)
+
+
+async def prune_tombstones() -> None:
+    """Drops deletions older than ``TASKS_TOMBSTONE_RETENTION_DAYS`` from the change feed."""
+    async with SessionLocal() as session:
+        pruned = await TaskService(TaskRepository(session)).prune_task_tombstones()
+    print(f"pruned {pruned} task tombstones")
+
+
+async def reconcile_stats() -> None:
+    """Rebuilds the task counters behind ``/tasks/stats`` and reports drift."""
+    async with SessionLocal() as session:
+        drift = await TaskService(TaskRepository(session)).reconcile_task_stats()
+    for table, rows in drift.items():
+        print(f"{table}: {len(rows)} rows drifted")
+        for row in rows:
+            print("  " + ", ".join(f"{key}={value}" for key, value in row.items()))
+
+
+COMMANDS = {
+    "prune-tombstones": prune_tombstones,
+    "reconcile-stats": reconcile_stats,
+}
+
+
+async def main(command: str) -> None:
+    try:
+        await COMMANDS[command]()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("command", choices=COMMANDS)
+    args = parser.parse_args()
+    asyncio.run(main(args.command))
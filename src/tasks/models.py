@@ -1,27 +1,119 @@
+from datetime import date, datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, Column, Computed, ForeignKey, Index, Integer, event, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
-from src.base.models import TimestampMixin
+from src.base.models import CustomBase, TimestampMixin, extension_available
+from src.db import Base
+from src.tasks.schemas import TaskStatus
 if TYPE_CHECKING:
     from src.users.models import User
 
+# Text search configuration of ``tasks.search_vector`` and of search queries.
+SEARCH_CONFIG = "english"
+# Extension providing the trigram operator class of ``ix_tasks_title_trgm``.
+TRIGRAM_EXTENSION = "pg_trgm"
+
 
 class Task(TimestampMixin):
     """Task model"""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Listing indexes, ordered like ``TaskRepository`` pagination.
+        Index("ix_tasks_user_id_created_at_id",
+              "user_id", "created_at", "id"),
+        Index("ix_tasks_user_id_status_created_at_id",
+              "user_id", "status", "created_at", "id"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        # Change feed, ordered like ``TaskRepository.get_changed_tasks``.
+        Index("ix_tasks_user_id_updated_at_id",
+              "user_id", "updated_at", "id"),
+        *(
+            Index(f"ix_tasks_{status}_created_at_id", "created_at", "id",
+                  postgresql_where=text(f"status = '{status}'"))
+            for status in TaskStatus
+        ),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # Serves ``ILIKE`` title suggestions; skipped where pg_trgm is missing.
+        Index("ix_tasks_title_trgm", "title", postgresql_using="gin",
+              postgresql_ops={"title": "gin_trgm_ops"},
+              info={"extension": TRIGRAM_EXTENSION},
+              ).ddl_if(callable_=extension_available(TRIGRAM_EXTENSION)),
+    )
+    # ``search_vector`` is maintained by Postgres and only used in queries,
+    # so it is left unmapped to keep it out of INSERT/UPDATE ... RETURNING.
+    __mapper_args__ = {
+        **TimestampMixin.__mapper_args__,
+        "exclude_properties": ["search_vector"],
+    }
 
     title: Mapped[str] = mapped_column(nullable=False)
     description: Mapped[str] = mapped_column(nullable=True)
     status: Mapped[str] = mapped_column(nullable=False)
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id"), nullable=False)
+    # When the status last became completed; NULL for tasks created
+    # completed, which count as completed on the day they were created.
+    completed_at: Mapped[datetime] = mapped_column(nullable=True)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="tasks")
 
-    def update(self, **kwargs) -> None:
-        """Updates the task with the given kwargs."""
-        for key, value in kwargs.items():
-            if value and key in ("title", "description", "status"):
-                setattr(self, key, value)
+
+class TaskTombstone(CustomBase):
+    """Deleted task, kept for the change feed; ``id`` is the task's ID."""
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_user_id_deleted_at_id",
+              "user_id", "deleted_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class TaskStatusCount(Base):
+    """Number of a user's tasks in a status, kept up by ``TaskRepository`` writes."""
+    __tablename__ = "task_status_counts"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    status: Mapped[str] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(nullable=False)
+
+
+class TaskDailyCount(Base):
+    """Number of a user's tasks created, and completed, on a day.
+
+    Like ``TaskStatusCount`` it counts existing tasks, so deleting a task
+    takes it off the days it was created and completed on.
+    """
+    __tablename__ = "task_daily_counts"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    created: Mapped[int] = mapped_column(nullable=False)
+    completed: Mapped[int] = mapped_column(nullable=False)
+
+
+event.listen(
+    Task.__table__,
+    "before_create",
+    DDL(f"CREATE EXTENSION IF NOT EXISTS {TRIGRAM_EXTENSION}").execute_if(
+        callable_=extension_available(TRIGRAM_EXTENSION)),
+)
@@ -1,9 +1,178 @@
-from typing import Sequence
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Column, Date, DateTime, Integer, MetaData, Row, RowMapping, Select, String, Table,
+    and_, any_, case, cast, column, delete, func, insert, literal, literal_column, or_, select,
+    table, text, true, tuple_, union_all, update,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import (
+    ARRAY, insert as pg_insert, ts_headline, websearch_to_tsquery,
+)
+from sqlalchemy.orm import load_only
+from sqlalchemy.schema import CreateTable
 
-from src.base.repository import Repository
-from src.tasks.models import Task
+from src.base.pagination import Page, TotalMode
+from src.base.repository import DETACHED_APPLICATION_NAME, Repository
+from src.tasks.models import (
+    SEARCH_CONFIG, Task, TaskDailyCount, TaskStatusCount, TaskTombstone,
+)
+from src.tasks.schemas import (
+    TaskResponseSchema, TaskSearchResultSchema, TaskStatus, TaskSuggestionSchema,
+)
+
+# Stable ordering shared by offset and keyset pagination.
+TASK_SORT_KEY = (Task.created_at, Task.id)
+# Order of the change feed, which has an index of its own.
+CHANGE_SORT_KEY = (Task.updated_at, Task.id)
+TOMBSTONE_SORT_KEY = (TaskTombstone.deleted_at, TaskTombstone.id)
+# Columns of ``pg_stat_activity`` telling which transactions are open.
+PG_STAT_ACTIVITY = table(
+    "pg_stat_activity",
+    column("datname"), column("backend_type"), column("application_name"), column("xact_start"),
+)
+# Table columns backing ``TaskResponseSchema``; selecting them directly skips
+# ORM hydration and the identity map on list reads.
+TASK_COLUMNS = tuple(
+    Task.__table__.c[field] for field in TaskResponseSchema.model_fields)
+
+# Per-connection staging table that imports COPY into before merging into
+# ``tasks``. It has its own metadata so ``create_all`` never creates it.
+TASK_IMPORT_STAGING = Table(
+    "task_import_staging", MetaData(),
+    Column("title", String, nullable=False),
+    Column("description", String),
+    Column("status", String, nullable=False),
+    Column("user_id", Integer, nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DELETE ROWS",
+)
+TASK_IMPORT_COLUMNS = tuple(TASK_IMPORT_STAGING.c.keys())
+
+SEARCH_HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=5"
+
+# Extra columns of a page read together with its total.
+PAGE_TOTAL = "total"
+PAGE_POSITION = "position"
+
+# ``(status, created_at, completed_at)`` of a task, before or after a write.
+TaskState = tuple[str, datetime, datetime | None]
+# ``weight`` tasks of a user going from one state to another, with no state
+# before they were created and none after they were deleted.
+TaskCountChange = tuple[int, TaskState | None, TaskState | None, int]
+
+
+def task_counts_delta(
+        changes: Iterable[TaskCountChange],
+) -> tuple[list[dict], list[dict]]:
+    """Nets changes into ``TaskStatusCount`` and ``TaskDailyCount`` rows to add.
+
+    Rows are in key order; keys whose counts do not change are left out.
+    """
+    statuses: Counter = Counter()
+    days: defaultdict = defaultdict(lambda: [0, 0])
+    for user_id, before, after, weight in changes:
+        for state, sign in ((before, -weight), (after, weight)):
+            if state is None:
+                continue
+            status, created_at, completed_at = state
+            statuses[user_id, status] += sign
+            days[user_id, created_at.date()][0] += sign
+            if status == TaskStatus.COMPLETED:
+                days[user_id, (completed_at or created_at).date()][1] += sign
+    return (
+        [
+            {"user_id": user_id, "status": str(status), "count": count}
+            for (user_id, status), count in sorted(statuses.items())
+            if count
+        ],
+        [
+            {"user_id": user_id, "day": day, "created": created, "completed": completed}
+            for (user_id, day), (created, completed) in sorted(days.items())
+            if created or completed
+        ],
+    )
+
+
+def completed_at_for(status: str):
+    """Gets the ``completed_at`` a task takes when its status is set to ``status``.
+
+    A task already completed keeps its completion time.
+    """
+    if status != TaskStatus.COMPLETED:
+        return None
+    return case((Task.status == TaskStatus.COMPLETED, Task.completed_at), else_=func.now())
+
+
+def _task_state(task: Task) -> TaskState:
+    """Gets the state of a loaded task that the counters depend on."""
+    return task.status, task.created_at, task.completed_at
+
+
+def _add_counts(model: type, rows: list[dict]):
+    """Builds an upsert adding ``rows`` to the counts of a counter table."""
+    table = model.__table__
+    keys = [key.name for key in table.primary_key]
+    statement = pg_insert(table).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={name: table.c[name] + statement.excluded[name] for name in rows[0] if name not in keys},
+    )
+
+
+def _reconcile_counts(model: type, recount: Select, user_id: int | None):
+    """Builds a statement storing ``recount`` in a counter table where it differs.
+
+    It returns the rows that differed, with their stored counts as ``stored_*``.
+    """
+    table = model.__table__
+    keys = [key.name for key in table.primary_key]
+    counts = [name for name in table.c.keys() if name not in keys]
+    actual = recount.subquery("actual")
+    stored = select(table)
+    if user_id is not None:
+        stored = stored.where(table.c.user_id == user_id)
+    stored = stored.subquery("stored")
+    drift = (
+        select(
+            *(func.coalesce(actual.c[key], stored.c[key]).label(key) for key in keys),
+            *(func.coalesce(stored.c[name], 0).label(f"stored_{name}") for name in counts),
+            *(func.coalesce(actual.c[name], 0).label(name) for name in counts),
+        )
+        .select_from(actual.join(
+            stored, and_(*(actual.c[key] == stored.c[key] for key in keys)), full=True))
+        .where(or_(*(
+            func.coalesce(stored.c[name], 0) != func.coalesce(actual.c[name], 0)
+            for name in counts
+        )))
+        .cte("drift")
+    )
+    fix = pg_insert(table).from_select(keys + counts, select(*(drift.c[name] for name in keys + counts)))
+    fix = fix.on_conflict_do_update(
+        index_elements=keys, set_={name: fix.excluded[name] for name in counts})
+    return select(drift).add_cte(fix.cte("fixed"))
+
+
+def task_columns(fields: Sequence[str] | None = None) -> Sequence[Column]:
+    """Gets the task columns backing ``fields``, all of them by default."""
+    if fields is None:
+        return TASK_COLUMNS
+    return tuple(Task.__table__.c[field] for field in fields)
+
+
+def task_from_row(row, schema: type[TaskResponseSchema] = TaskResponseSchema) -> TaskResponseSchema:
+    """Builds a response from a task row without re-validating it.
+
+    Rows of only some fields build a partial response, whose other fields
+    are unset or at their defaults.
+    """
+    values = dict(row)
+    if "status" in values:
+        values["status"] = TaskStatus(values["status"])
+    return schema.model_construct(**values)
 
 
 class TaskRepository(Repository[Task]):
@@ -11,61 +180,385 @@ class TaskRepository(Repository[Task]):
 
     async def get_task(
             self,
-            task_id: int
+            task_id: int,
+            fields: Sequence[str] | None = None,
     ) -> Task:
-        """Gets a task by ID."""
-        result = await self.session.execute(select(Task).where(Task.id == task_id))
+        """Gets a task by ID, with only ``fields`` loaded if given."""
+        query = select(Task).where(Task.id == task_id)
+        if fields is not None:
+            query = query.options(load_only(*(getattr(Task, name) for name in fields), raiseload=True))
+        result = await self.session.execute(query)
 
         return result.scalars().first()
 
+    async def get_tasks_by_ids(
+            self,
+            task_ids: Sequence[int],
+            fields: Sequence[str] | None = None,
+    ) -> list[TaskResponseSchema]:
+        """Gets the tasks with the given IDs in one query, in no particular order."""
+        return await self._fetch_task_rows(
+            select(*task_columns(fields)).where(Task.id == any_(literal(list(task_ids), ARRAY(Integer)))))
+
+    async def get_task_updated_at(
+            self,
+            task_id: int,
+    ) -> datetime | None:
+        """Gets when a task was last changed, without loading it."""
+        return await self.session.scalar(
+            select(Task.updated_at).where(Task.id == task_id))
+
+    @staticmethod
+    def _paginate(
+            query: Select,
+            limit: int,
+            offset: int,
+            after: tuple[datetime, int] | None,
+    ) -> Select:
+        """Orders the query by the task keyset and applies the page window."""
+        if after is not None:
+            query = query.where(tuple_(*TASK_SORT_KEY) > tuple_(*after))
+        return query.order_by(*TASK_SORT_KEY).limit(limit).offset(offset)
+
+    async def _fetch_task_rows(
+            self,
+            query: Select,
+    ) -> list[TaskResponseSchema]:
+        """Runs a read-only column query and maps rows straight to responses."""
+        result = await self.session.execute(query)
+
+        return [task_from_row(row) for row in result.mappings().all()]
+
+    @staticmethod
+    def _count(
+            query: Select,
+            total: TotalMode,
+    ) -> Select:
+        """Builds a one-row subquery of the ``total`` of rows ``query`` selects.
+
+        Estimates are the planner's row estimate for ``query``, read by the
+        ``count_estimate`` function without running it.
+        """
+        if total == TotalMode.EXACT:
+            counted = query.with_only_columns(func.count().label(PAGE_TOTAL), maintain_column_froms=True)
+        else:
+            counted = select(func.count_estimate(str(query.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))).label(PAGE_TOTAL))
+        return counted.subquery("total")
+
+    async def _fetch_task_page(
+            self,
+            query: Select,
+            limit: int,
+            offset: int,
+            after: tuple[datetime, int] | None,
+            total: TotalMode | None = None,
+    ) -> Page[TaskResponseSchema]:
+        """Runs a read-only column query for one page of tasks.
+
+        With ``total``, the number of tasks ``query`` selects across all
+        pages is read in the same statement: the page is joined laterally
+        to the count, so a page past the end still carries it.
+        """
+        page = self._paginate(query, limit, offset, after)
+        if total is None:
+            return Page(await self._fetch_task_rows(page))
+
+        page = page.add_columns(
+            func.row_number().over(order_by=TASK_SORT_KEY).label(PAGE_POSITION)
+        ).lateral("page")
+        counted = self._count(query, total)
+        result = await self.session.execute(
+            select(counted.c[PAGE_TOTAL], page)
+            .select_from(counted.outerjoin(page, true()))
+            .order_by(page.c[PAGE_POSITION])
+        )
+        rows = result.mappings().all()
+        return Page(
+            [
+                task_from_row({key: row[key] for key in page.c.keys() if key != PAGE_POSITION})
+                for row in rows
+                if row[PAGE_POSITION] is not None
+            ],
+            total=rows[0][PAGE_TOTAL],
+        )
+
     async def get_tasks(
             self,
             limit: int = 100,
-            offset: int = 0
-    ) -> Sequence[Task]:
+            offset: int = 0,
+            after: tuple[datetime, int] | None = None,
+            fields: Sequence[str] | None = None,
+            total: TotalMode | None = None,
+    ) -> Page[TaskResponseSchema]:
         """Gets all tasks."""
-        result = await self.session.execute(select(Task).limit(limit).offset(offset))
-
-        return result.scalars().all()
+        return await self._fetch_task_page(
+            select(*task_columns(fields)), limit, offset, after, total)
 
     async def get_tasks_by_status(
             self,
             limit: int = 100,
             offset: int = 0,
-            status: str = "not started"
-    ) -> Sequence[Task]:
+            status: str = "not started",
+            after: tuple[datetime, int] | None = None,
+            fields: Sequence[str] | None = None,
+            total: TotalMode | None = None,
+    ) -> Page[TaskResponseSchema]:
         """Gets all tasks by status."""
-        print("Status: ", status)
-        result = await self.session.execute(
-            select(Task)
-            .where(Task.status == status)
-            .limit(limit)
-            .offset(offset)
+        return await self._fetch_task_page(
+            select(*task_columns(fields)).where(Task.status == status),
+            limit, offset, after, total,
         )
-        print("WE ARE HERE")
-        return result.scalars().all()
 
     async def get_user_tasks(
             self,
             user_id: int,
             status: str = None,
             limit: int = 100,
-            offset: int = 0
-    ) -> Sequence[Task]:
+            offset: int = 0,
+            after: tuple[datetime, int] | None = None,
+            fields: Sequence[str] | None = None,
+            total: TotalMode | None = None,
+    ) -> Page[TaskResponseSchema]:
         """Gets all tasks for a user."""
+        query = select(*task_columns(fields)).where(Task.user_id == user_id)
         if status:
-            result = await self.session.execute(
-                select(Task)
-                .where(Task.user_id == user_id, Task.status == status)
-                .limit(limit).offset(offset)
+            query = query.where(Task.status == status)
+        return await self._fetch_task_page(query, limit, offset, after, total)
+
+    async def search_tasks(
+            self,
+            query: str,
+            user_id: int = None,
+            status: str = None,
+            limit: int = 100,
+            after: tuple[float, int] | None = None,
+    ) -> list[TaskSearchResultSchema]:
+        """Finds tasks matching a web-search style query, best ranked first.
+
+        Matches come from the GIN index on ``search_vector``; ``after`` is
+        the ``(rank, id)`` of the last result of the previous page.
+        Highlights are only computed for the rows of the page.
+        """
+        search_vector = Task.__table__.c.search_vector
+        ts_query = websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(search_vector, ts_query)
+        statement = select(
+            *TASK_COLUMNS,
+            rank.label("rank"),
+            ts_headline(
+                SEARCH_CONFIG,
+                func.coalesce(Task.description, Task.title),
+                ts_query,
+                SEARCH_HEADLINE_OPTIONS,
+            ).label("headline"),
+        ).where(search_vector.bool_op("@@")(ts_query))
+        if user_id is not None:
+            statement = statement.where(Task.user_id == user_id)
+        if status:
+            statement = statement.where(Task.status == status)
+        if after is not None:
+            statement = statement.where(tuple_(rank, Task.id) < tuple_(*after))
+        result = await self.session.execute(
+            statement.order_by(rank.desc(), Task.id.desc()).limit(limit)
+        )
+
+        return [
+            task_from_row(row, TaskSearchResultSchema)
+            for row in result.mappings().all()
+        ]
+
+    async def suggest_tasks(
+            self,
+            user_id: int,
+            prefix: str,
+            limit: int = 10,
+    ) -> list[TaskSuggestionSchema]:
+        """Gets the user's tasks whose title contains ``prefix``, ignoring case.
+
+        Titles starting with ``prefix`` come first, then shorter titles.
+        The ``ILIKE`` is served by the trigram index on ``title``.
+        """
+        escaped = re.sub(r"([\\%_])", r"\\\1", prefix)
+        starts_with = Task.title.ilike(f"{escaped}%")
+        result = await self.session.execute(
+            select(Task.id, Task.title, Task.status)
+            .where(Task.user_id == user_id, Task.title.ilike(f"%{escaped}%"))
+            .order_by(starts_with.desc(), func.length(Task.title), Task.id.desc())
+            .limit(limit)
+        )
+
+        return [
+            TaskSuggestionSchema.model_construct(**{**row, "status": TaskStatus(row["status"])})
+            for row in result.mappings().all()
+        ]
+
+    async def get_change_horizon(self) -> datetime:
+        """Gets the time before which every write to tasks has committed.
+
+        Rows are stamped with ``now()``, the start of the writing
+        transaction, so a transaction still open may yet commit rows
+        stamped as early as its start. The horizon is the start of the
+        oldest open transaction in the database, this one included, but
+        for the read only ones of detached sessions, e.g. exports.
+        Transactions of other roles are only seen with ``pg_read_all_stats``.
+        """
+        return await self.session.scalar(
+            select(cast(
+                func.coalesce(func.min(PG_STAT_ACTIVITY.c.xact_start), func.now()),
+                DateTime,
+            )).where(
+                PG_STAT_ACTIVITY.c.datname == func.current_database(),
+                PG_STAT_ACTIVITY.c.backend_type == "client backend",
+                PG_STAT_ACTIVITY.c.application_name.is_distinct_from(DETACHED_APPLICATION_NAME),
             )
-        else:
-            result = await self.session.execute(
-                select(Task).where(Task.user_id == user_id).limit(
-                    limit).offset(offset)
+        )
+
+    async def get_changed_tasks(
+            self,
+            user_id: int,
+            before: datetime,
+            after: tuple[datetime, int] | None = None,
+            limit: int = 100,
+    ) -> list[TaskResponseSchema]:
+        """Gets the user's tasks changed after the ``(updated_at, id)`` keyset ``after``.
+
+        Only changes stamped before ``before`` are read.
+        """
+        query = select(*TASK_COLUMNS).where(
+            Task.user_id == user_id, Task.updated_at < before)
+        if after is not None:
+            query = query.where(tuple_(*CHANGE_SORT_KEY) > tuple_(*after))
+        return await self._fetch_task_rows(
+            query.order_by(*CHANGE_SORT_KEY).limit(limit)
+        )
+
+    async def get_task_tombstones(
+            self,
+            user_id: int,
+            before: datetime,
+            after: tuple[datetime, int] | None = None,
+            limit: int = 100,
+    ) -> Sequence[Row]:
+        """Gets the ``(id, deleted_at)`` of the user's tasks deleted after ``after``.
+
+        Only deletions stamped before ``before`` are read.
+        """
+        query = select(TaskTombstone.id, TaskTombstone.deleted_at).where(
+            TaskTombstone.user_id == user_id, TaskTombstone.deleted_at < before)
+        if after is not None:
+            query = query.where(tuple_(*TOMBSTONE_SORT_KEY) > tuple_(*after))
+        result = await self.session.execute(
+            query.order_by(*TOMBSTONE_SORT_KEY).limit(limit)
+        )
+
+        return result.all()
+
+    async def delete_task_tombstones(
+            self,
+            before: datetime,
+    ) -> int:
+        """Deletes the tombstones of deletions stamped before ``before``."""
+        result = await self.session.execute(
+            delete(TaskTombstone).where(TaskTombstone.deleted_at < before)
+        )
+        await self.commit()
+        return result.rowcount
+
+    async def get_task_status_counts(
+            self,
+            user_id: int,
+    ) -> dict[str, int]:
+        """Gets how many tasks the user has in each status, from the counters."""
+        result = await self.session.execute(
+            select(TaskStatusCount.status, TaskStatusCount.count)
+            .where(TaskStatusCount.user_id == user_id)
+        )
+
+        return dict(result.all())
+
+    async def get_task_daily_counts(
+            self,
+            user_id: int,
+            days: int,
+    ) -> Sequence[Row]:
+        """Gets the ``(day, created, completed)`` counts of the user's last ``days`` days.
+
+        Days on which no remaining task was created or completed are left out.
+        """
+        result = await self.session.execute(
+            select(TaskDailyCount.day, TaskDailyCount.created, TaskDailyCount.completed)
+            .where(
+                TaskDailyCount.user_id == user_id,
+                TaskDailyCount.day > func.current_date() - literal(days, Integer),
+                or_(TaskDailyCount.created != 0, TaskDailyCount.completed != 0),
             )
+            .order_by(TaskDailyCount.day)
+        )
 
-        return result.scalars().all()
+        return result.all()
+
+    async def reconcile_task_counts(
+            self,
+            user_id: int | None = None,
+    ) -> dict[str, Sequence[RowMapping]]:
+        """Recounts the task counters of one user, or all, and fixes those that drifted.
+
+        Each counter table is recounted with one GROUP BY over ``tasks``;
+        the rows that differed are returned by table name. The counters
+        are locked against writes until the commit, so a concurrent write
+        either committed before the recount or adds its delta after it.
+        """
+        await self.session.execute(text(
+            f"LOCK TABLE {TaskStatusCount.__tablename__}, {TaskDailyCount.__tablename__} "
+            f"IN EXCLUSIVE MODE"))
+        conditions = [] if user_id is None else [Task.user_id == user_id]
+        by_status = (
+            select(Task.user_id, Task.status, func.count().label("count"))
+            .where(*conditions)
+            .group_by(Task.user_id, Task.status)
+        )
+        days = union_all(
+            select(Task.user_id, cast(Task.created_at, Date).label("day"),
+                   literal_column("1").label("created"), literal_column("0").label("completed"))
+            .where(*conditions),
+            select(Task.user_id, cast(func.coalesce(Task.completed_at, Task.created_at), Date),
+                   literal_column("0"), literal_column("1"))
+            .where(*conditions, Task.status == TaskStatus.COMPLETED),
+        ).subquery("days")
+        by_day = (
+            select(days.c.user_id, days.c.day,
+                   func.sum(days.c.created).label("created"),
+                   func.sum(days.c.completed).label("completed"))
+            .group_by(days.c.user_id, days.c.day)
+        )
+
+        drift = {}
+        for model, recount in ((TaskStatusCount, by_status), (TaskDailyCount, by_day)):
+            result = await self.session.execute(_reconcile_counts(model, recount, user_id))
+            drift[model.__tablename__] = result.mappings().all()
+        await self.commit()
+        return drift
+
+    async def stream_user_tasks(
+            self,
+            user_id: int,
+            status: str = None,
+            batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Streams all tasks of a user in batches through a server-side cursor.
+
+        Only ``batch_size`` rows are held at a time, and the next batch is
+        fetched only once the caller asks for it.
+        """
+        query = select(*TASK_COLUMNS).where(Task.user_id == user_id)
+        if status:
+            query = query.where(Task.status == status)
+        result = await self.session.stream(
+            query.order_by(*TASK_SORT_KEY).execution_options(yield_per=batch_size)
+        )
+        async for rows in result.mappings().partitions():
+            yield rows
 
     async def add_task(
             self,
@@ -73,20 +566,251 @@ class TaskRepository(Repository[Task]):
     ) -> Task:
         """Adds a task to the database."""
         self.add(task)
+        await self.session.flush()
+        await self._count_changes([(task.user_id, None, _task_state(task), 1)])
         await self.commit()
-        await self.refresh(task)
         return task
 
+    async def add_tasks(
+            self,
+            values: list[dict],
+    ) -> Sequence[Task]:
+        """Adds tasks with one multi-row INSERT ... RETURNING.
+
+        The created tasks are returned in the order of ``values``.
+        """
+        if not values:
+            return []
+        result = await self.session.execute(
+            insert(Task).returning(Task, sort_by_parameter_order=True),
+            values,
+        )
+        tasks = result.scalars().all()
+        await self._count_changes(
+            (task.user_id, None, _task_state(task), 1) for task in tasks)
+        await self.commit()
+        return tasks
+
+    async def copy_tasks(
+            self,
+            records: list[tuple],
+    ) -> int:
+        """Bulk loads task records and returns how many were inserted.
+
+        ``records`` hold ``TASK_IMPORT_COLUMNS`` values. They are sent with a
+        binary COPY into the staging table and merged into ``tasks`` with a
+        single INSERT ... SELECT in the current transaction.
+        """
+        await self.session.execute(CreateTable(TASK_IMPORT_STAGING, if_not_exists=True))
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            TASK_IMPORT_STAGING.name,
+            records=records,
+            columns=TASK_IMPORT_COLUMNS,
+        )
+        result = await self.session.execute(
+            insert(Task).from_select(
+                TASK_IMPORT_COLUMNS, select(TASK_IMPORT_STAGING))
+        )
+        staged = TASK_IMPORT_STAGING.c
+        groups = await self.session.execute(
+            select(staged.user_id, staged.status, func.now(), func.count())
+            .group_by(staged.user_id, staged.status)
+        )
+        await self._count_changes(
+            (user_id, None, (status, now, None), count)
+            for user_id, status, now, count in groups.all()
+        )
+        await self.session.execute(text(f"TRUNCATE {TASK_IMPORT_STAGING.name}"))
+        return result.rowcount
+
+    async def get_existing_task_ids(
+            self,
+            task_ids: list[int],
+    ) -> Sequence[int]:
+        """Gets which of the given task IDs exist."""
+        result = await self.session.execute(
+            select(Task.id).where(Task.id == any_(literal(task_ids, ARRAY(Integer))))
+        )
+
+        return result.scalars().all()
+
+    async def get_task_owner(
+            self,
+            task_id: int
+    ) -> int | None:
+        """Gets the ID of the user owning a task."""
+        result = await self.session.execute(
+            select(Task.user_id).where(Task.id == task_id)
+        )
+
+        return result.scalars().first()
+
     async def update_task(
-            self
-    ) -> None:
-        """Updates a task in the database."""
+            self,
+            task_id: int,
+            user_id: int,
+            **values,
+    ) -> Task | None:
+        """Updates a task owned by the user in a single statement.
+
+        Returns ``None`` when no task with that ID belongs to the user.
+        A status change also reads the previous status, for the counters.
+        """
+        conditions = (Task.id == task_id, Task.user_id == user_id)
+        if "status" not in values:
+            result = await self.session.execute(
+                update(Task)
+                .where(*conditions)
+                .values(**values, updated_at=func.now())
+                .returning(Task)
+            )
+            task = result.scalars().first()
+            await self.commit()
+            return task
+
+        previous = self._locked_states(conditions)
+        result = await self.session.execute(
+            update(Task)
+            .where(Task.id == previous.c.id)
+            .values(**values, completed_at=completed_at_for(values["status"]), updated_at=func.now())
+            .returning(Task, previous.c.status, previous.c.completed_at)
+        )
+        row = result.first()
+        if row is None:
+            await self.commit()
+            return None
+        task, status, completed_at = row
+        await self._count_changes([
+            (user_id, (status, task.created_at, completed_at), _task_state(task), 1)])
         await self.commit()
+        return task
 
     async def delete_task(
             self,
-            task: Task
+            task_id: int,
+            user_id: int,
+    ) -> int | None:
+        """Deletes a task owned by the user in a single statement.
+
+        Returns the deleted ID, or ``None`` when no task with that ID
+        belongs to the user.
+        """
+        deleted = await self._delete_with_tombstones(
+            Task.id == task_id, Task.user_id == user_id)
+        await self.commit()
+        return deleted[0] if deleted else None
+
+    async def _delete_with_tombstones(self, *conditions) -> list[int]:
+        """Deletes the matching tasks, leaving their tombstones, and returns their IDs.
+
+        Both happen in one statement, which returns what the counters need.
+        """
+        deleted = (
+            delete(Task)
+            .where(*conditions)
+            .returning(Task.id, Task.user_id, Task.status, Task.created_at, Task.completed_at)
+            .cte("deleted_tasks")
+        )
+        tombstones = (
+            insert(TaskTombstone)
+            .from_select(["id", "user_id"], select(deleted.c.id, deleted.c.user_id))
+            .cte("tombstones")
+        )
+        result = await self.session.execute(select(deleted).add_cte(tombstones))
+        rows = result.all()
+        await self._count_changes(
+            (row.user_id, (row.status, row.created_at, row.completed_at), None, 1)
+            for row in rows
+        )
+        return [row.id for row in rows]
+
+    @staticmethod
+    def _locked_states(conditions: Iterable) -> Select:
+        """Builds a subquery locking the matching tasks and reading their state.
+
+        An UPDATE joined to it can return both the previous and the new state.
+        """
+        return (
+            select(Task.id, Task.status, Task.completed_at)
+            .where(*conditions)
+            .with_for_update()
+            .subquery("previous")
+        )
+
+    async def _count_changes(
+            self,
+            changes: Iterable[TaskCountChange],
     ) -> None:
-        """Deletes a task from the database."""
-        await self.delete(task)
+        """Adds the deltas of a write to the task counters, in its transaction.
+
+        Counter rows are upserted in key order, so concurrent writes of a
+        user lock them in the same order and do not deadlock.
+        """
+        statements = [
+            _add_counts(model, rows)
+            for model, rows in zip((TaskStatusCount, TaskDailyCount), task_counts_delta(changes))
+            if rows
+        ]
+        if len(statements) == 2:
+            statements = [statements[1].add_cte(statements[0].cte("status_counts"))]
+        for statement in statements:
+            await self.session.execute(statement)
+
+    @staticmethod
+    def _user_selection(
+            user_id: int,
+            ids: list[int] | None,
+            status_filter: str | None,
+    ) -> list:
+        """Builds the WHERE clause of a set-based write on a user's tasks."""
+        conditions = [Task.user_id == user_id]
+        if ids is not None:
+            conditions.append(Task.id == any_(literal(ids, ARRAY(Integer))))
+        if status_filter is not None:
+            conditions.append(Task.status == status_filter)
+        return conditions
+
+    async def update_tasks_status(
+            self,
+            user_id: int,
+            status: str,
+            ids: list[int] | None = None,
+            status_filter: str | None = None,
+    ) -> Sequence[int]:
+        """Sets the status of the selected tasks of a user in one statement."""
+        previous = self._locked_states(self._user_selection(user_id, ids, status_filter))
+        result = await self.session.execute(
+            update(Task)
+            .where(Task.id == previous.c.id)
+            .values(status=status, completed_at=completed_at_for(status), updated_at=func.now())
+            .returning(
+                Task.id, Task.created_at, Task.completed_at,
+                previous.c.status.label("previous_status"),
+                previous.c.completed_at.label("previous_completed_at"),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        await self._count_changes(
+            (user_id,
+             (row.previous_status, row.created_at, row.previous_completed_at),
+             (status, row.created_at, row.completed_at),
+             1)
+            for row in rows
+        )
+        await self.commit()
+        return [row.id for row in rows]
+
+    async def delete_tasks(
+            self,
+            user_id: int,
+            ids: list[int] | None = None,
+            status_filter: str | None = None,
+    ) -> Sequence[int]:
+        """Deletes the selected tasks of a user in one statement."""
+        task_ids = await self._delete_with_tombstones(
+            *self._user_selection(user_id, ids, status_filter))
         await self.commit()
+        return task_ids
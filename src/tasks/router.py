@@ -1,101 +1,476 @@
-from fastapi import APIRouter, Depends
+from functools import partial
+from typing import Awaitable, Callable, Sequence
 
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+
+from src.base.compression import compression
+from src.base.conditional import (
+    is_conditional, not_modified, not_modified_response, validator_headers)
+from src.base.negotiation import NegotiatedRoute
+from src.base.pagination import Page, TotalMode
+from src.base.responses import SchemaResponse, type_adapter
 from src.dependencies import get_current_user, get_task_service
 from src.tasks import TaskService
-from src.tasks.schemas import CreateTaskSchema, UpdateTaskSchema, TaskResponseSchema
+from src.tasks.export import EXPORT_MEDIA_TYPES
+from src.tasks.importer import iter_import_records
+from src.tasks.service import (
+    TASK_VERSION_FIELDS,
+    next_search_cursor,
+    next_task_cursor,
+    parse_task_fields,
+    parse_task_ids,
+    task_query_fields,
+)
+from src.tasks.schemas import (
+    BulkCreateTaskResponseSchema,
+    BulkCreateTaskSchema,
+    BulkOperationResponseSchema,
+    BulkTaskSelectionSchema,
+    BulkUpdateStatusSchema,
+    CreateTaskSchema,
+    ImportTaskResultSchema,
+    TaskBatchResponseSchema,
+    TaskBatchSchema,
+    TaskChangesSchema,
+    TaskFileFormat,
+    TaskResponseSchema,
+    TaskSearchResultSchema,
+    TaskStatsSchema,
+    TaskSuggestionSchema,
+    UpdateTaskSchema,
+)
 from src.users import TokenData
 
 router = APIRouter(
     prefix="/tasks",
     tags=["tasks"],
+    route_class=NegotiatedRoute,
 )
 
 
+TASK_LIST_ADAPTER = type_adapter(list[TaskResponseSchema])
+
+
+def _task_list_response(
+        tasks,
+        next_cursor: str | None,
+        schema: type = list[TaskResponseSchema],
+        total: int | None = None,
+        fields: Sequence[str] | None = None,
+) -> Response:
+    """Serializes a page of tasks straight to JSON, with only ``fields`` if given.
+
+    The cursor of the following page is exposed in the ``X-Next-Cursor``
+    header, and the total across pages, when counted, in ``X-Total-Count``.
+    """
+    response = SchemaResponse(tasks, schema, include=None if fields is None else {"__all__": set(fields)})
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers.update(_total_headers(total))
+    return response
+
+
+def _total_headers(total: int | None) -> dict[str, str]:
+    """Gets the ``X-Total-Count`` header of a page, if its total was counted."""
+    return {} if total is None else {"X-Total-Count": str(total)}
+
+
+def _task_validator_headers(tasks: Sequence[TaskResponseSchema]) -> dict[str, str]:
+    """Gets the ``ETag`` and ``Last-Modified`` of a response showing ``tasks``."""
+    return validator_headers((task.id, task.updated_at) for task in tasks)
+
+
+async def _task_batch_response(
+        task_service: TaskService,
+        task_ids: Sequence[int],
+        fields: Sequence[str] | None,
+) -> Response:
+    """Serves the tasks of ``task_ids``, or only their ``fields``, at once."""
+    batch = await task_service.get_tasks_by_ids(task_ids, fields=task_query_fields(fields))
+    return SchemaResponse(
+        batch, TaskBatchResponseSchema,
+        include=None if fields is None else {"tasks": {"__all__": set(fields)}, "missing": True})
+
+
+async def _conditional_task_list(
+        request: Request,
+        get_page: Callable[..., Awaitable[Page[TaskResponseSchema]]],
+        elements_per_page: int,
+        fields: Sequence[str] | None = None,
+) -> Response:
+    """Serves a page of tasks, or of only their ``fields``, with its validators, or a 304.
+
+    Conditional requests first fetch only the fields the validators need,
+    and stop there when the client's copy is current. The total is not
+    part of the validators, so a 304 carries the current one.
+    """
+    if is_conditional(request):
+        versions = await get_page(fields=TASK_VERSION_FIELDS)
+        headers = _task_validator_headers(versions)
+        if not_modified(request, headers):
+            return not_modified_response({**headers, **_total_headers(versions.total)})
+    page = await get_page(fields=task_query_fields(fields))
+    tasks = TASK_LIST_ADAPTER.validate_python(page, from_attributes=True)
+    response = _task_list_response(
+        tasks, next_task_cursor(tasks, elements_per_page), total=page.total, fields=fields)
+    response.headers.update(_task_validator_headers(tasks))
+    return response
+
+
 @router.get("/list", response_model=list[TaskResponseSchema])
 async def list_tasks(
+    request: Request,
     _: TokenData = Depends(get_current_user),
     page: int = 1,
     elements_per_page: int = 10,
     status: str = None,
+    cursor: str = None,
+    total: TotalMode = None,
+    fields: str = None,
     task_service: TaskService = Depends(get_task_service),
 ):
-    """Get a list of tasks."""
-    return await task_service.get_tasks(
+    """Get a list of tasks.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to get
+    the following page without an OFFSET scan, and the ``ETag`` back as
+    ``If-None-Match`` to get a 304 while the page is unchanged. With
+    ``total``, the number of tasks across pages is returned in
+    ``X-Total-Count``, counted ``exact``ly or ``estimate``d by the planner.
+    ``fields`` (e.g. ``id,title,status``) narrows both the columns read and
+    the tasks returned.
+    """
+    return await _conditional_task_list(request, partial(
+        task_service.get_tasks,
         page=page,
         status=status,
-        elements_per_page=elements_per_page
-    )
+        elements_per_page=elements_per_page,
+        cursor=cursor,
+        total=total,
+    ), elements_per_page, parse_task_fields(fields))
 
 
 @router.get("/user/me", response_model=list[TaskResponseSchema])
 async def list_my_tasks(
+    request: Request,
     page: int = 1,
     elements_per_page: int = 10,
     status: str = None,
+    cursor: str = None,
+    total: TotalMode = None,
+    fields: str = None,
     current_user: TokenData = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service),
 ):
     """Get a list of tasks for the current user."""
-    return await task_service.get_user_tasks(
+    return await _conditional_task_list(request, partial(
+        task_service.get_user_tasks,
         user_id=current_user.user_id,
         status=status,
         page=page,
-        elements_per_page=elements_per_page
-    )
+        elements_per_page=elements_per_page,
+        cursor=cursor,
+        total=total,
+    ), elements_per_page, parse_task_fields(fields))
 
 
 @router.get("/user/{user_id}", response_model=list[TaskResponseSchema])
 async def list_user_tasks(
+    request: Request,
     user_id: int,
     page: int = 1,
     elements_per_page: int = 10,
     status: str = None,
+    cursor: str = None,
+    total: TotalMode = None,
+    fields: str = None,
     _: TokenData = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service),
 ):
     """Get a list of tasks for a specific user."""
-    return await task_service.get_user_tasks(
+    return await _conditional_task_list(request, partial(
+        task_service.get_user_tasks,
         user_id=user_id,
         status=status,
         page=page,
-        elements_per_page=elements_per_page
+        elements_per_page=elements_per_page,
+        cursor=cursor,
+        total=total,
+    ), elements_per_page, parse_task_fields(fields))
+
+
+@router.get("/search", response_model=list[TaskSearchResultSchema])
+async def search_tasks(
+    q: str,
+    user_id: int = None,
+    status: str = None,
+    elements_per_page: int = 10,
+    cursor: str = None,
+    _: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Full-text search over task titles and descriptions.
+
+    Results are ranked best first and carry a highlighted ``headline``.
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to get
+    the following page.
+    """
+    results = await task_service.search_tasks(
+        query=q,
+        user_id=user_id,
+        status=status,
+        elements_per_page=elements_per_page,
+        cursor=cursor,
+    )
+    return _task_list_response(
+        results,
+        next_search_cursor(results, elements_per_page),
+        list[TaskSearchResultSchema],
+    )
+
+
+@router.get("/suggest", response_model=list[TaskSuggestionSchema])
+async def suggest_tasks(
+    prefix: str,
+    limit: int = None,
+    current_user: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Suggest the current user's tasks whose title contains ``prefix``.
+
+    Titles starting with ``prefix`` are listed first.
+    """
+    suggestions = await task_service.suggest_tasks(
+        user_id=current_user.user_id,
+        prefix=prefix,
+        limit=limit,
+    )
+    return _task_list_response(suggestions, None, list[TaskSuggestionSchema])
+
+
+@router.get("/changes", response_model=TaskChangesSchema)
+async def list_my_task_changes(
+    since: str = None,
+    elements_per_page: int = 100,
+    current_user: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Get the current user's tasks changed and deleted since a cursor.
+
+    Start without ``since`` to list every task, then pass the returned
+    ``cursor`` as ``since``: right away while ``has_more`` is set, on the
+    next sync otherwise. A 410 means the cursor is older than deletions are
+    kept, and all tasks must be fetched again.
+    """
+    changes = await task_service.get_task_changes(
+        user_id=current_user.user_id,
+        since=since,
+        elements_per_page=elements_per_page,
+    )
+    return SchemaResponse(changes, TaskChangesSchema)
+
+
+@router.get("/stats", response_model=TaskStatsSchema)
+async def get_my_task_stats(
+    days: int = None,
+    current_user: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Get how many tasks the current user has in each status.
+
+    With ``days``, also how many of them were created and completed on each
+    of the last ``days`` days, today included; days with neither are left out.
+    """
+    stats = await task_service.get_task_stats(
+        user_id=current_user.user_id,
+        days=days,
+    )
+    return SchemaResponse(stats, TaskStatsSchema)
+
+
+@router.get("/stream")
+async def stream_my_task_events(
+    current_user: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Push events about the current user's tasks as Server-Sent Events.
+
+    Each event is named after its type (``created``, ``updated``,
+    ``deleted``) and lists the task ``ids``; fetch them with
+    ``/tasks/changes``. ``resync`` means events were missed, e.g. because
+    this client fell behind, and ``/tasks/changes`` catches up.
+    """
+    return StreamingResponse(
+        task_service.stream_task_events(user_id=current_user.user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@router.get("/export")
+@compression(levels={"gzip": 1})
+async def export_my_tasks(
+    format: TaskFileFormat = TaskFileFormat.NDJSON,
+    status: str = None,
+    current_user: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Export all tasks of the current user as NDJSON or CSV.
+
+    The body is streamed, so exports of any size use constant memory. It is
+    compressed as it streams, with gzip at its fastest level: level 6 would
+    save 25% more bytes at five times the CPU.
+    """
+    return StreamingResponse(
+        task_service.export_user_tasks(
+            user_id=current_user.user_id,
+            export_format=format,
+            status=status,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
+@router.get("/batch", response_model=TaskBatchResponseSchema)
+async def get_tasks_batch(
+    ids: str,
+    fields: str = None,
+    _: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Get many tasks by ID at once, e.g. ``ids=1,2,3``, or only their ``fields``.
+
+    Tasks come in the order of ``ids``, and the IDs of tasks not found are
+    listed in ``missing``. POST the IDs instead for lists too long for a URL.
+    """
+    return await _task_batch_response(task_service, parse_task_ids(ids), parse_task_fields(fields))
+
+
+@router.post("/batch", response_model=TaskBatchResponseSchema)
+async def post_tasks_batch(
+    schema: TaskBatchSchema,
+    fields: str = None,
+    _: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Get many tasks by the IDs in the body, as ``GET /tasks/batch`` does."""
+    return await _task_batch_response(task_service, schema.ids, parse_task_fields(fields))
+
+
 @router.get("/{task_id}", response_model=TaskResponseSchema)
 async def get_task(
     task_id: int,
+    request: Request,
+    fields: str = None,
     _: TokenData = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service),
 ):
-    """Get a task by ID."""
-    return await task_service.get_task(task_id)
+    """Get a task by ID, or only its ``fields``.
 
+    Conditional requests are answered with a 304 from the task's
+    ``updated_at`` alone when the client's copy is current.
+    """
+    fields = parse_task_fields(fields)
+    if is_conditional(request):
+        headers = validator_headers([(task_id, await task_service.get_task_updated_at(task_id))])
+        if not_modified(request, headers):
+            return not_modified_response(headers)
+    task = TaskResponseSchema.model_validate(
+        await task_service.get_task(task_id, fields=task_query_fields(fields)), from_attributes=True)
+    return SchemaResponse(
+        task, TaskResponseSchema, headers=_task_validator_headers([task]),
+        include=None if fields is None else set(fields))
 
-@router.post("/create")
+
+@router.post("/create", response_model=TaskResponseSchema)
 async def create_task(
     schema: CreateTaskSchema,
     current_user: TokenData = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service),
 ):
     """Create a new task."""
-    return await task_service.create_task(
+    task = await task_service.create_task(
+        schema=schema,
+        user_id=current_user.user_id,
+    )
+    return SchemaResponse(task, TaskResponseSchema)
+
+
+@router.post("/bulk", response_model=BulkCreateTaskResponseSchema)
+async def create_tasks(
+    schema: BulkCreateTaskSchema,
+    current_user: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Create many tasks in one request and one INSERT."""
+    result = await task_service.create_tasks(
+        schema=schema,
+        user_id=current_user.user_id,
+    )
+    return SchemaResponse(result, BulkCreateTaskResponseSchema)
+
+
+@router.post("/import", response_model=ImportTaskResultSchema)
+async def import_tasks(
+    request: Request,
+    format: TaskFileFormat = TaskFileFormat.NDJSON,
+    skip_invalid: bool = False,
+    current_user: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Import tasks for the current user from a CSV or NDJSON request body.
+
+    The body is read as it arrives and loaded with COPY in chunks.
+    """
+    result = await task_service.import_tasks(
+        records=iter_import_records(request.stream(), format),
+        user_id=current_user.user_id,
+        skip_invalid=skip_invalid,
+    )
+    return SchemaResponse(result, ImportTaskResultSchema)
+
+
+@router.put("/bulk/status", response_model=BulkOperationResponseSchema)
+async def update_tasks_status(
+    schema: BulkUpdateStatusSchema,
+    current_user: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Set the status of many of the current user's tasks."""
+    result = await task_service.update_tasks_status(
+        schema=schema,
+        user_id=current_user.user_id,
+    )
+    return SchemaResponse(result, BulkOperationResponseSchema)
+
+
+@router.post("/bulk/delete", response_model=BulkOperationResponseSchema)
+async def delete_tasks(
+    schema: BulkTaskSelectionSchema,
+    current_user: TokenData = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Delete many of the current user's tasks."""
+    result = await task_service.delete_tasks(
         schema=schema,
         user_id=current_user.user_id,
     )
+    return SchemaResponse(result, BulkOperationResponseSchema)
 
 
-@router.put("/update")
+@router.put("/update", response_model=TaskResponseSchema)
 async def update_task(
     schema: UpdateTaskSchema,
     current_user: TokenData = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service),
 ):
     """Update an existing task."""
-    return await task_service.update_task(
+    task = await task_service.update_task(
         schema=schema,
         user_id=current_user.user_id,
     )
+    return SchemaResponse(task, TaskResponseSchema)
 
 
 @router.delete("/{task_id}")
@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 
 
 class TaskStatus(str, Enum):
@@ -15,6 +15,26 @@ class TaskStatus(str, Enum):
         return self.value
 
 
+class TaskFileFormat(str, Enum):
+    """Task export and import file format enum"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class TaskEventType(str, Enum):
+    """Task event type enum; ``resync`` means events may have been missed."""
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    RESYNC = "resync"
+
+    def __str__(self) -> str:
+        return self.value
+
+
 class BaseTaskSchema(BaseModel):
     title: str
     description: str
@@ -39,3 +59,106 @@ class TaskResponseSchema(BaseTaskSchema):
     user_id: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TaskSearchResultSchema(TaskResponseSchema):
+    rank: float
+    headline: str
+
+
+class TaskSuggestionSchema(BaseModel):
+    id: int
+    title: str
+    status: TaskStatus
+
+
+class TaskChangesSchema(BaseModel):
+    """A page of the change feed.
+
+    ``changed`` holds tasks created or updated and ``deleted`` the IDs of
+    tasks deleted since the cursor the page was asked for; ``cursor``
+    resumes after this page.
+    """
+    changed: list[TaskResponseSchema]
+    deleted: list[int]
+    cursor: str
+    has_more: bool
+
+
+class TaskDailyStatsSchema(BaseModel):
+    day: date
+    created: int
+    completed: int
+
+
+class TaskStatsSchema(BaseModel):
+    """Counts of a user's tasks.
+
+    ``daily`` lists, for the requested days on which any happened, how
+    many of the tasks were created and completed on each.
+    """
+    total: int
+    by_status: dict[TaskStatus, int]
+    daily: Optional[list[TaskDailyStatsSchema]] = None
+
+
+class TaskEventSchema(BaseModel):
+    """Change to some of a user's tasks, pushed by ``/tasks/stream``."""
+    type: TaskEventType
+    ids: list[int] = []
+
+
+class BulkCreateTaskSchema(BaseModel):
+    # Items are validated one by one so errors can be reported per item.
+    items: list[Any]
+    skip_invalid: bool = False
+
+
+class BulkItemErrorSchema(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+
+class BulkCreateTaskResponseSchema(BaseModel):
+    created: list[TaskResponseSchema]
+    errors: list[BulkItemErrorSchema] = []
+
+
+class BulkTaskSelectionSchema(BaseModel):
+    """Selects the current user's tasks either by ID or by status."""
+    ids: Optional[list[int]] = None
+    status_filter: Optional[TaskStatus] = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "BulkTaskSelectionSchema":
+        if (self.ids is None) == (self.status_filter is None):
+            raise ValueError("Provide exactly one of ids or status_filter")
+        return self
+
+
+class BulkUpdateStatusSchema(BulkTaskSelectionSchema):
+    status: TaskStatus
+
+
+class TaskBatchSchema(BaseModel):
+    ids: list[int]
+
+
+class TaskBatchResponseSchema(BaseModel):
+    """Tasks fetched by ID, in the order asked, and the IDs not found."""
+    tasks: list[TaskResponseSchema]
+    missing: list[int] = []
+
+
+class BulkOperationResponseSchema(BaseModel):
+    affected: list[int]
+    missing: list[int] = []
+    not_owned: list[int] = []
+
+
+class ImportTaskResultSchema(BaseModel):
+    """Running summary of a task import."""
+    imported: int = 0
+    failed: int = 0
+    chunks: int = 0
+    errors: list[BulkItemErrorSchema] = []
@@ -1,42 +1,287 @@
-from typing import Sequence
-from dataclasses import dataclass
+import asyncio
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Mapping, Sequence
+from dataclasses import dataclass, field
 
-from src.base.exceptions import NotFoundException, UnAuthorizedException
-from src.tasks.repository import TaskRepository
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import TypedDict
+
+from src.base.cache import Cache, Generations, LRUCache, MemoryCache
+from src.base.events import EventHub
+from src.base.exceptions import (
+    BadRequestException, GoneException, NotFoundException, UnAuthorizedException)
+from src.base.pagination import Page, TotalMode, decode_cursor, encode_cursor, next_cursor
+from src.config import Settings
+from src.tasks.events import TASK_EVENTS, encode_task_event, task_events, task_events_topic
+from src.tasks.export import encode_csv, encode_ndjson
+from src.tasks.repository import TaskRepository, task_from_row
 from src.tasks.models import Task
-from src.tasks.schemas import CreateTaskSchema, UpdateTaskSchema
+from src.tasks.schemas import (
+    BulkCreateTaskResponseSchema,
+    BulkCreateTaskSchema,
+    BulkItemErrorSchema,
+    BulkOperationResponseSchema,
+    BulkTaskSelectionSchema,
+    BulkUpdateStatusSchema,
+    CreateTaskSchema,
+    ImportTaskResultSchema,
+    TaskBatchResponseSchema,
+    TaskChangesSchema,
+    TaskDailyStatsSchema,
+    TaskEventSchema,
+    TaskEventType,
+    TaskFileFormat,
+    TaskResponseSchema,
+    TaskSearchResultSchema,
+    TaskStatsSchema,
+    TaskStatus,
+    TaskSuggestionSchema,
+    UpdateTaskSchema,
+)
+
+TASK_ADAPTER = TypeAdapter(TaskResponseSchema)
+TASK_LIST_ADAPTER = TypeAdapter(list[TaskResponseSchema])
+
+# Serialized tasks by ID, read through by ``TaskService.get_task``.
+TASK_CACHE: MemoryCache = MemoryCache(
+    maxsize=Settings.TASKS_CACHE_MAX_ENTRIES,
+    max_bytes=Settings.TASKS_CACHE_MAX_BYTES,
+    ttl=Settings.TASKS_CACHE_TTL_SECONDS,
+)
+
+# Pages of ``TaskService.get_user_tasks`` under the user's list generation,
+# which every write to the user's tasks bumps. Both live in this worker;
+# ``forget_changed_tasks`` keeps them in step with writes on other workers.
+TASK_LIST_CACHE: MemoryCache = MemoryCache(
+    maxsize=Settings.TASKS_LIST_CACHE_MAX_ENTRIES,
+    max_bytes=Settings.TASKS_LIST_CACHE_MAX_BYTES,
+    ttl=Settings.TASKS_LIST_CACHE_TTL_SECONDS,
+)
+TASK_LIST_GENERATIONS: Generations[int] = Generations(Settings.TASKS_LIST_CACHE_MAX_ENTRIES)
+
+# Recent title suggestions of each user, by lower-cased prefix and limit.
+# Entries live in this worker only and are dropped on the user's writes.
+SUGGESTION_CACHE: LRUCache[int, LRUCache[tuple[str, int], list[TaskSuggestionSchema]]] = \
+    LRUCache(Settings.TASKS_SUGGEST_CACHE_USERS)
+
+
+# Fields a page of tasks needs for its validators and next cursor.
+TASK_VERSION_FIELDS = ("id", "created_at", "updated_at")
+TASK_FIELDS = tuple(TaskResponseSchema.model_fields)
+
+
+def task_cache_key(task_id: int) -> str:
+    """Gets the key of a task in the task cache."""
+    return f"task:{task_id}"
+
+
+def forget_changed_tasks(topic: str | None, event: TaskEventSchema) -> None:
+    """Drops what this worker caches about tasks changed by any worker.
+
+    Every worker hears the task events relayed over ``NOTIFY``, so the
+    caches above follow writes made elsewhere within a round trip rather
+    than their TTL. A ``None`` topic means events may have been lost, and
+    then everything is dropped.
+    """
+    if topic is None:
+        SUGGESTION_CACHE.clear()
+        TASK_LIST_GENERATIONS.clear()
+        TASK_CACHE.clear()
+        return
+    user_id = int(topic)
+    SUGGESTION_CACHE.pop(user_id)
+    TASK_LIST_GENERATIONS.bump(user_id)
+    if event.type != TaskEventType.CREATED:
+        TASK_CACHE.discard(*map(task_cache_key, event.ids))
+
+
+TASK_EVENTS.add_listener(forget_changed_tasks)
+
+
+def parse_task_fields(fields: str | None) -> tuple[str, ...] | None:
+    """Parses a comma-separated ``fields`` parameter into task response fields."""
+    if fields is None:
+        return None
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in TASK_FIELDS]
+    if unknown or not names:
+        raise BadRequestException(
+            f"Invalid task fields {fields!r}; choose from {', '.join(TASK_FIELDS)}")
+    return names
+
+
+def parse_task_ids(ids: str) -> list[int]:
+    """Parses a comma-separated ``ids`` parameter into task IDs."""
+    try:
+        return [int(task_id) for task_id in ids.split(",") if task_id.strip()]
+    except ValueError:
+        raise BadRequestException(f"Invalid task ids {ids!r}; expected comma-separated integers")
+
+
+@lru_cache(maxsize=None)
+def task_fields_adapter(fields: tuple[str, ...]) -> TypeAdapter:
+    """Gets the (cached) adapter of lists of task rows of only ``fields``."""
+    row = TypedDict("TaskFieldsRow", {name: TaskResponseSchema.model_fields[name].annotation for name in fields})
+    return TypeAdapter(list[row])
+
+
+def task_query_fields(fields: Sequence[str] | None) -> tuple[str, ...] | None:
+    """Gets the fields to read for a response showing only ``fields``.
+
+    The ``TASK_VERSION_FIELDS`` are always read, for validators and cursors.
+    """
+    if fields is None:
+        return None
+    return tuple(dict.fromkeys((*fields, *TASK_VERSION_FIELDS)))
+
+
+def decode_task_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decodes a task cursor into its ``(created_at, id)`` keyset."""
+    return decode_cursor(cursor, datetime.fromisoformat, int)
+
+
+def next_task_cursor(
+        tasks: Sequence[TaskResponseSchema],
+        elements_per_page: int,
+) -> str | None:
+    """Gets the cursor of the page following ``tasks``."""
+    return next_cursor(tasks, elements_per_page, "created_at", "id")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    """Decodes a search cursor into its ``(rank, id)`` keyset."""
+    return decode_cursor(cursor, float, int)
+
+
+def next_search_cursor(
+        results: Sequence[TaskSearchResultSchema],
+        elements_per_page: int,
+) -> str | None:
+    """Gets the cursor of the search page following ``results``."""
+    return next_cursor(results, elements_per_page, "rank", "id")
+
+
+def decode_change_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decodes a change feed cursor into its ``(changed_at, id)`` keyset."""
+    return decode_cursor(cursor, datetime.fromisoformat, int)
+
+
+async def _aenumerate(items: AsyncIterator[Any]) -> AsyncIterator[tuple[int, Any]]:
+    """Async counterpart of ``enumerate``."""
+    index = 0
+    async for item in items:
+        yield index, item
+        index += 1
 
 
 @dataclass
 class TaskService:
     task_repository: TaskRepository
+    suggestion_cache: LRUCache = field(default=SUGGESTION_CACHE)
+    task_cache: Cache = field(default=TASK_CACHE)
+    list_cache: Cache = field(default=TASK_LIST_CACHE)
+    list_generations: Generations = field(default=TASK_LIST_GENERATIONS)
+    events: EventHub[TaskEventSchema] = field(default=TASK_EVENTS)
+
+    async def get_task(self, task_id: int, fields: Sequence[str] = None) -> TaskResponseSchema:
+        """Gets a task by ID, through the task cache.
+
+        Writes drop the cached task once committed; a read racing a write
+        may still cache the previous version, for at most the cache TTL.
+        On a miss, a task of only some ``fields`` is read with the others
+        deferred, and is not cached.
+        """
+        key = task_cache_key(task_id)
+        cached = await self.task_cache.get(key)
+        if cached is not None:
+            return TASK_ADAPTER.validate_json(cached)
 
-    async def get_task(self, task_id: int) -> Task:
-        """Gets a task by ID."""
-        task = await self.task_repository.get_task(task_id)
+        task = await self.task_repository.get_task(task_id, fields=fields)
         if not task:
             raise NotFoundException("Task not found")
+        if fields is not None:
+            return task_from_row({name: getattr(task, name) for name in fields})
+        task = TASK_ADAPTER.validate_python(task, from_attributes=True)
+        await self.task_cache.set(key, TASK_ADAPTER.dump_json(task))
         return task
 
+    async def get_tasks_by_ids(
+            self,
+            task_ids: Sequence[int],
+            fields: Sequence[str] = None,
+    ) -> TaskBatchResponseSchema:
+        """Gets tasks by ID in the order asked, through the task cache.
+
+        Only the tasks missing from the cache are read, all in one query,
+        and cached unless they have only some ``fields``. Repeated IDs are
+        returned once; IDs matching no task are listed as ``missing``.
+        """
+        if len(task_ids) > Settings.TASKS_BULK_MAX_ITEMS:
+            raise BadRequestException(
+                f"At most {Settings.TASKS_BULK_MAX_ITEMS} tasks can be fetched at once")
+
+        task_ids = list(dict.fromkeys(task_ids))
+        cached = await self.task_cache.get_many([task_cache_key(task_id) for task_id in task_ids])
+        tasks = {
+            task_id: TASK_ADAPTER.validate_json(value)
+            for task_id, value in zip(task_ids, cached)
+            if value is not None
+        }
+        misses = [task_id for task_id in task_ids if task_id not in tasks]
+        if misses:
+            fetched = await self.task_repository.get_tasks_by_ids(misses, fields=fields)
+            tasks.update((task.id, task) for task in fetched)
+            if fields is None:
+                await self.task_cache.set_many(
+                    {task_cache_key(task.id): TASK_ADAPTER.dump_json(task) for task in fetched})
+        return TaskBatchResponseSchema.model_construct(
+            tasks=[tasks[task_id] for task_id in task_ids if task_id in tasks],
+            missing=[task_id for task_id in task_ids if task_id not in tasks],
+        )
+
+    async def get_task_updated_at(self, task_id: int) -> datetime:
+        """Gets when a task was last changed, from the task cache if it is there."""
+        cached = await self.task_cache.get(task_cache_key(task_id))
+        if cached is not None:
+            return TASK_ADAPTER.validate_json(cached).updated_at
+        updated_at = await self.task_repository.get_task_updated_at(task_id)
+        if updated_at is None:
+            raise NotFoundException("Task not found")
+        return updated_at
+
     async def get_tasks(
             self,
             page: int = 1,
             status: str = None,
             elements_per_page: int = 10,
-    ):
-        """Gets a list of tasks."""
+            cursor: str = None,
+            fields: Sequence[str] = None,
+            total: TotalMode = None,
+    ) -> Page[TaskResponseSchema]:
+        """Gets a list of tasks, optionally with only some ``fields``.
+
+        With ``total``, the page also carries the number of tasks across pages.
+        """
+        after = decode_task_cursor(cursor) if cursor else None
+        offset = 0 if after else (page - 1) * elements_per_page
         if status is None:
             tasks = await self.task_repository.get_tasks(
-                offset=(page - 1) * elements_per_page,
+                offset=offset,
                 limit=elements_per_page,
+                after=after,
+                fields=fields,
+                total=total,
             )
         else:
             tasks = await self.task_repository.get_tasks_by_status(
-                offset=(page - 1) * elements_per_page,
+                offset=offset,
                 limit=elements_per_page,
-                status=status
+                status=status,
+                after=after,
+                fields=fields,
+                total=total,
             )
-        print("Tasks: ", tasks)
         return tasks
 
     async def get_user_tasks(
@@ -45,16 +290,231 @@ class TaskService:
         status: str = None,
         page: int = 1,
         elements_per_page: int = 10,
-    ) -> Sequence[Task]:
-        """Gets a list of tasks."""
-        tasks = await self.task_repository.get_user_tasks(
+        cursor: str = None,
+        fields: Sequence[str] = None,
+        total: TotalMode = None,
+    ) -> Page[TaskResponseSchema]:
+        """Gets a list of tasks, through the user's list cache.
+
+        The generation is read before querying, so a page fetched while a
+        write commits is stored under the generation that write retires.
+        Pages of only some ``fields`` are cached apart, with only those;
+        pages with their ``total`` are not cached.
+        """
+        after = decode_task_cursor(cursor) if cursor else None
+        page = 1 if after else page
+        query = dict(
             user_id=user_id,
             offset=(page - 1) * elements_per_page,
             status=status,
-            limit=elements_per_page
+            limit=elements_per_page,
+            after=after,
+        )
+        if total is not None:
+            return await self.task_repository.get_user_tasks(**query, fields=fields, total=total)
+
+        key = (
+            f"tasks:user:{user_id}:{self.list_generations.get(user_id)}:"
+            f"{status}:{cursor}:{page}:{elements_per_page}"
         )
+        if fields is None:
+            cached = await self.list_cache.get(key)
+            if cached is not None:
+                return Page(TASK_LIST_ADAPTER.validate_json(cached))
+
+            tasks = await self.task_repository.get_user_tasks(**query)
+            await self.list_cache.set(key, TASK_LIST_ADAPTER.dump_json(
+                TASK_LIST_ADAPTER.validate_python(tasks, from_attributes=True)))
+            return tasks
+
+        key = f"{key}:{','.join(fields)}"
+        cached = await self.list_cache.get(key)
+        if cached is not None:
+            return Page([task_from_row(row) for row in task_fields_adapter(tuple(fields)).validate_json(cached)])
+
+        tasks = await self.task_repository.get_user_tasks(**query, fields=fields)
+        await self.list_cache.set(key, TASK_LIST_ADAPTER.dump_json(tasks, include={"__all__": set(fields)}))
         return tasks
 
+    async def search_tasks(
+        self,
+        query: str,
+        user_id: int = None,
+        status: str = None,
+        elements_per_page: int = 10,
+        cursor: str = None,
+    ) -> Sequence[TaskSearchResultSchema]:
+        """Searches task titles and descriptions."""
+        if not query.strip():
+            raise BadRequestException("Search query must not be empty")
+        return await self.task_repository.search_tasks(
+            query=query,
+            user_id=user_id,
+            status=status,
+            limit=elements_per_page,
+            after=decode_search_cursor(cursor) if cursor else None,
+        )
+
+    async def suggest_tasks(
+        self,
+        user_id: int,
+        prefix: str,
+        limit: int = None,
+    ) -> list[TaskSuggestionSchema]:
+        """Suggests the user's tasks by title, for typeahead."""
+        prefix = prefix.strip()
+        if not prefix:
+            raise BadRequestException("Suggestion prefix must not be empty")
+        limit = limit or Settings.TASKS_SUGGEST_LIMIT
+        key = (prefix.lower(), limit)
+
+        # The user's cache is taken before querying: a write meanwhile
+        # replaces it, so the possibly stale result is stored out of reach.
+        user_cache = self.suggestion_cache.get(user_id)
+        if user_cache is None:
+            user_cache = LRUCache(Settings.TASKS_SUGGEST_CACHE_PREFIXES)
+            self.suggestion_cache.set(user_id, user_cache)
+        elif key in user_cache:
+            return user_cache.get(key)
+
+        suggestions = await self.task_repository.suggest_tasks(
+            user_id=user_id, prefix=prefix, limit=limit)
+        user_cache.set(key, suggestions)
+        return suggestions
+
+    async def get_task_changes(
+        self,
+        user_id: int,
+        since: str = None,
+        elements_per_page: int = 100,
+    ) -> TaskChangesSchema:
+        """Gets the user's tasks changed, and IDs of those deleted, after ``since``.
+
+        Changes and tombstones are merged in ``(changed_at, id)`` order and
+        only read up to the change horizon, so no write committing later can
+        land behind a cursor already handed out. Without ``since`` every
+        task is listed. A task changed again is listed again.
+        """
+        if not 0 < elements_per_page <= Settings.TASKS_CHANGES_MAX_PAGE_SIZE:
+            raise BadRequestException(
+                f"elements_per_page must be between 1 and {Settings.TASKS_CHANGES_MAX_PAGE_SIZE}")
+        after = decode_change_cursor(since) if since else None
+        horizon = await self.task_repository.get_change_horizon()
+        if after and after[0] < horizon - timedelta(days=Settings.TASKS_TOMBSTONE_RETENTION_DAYS):
+            raise GoneException("Change cursor expired; fetch all tasks again")
+
+        # One row past the page from each side tells whether more follow.
+        window = dict(user_id=user_id, before=horizon, after=after, limit=elements_per_page + 1)
+        changes = sorted(
+            [(task.updated_at, task.id, task)
+             for task in await self.task_repository.get_changed_tasks(**window)]
+            + [(deleted_at, task_id, None)
+               for task_id, deleted_at in await self.task_repository.get_task_tombstones(**window)],
+            key=lambda change: change[:2],
+        )
+        page = changes[:elements_per_page]
+        has_more = len(changes) > elements_per_page
+        if has_more:
+            resume_after = page[-1][:2]
+        else:
+            # Everything stamped before the horizon has been listed.
+            resume_after = max(after or (horizon, 0), (horizon, 0))
+        return TaskChangesSchema.model_construct(
+            changed=[task for _, _, task in page if task is not None],
+            deleted=[task_id for _, task_id, task in page if task is None],
+            cursor=encode_cursor(*resume_after),
+            has_more=has_more,
+        )
+
+    async def prune_task_tombstones(self) -> int:
+        """Drops tombstones past the retention period, returning how many.
+
+        The cutoff trails the change horizon, which is the reference the
+        feed rejects expired cursors against.
+        """
+        horizon = await self.task_repository.get_change_horizon()
+        return await self.task_repository.delete_task_tombstones(
+            before=horizon - timedelta(days=Settings.TASKS_TOMBSTONE_RETENTION_DAYS))
+
+    async def get_task_stats(
+        self,
+        user_id: int,
+        days: int = None,
+    ) -> TaskStatsSchema:
+        """Gets the user's task counts, and those of the last ``days`` days if given.
+
+        Counts come from counters the writes keep up, so reading them does
+        not depend on how many tasks the user has.
+        """
+        if days is not None and not 0 < days <= Settings.TASKS_STATS_MAX_DAYS:
+            raise BadRequestException(
+                f"days must be between 1 and {Settings.TASKS_STATS_MAX_DAYS}")
+        counts = await self.task_repository.get_task_status_counts(user_id)
+        by_status = {status: counts.get(status.value, 0) for status in TaskStatus}
+        daily = None
+        if days is not None:
+            daily = [
+                TaskDailyStatsSchema(day=day, created=created, completed=completed)
+                for day, created, completed in
+                await self.task_repository.get_task_daily_counts(user_id, days)
+            ]
+        return TaskStatsSchema(total=sum(by_status.values()), by_status=by_status, daily=daily)
+
+    async def reconcile_task_stats(
+        self,
+        user_id: int = None,
+    ) -> dict[str, Sequence[Mapping[str, Any]]]:
+        """Rebuilds the task counters from the tasks, returning the rows that drifted."""
+        return await self.task_repository.reconcile_task_counts(user_id)
+
+    async def export_user_tasks(
+        self,
+        user_id: int,
+        export_format: TaskFileFormat,
+        status: str = None,
+    ) -> AsyncIterator[bytes]:
+        """Streams all of a user's tasks as encoded export chunks.
+
+        Rows are read in batches through a server-side cursor on a session of
+        their own, so memory use does not grow with the number of tasks and
+        the next batch is only fetched once the previous chunk was consumed.
+        """
+        async with self.task_repository.detached() as repository:
+            header = True
+            async for rows in repository.stream_user_tasks(
+                    user_id=user_id,
+                    status=status,
+                    batch_size=Settings.TASKS_EXPORT_BATCH_SIZE,
+            ):
+                if export_format == TaskFileFormat.CSV:
+                    yield encode_csv(rows, header=header)
+                    header = False
+                else:
+                    yield encode_ndjson(rows)
+            if header and export_format == TaskFileFormat.CSV:
+                yield encode_csv((), header=True)
+
+    async def stream_task_events(
+        self,
+        user_id: int,
+    ) -> AsyncIterator[bytes]:
+        """Streams the user's task events as Server-Sent Events.
+
+        Events published before the subscription are not replayed, and a
+        consumer that falls ``TASKS_STREAM_QUEUE_SIZE`` events behind gets a
+        single ``resync`` in place of its backlog.
+        """
+        with self.events.subscribe(task_events_topic(user_id)) as subscription:
+            yield b": connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), Settings.TASKS_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield encode_task_event(event)
+
     async def create_task(
         self,
         schema: CreateTaskSchema,
@@ -62,24 +522,122 @@ class TaskService:
     ) -> Task:
         """Creates a task."""
         task = await self.task_repository.add_task(
-            task=Task(**schema.model_dump(), user_id=user_id))
+            task=Task(**self._task_values(schema, user_id)))
+        await self._tasks_changed(user_id, TaskEventType.CREATED, [task.id])
 
         return task
 
+    async def create_tasks(
+        self,
+        schema: BulkCreateTaskSchema,
+        user_id: int,
+    ) -> BulkCreateTaskResponseSchema:
+        """Creates many tasks in a single statement.
+
+        Invalid items abort the batch unless ``skip_invalid`` is set, in
+        which case they are reported and the valid ones are still created.
+        """
+        if len(schema.items) > Settings.TASKS_BULK_MAX_ITEMS:
+            raise BadRequestException(
+                f"At most {Settings.TASKS_BULK_MAX_ITEMS} tasks can be created at once")
+
+        values, errors = [], []
+        for index, item in enumerate(schema.items):
+            try:
+                item_schema = CreateTaskSchema.model_validate(item)
+            except ValidationError as exc:
+                errors.append(BulkItemErrorSchema(
+                    index=index,
+                    errors=exc.errors(
+                        include_url=False, include_context=False, include_input=False),
+                ))
+                continue
+            values.append(self._task_values(item_schema, user_id))
+
+        if errors and not schema.skip_invalid:
+            raise BadRequestException([error.model_dump() for error in errors])
+
+        tasks = await self.task_repository.add_tasks(values)
+        if tasks:
+            await self._tasks_changed(user_id, TaskEventType.CREATED, [task.id for task in tasks])
+        return BulkCreateTaskResponseSchema(created=tasks, errors=errors)
+
+    async def import_tasks(
+        self,
+        records: AsyncIterator[Any],
+        user_id: int,
+        skip_invalid: bool = False,
+        on_progress: Callable[[ImportTaskResultSchema], None] = None,
+    ) -> ImportTaskResultSchema:
+        """Imports a stream of task records with COPY, chunk by chunk.
+
+        Records are validated as they arrive and loaded every
+        ``TASKS_IMPORT_CHUNK_SIZE`` rows, so only one chunk is held in
+        memory. The import is one transaction: an invalid record aborts it
+        unless ``skip_invalid`` is set, in which case it is counted and,
+        up to ``TASKS_IMPORT_MAX_ERRORS``, reported.
+        """
+        result = ImportTaskResultSchema()
+        chunk = []
+
+        async def load_chunk(records: list[tuple]) -> None:
+            result.imported += await self.task_repository.copy_tasks(records)
+            result.chunks += 1
+            if on_progress:
+                on_progress(result)
+
+        async for index, record in _aenumerate(records):
+            try:
+                item = CreateTaskSchema.model_validate(record)
+            except ValidationError as exc:
+                error = BulkItemErrorSchema(
+                    index=index,
+                    errors=exc.errors(
+                        include_url=False, include_context=False, include_input=False),
+                )
+                if not skip_invalid:
+                    await self.task_repository.rollback()
+                    raise BadRequestException([error.model_dump()])
+                result.failed += 1
+                if len(result.errors) < Settings.TASKS_IMPORT_MAX_ERRORS:
+                    result.errors.append(error)
+                continue
+            chunk.append((item.title, item.description, item.status.value, user_id))
+            if len(chunk) >= Settings.TASKS_IMPORT_CHUNK_SIZE:
+                await load_chunk(chunk)
+                chunk = []
+        if chunk:
+            await load_chunk(chunk)
+
+        await self.task_repository.commit()
+        # The IDs of copied tasks are not read back, so listeners resync.
+        await self._tasks_changed(user_id, TaskEventType.RESYNC)
+        return result
+
+    @staticmethod
+    def _task_values(
+        schema: CreateTaskSchema,
+        user_id: int,
+    ) -> dict:
+        """Gets the column values of a new task."""
+        return {**schema.model_dump(), "user_id": user_id}
+
     async def update_task(
         self,
         schema: UpdateTaskSchema,
         user_id: int,
     ) -> Task:
         """Updates a task."""
-        task = await self.task_repository.get_task(schema.id)
+        values = {
+            key: value
+            for key, value in schema.model_dump(exclude={"id"}).items()
+            if value
+        }
+        task = await self.task_repository.update_task(
+            task_id=schema.id, user_id=user_id, **values)
         if not task:
-            raise NotFoundException("Task not found")
-        if task.user_id != user_id:
-            raise UnAuthorizedException(
-                "User not authorized to update this task")
-        task.update(**schema.model_dump())
-        await self.task_repository.update_task()
+            await self._raise_write_rejected(schema.id, "update")
+        await self._tasks_changed(user_id, TaskEventType.UPDATED, [schema.id])
         return task
 
     async def delete_task(
@@ -88,10 +646,107 @@ class TaskService:
         user_id: int,
     ) -> None:
         """Deletes a task."""
-        task = await self.task_repository.get_task(task_id)
-        if not task:
+        deleted_id = await self.task_repository.delete_task(
+            task_id=task_id, user_id=user_id)
+        if deleted_id is None:
+            await self._raise_write_rejected(task_id, "delete")
+        await self._tasks_changed(user_id, TaskEventType.DELETED, [task_id])
+
+    async def update_tasks_status(
+        self,
+        schema: BulkUpdateStatusSchema,
+        user_id: int,
+    ) -> BulkOperationResponseSchema:
+        """Sets the status of many of the user's tasks at once."""
+        self._check_bulk_selection(schema)
+        task_ids = await self.task_repository.update_tasks_status(
+            user_id=user_id,
+            status=schema.status,
+            ids=schema.ids,
+            status_filter=schema.status_filter,
+        )
+        if task_ids:
+            await self._tasks_changed(user_id, TaskEventType.UPDATED, task_ids)
+        return await self._bulk_result(schema.ids, task_ids)
+
+    async def delete_tasks(
+        self,
+        schema: BulkTaskSelectionSchema,
+        user_id: int,
+    ) -> BulkOperationResponseSchema:
+        """Deletes many of the user's tasks at once."""
+        self._check_bulk_selection(schema)
+        task_ids = await self.task_repository.delete_tasks(
+            user_id=user_id,
+            ids=schema.ids,
+            status_filter=schema.status_filter,
+        )
+        if task_ids:
+            await self._tasks_changed(user_id, TaskEventType.DELETED, task_ids)
+        return await self._bulk_result(schema.ids, task_ids)
+
+    async def _tasks_changed(
+        self,
+        user_id: int,
+        event_type: TaskEventType,
+        task_ids: Sequence[int] = (),
+    ) -> None:
+        """Drops what is cached about the user's tasks after a committed write,
+        and publishes the change to the user's task events.
+
+        ``task_ids`` are the tasks the write created, changed or removed.
+        Inside a batch, both wait until the batch's transaction ends, and
+        the events are only published if it commits.
+        """
+        async def drop_cached() -> None:
+            self.suggestion_cache.pop(user_id)
+            self.list_generations.bump(user_id)
+            if task_ids and event_type != TaskEventType.CREATED:
+                await self.task_cache.delete(*map(task_cache_key, task_ids))
+
+        async def publish() -> None:
+            for event in task_events(event_type, task_ids):
+                self.events.publish(task_events_topic(user_id), event)
+
+        await self.task_repository.after_transaction(drop_cached)
+        await self.task_repository.after_commit(publish)
+
+    @staticmethod
+    def _check_bulk_selection(
+        schema: BulkTaskSelectionSchema,
+    ) -> None:
+        """Rejects selections over the configured batch size."""
+        if schema.ids is not None and len(schema.ids) > Settings.TASKS_BULK_MAX_ITEMS:
+            raise BadRequestException(
+                f"At most {Settings.TASKS_BULK_MAX_ITEMS} tasks can be changed at once")
+
+    async def _bulk_result(
+        self,
+        requested_ids: list[int] | None,
+        affected_ids: Sequence[int],
+    ) -> BulkOperationResponseSchema:
+        """Reports requested IDs a set-based write skipped as missing or not owned."""
+        affected = set(affected_ids)
+        rejected = [
+            task_id for task_id in dict.fromkeys(requested_ids or ())
+            if task_id not in affected
+        ]
+        existing = set()
+        if rejected:
+            existing = set(await self.task_repository.get_existing_task_ids(rejected))
+        return BulkOperationResponseSchema(
+            affected=list(affected_ids),
+            missing=[task_id for task_id in rejected if task_id not in existing],
+            not_owned=[task_id for task_id in rejected if task_id in existing],
+        )
+
+    async def _raise_write_rejected(
+        self,
+        task_id: int,
+        action: str,
+    ) -> None:
+        """Explains why a conditional write on a task matched no row."""
+        if await self.task_repository.get_task_owner(task_id) is None:
             raise NotFoundException("Task not found")
-        if task.user_id != user_id:
-            raise UnAuthorizedException(
-                "User not authorized to delete this task")
-        await self.task_repository.delete_task(task)
+        raise UnAuthorizedException(
+            f"User not authorized to {action} this task")
@@ -25,7 +25,6 @@ class UserRepository(Repository[User]):
         """Creates a user in the database."""
         self.add(user)
         await self.commit()
-        await self.refresh(user)
         return user
 
     async def update_user(self) -> None:
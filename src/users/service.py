@@ -4,8 +4,9 @@ from fastapi import Request
 from fastapi.responses import JSONResponse
 
 from src.base.exceptions import BadRequestException, UnAuthorizedException, NotFoundException
+from src.base.responses import SchemaResponse
 from src.users.repository import UserRepository
-from src.users.schemas import LoginSchema, RegisterSchema
+from src.users.schemas import AuthResponseSchema, LoginSchema, RegisterSchema
 from src.users.models import User
 from src.users import auth, utils
 
@@ -34,10 +35,9 @@ class UserService:
             user.id,
         )
 
-        response = JSONResponse(
-            content={
-                "access_token": access_token,
-            },
+        response = SchemaResponse(
+            AuthResponseSchema(access_token=access_token),
+            AuthResponseSchema,
             status_code=201,
         )
         response.set_cookie(
@@ -66,10 +66,9 @@ class UserService:
             user.id,
         )
 
-        response = JSONResponse(
-            content={
-                "access_token": access_token,
-            },
+        response = SchemaResponse(
+            AuthResponseSchema(access_token=access_token),
+            AuthResponseSchema,
             status_code=200,
         )
         response.set_cookie(
@@ -104,10 +103,9 @@ class UserService:
         access_token, refresh_token = auth.generate_auth_tokens(
             token_data.user_id)
 
-        response = JSONResponse(
-            content={
-                "access_token": access_token,
-            },
+        response = SchemaResponse(
+            AuthResponseSchema(access_token=access_token),
+            AuthResponseSchema,
             status_code=200,
         )
 
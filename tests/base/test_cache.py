@@ -0,0 +1,112 @@
+import pytest
+
+from src.base.cache import Generations, LRUCache, MemoryCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that reading a key keeps it over older ones."""
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert (cache.get("a"), cache.get("c"), len(cache)) == (1, 3, 2)
+
+
+def test_generations_never_reuse_numbers():
+    """Test that bumped or evicted scopes never get an earlier number back."""
+    generations = Generations(1)
+    first = generations.get("a")
+    assert generations.get("a") == first
+
+    generations.bump("a")
+    bumped = generations.get("a")
+    generations.get("b")  # evicts "a"
+
+    numbers = {first, bumped, generations.get("a")}
+    assert len(numbers) == 3
+
+    generations.clear()
+    assert generations.get("a") not in numbers
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_hits_and_misses():
+    """Test that hits, misses and sizes are counted."""
+    cache = MemoryCache(maxsize=10, max_bytes=1000, ttl=60)
+
+    assert await cache.get("a") is None
+    await cache.set("a", b"value")
+    assert await cache.get("a") == b"value"
+
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.hit_ratio) == (1, 1, 0.5)
+    assert (cache.stats.entries, cache.stats.size_bytes) == (1, len("a") + len(b"value"))
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_expires_entries():
+    """Test that entries are dropped once their TTL has passed."""
+    clock = FakeClock()
+    cache = MemoryCache(maxsize=10, max_bytes=1000, ttl=5, clock=clock)
+    await cache.set("a", b"value")
+
+    clock.now = 4.9
+    assert await cache.get("a") == b"value"
+    clock.now = 5
+    assert await cache.get("a") is None
+    assert (cache.stats.entries, cache.stats.size_bytes) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_bounds_entries_and_bytes():
+    """Test that the least recently used entries are evicted past either bound."""
+    cache = MemoryCache(maxsize=2, max_bytes=30, ttl=60)
+    await cache.set("a", b"1")
+    await cache.set("b", b"2")
+    await cache.get("a")
+    await cache.set("c", b"3")
+    assert await cache.get("b") is None
+
+    await cache.set("d", b"x" * 25)
+    assert await cache.get("a") is None
+    await cache.set("e", b"x" * 10)
+    assert await cache.get("c") is None and await cache.get("d") is None
+    assert await cache.get("e") == b"x" * 10
+    await cache.set("f", b"x" * 40)
+    assert await cache.get("f") is None
+
+    assert cache.stats.evictions == 4
+    assert (cache.stats.entries, cache.stats.size_bytes) == (1, 11)
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_delete():
+    """Test that deleting missing keys is a no-op."""
+    cache = MemoryCache(maxsize=10, max_bytes=1000, ttl=60)
+    await cache.set("a", b"1")
+
+    await cache.delete("a", "missing")
+
+    assert await cache.get("a") is None
+    assert cache.stats.entries == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_get_and_set_many():
+    """Test that several keys are read and written at once, in order."""
+    cache = MemoryCache(maxsize=10, max_bytes=1000, ttl=60)
+
+    await cache.set_many({"a": b"1", "b": b"2"})
+
+    assert await cache.get_many(["b", "missing", "a"]) == [b"2", None, b"1"]
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
@@ -0,0 +1,119 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.base.compression import COMPRESSORS, CompressionMiddleware, compression, negotiate_encoding, zstandard
+
+
+BODY = "lorem ipsum dolor sit amet " * 100
+
+
+async def chunks():
+    for _ in range(3):
+        yield BODY
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, levels={"gzip": 1})
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse(BODY[:100])
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/events")
+    async def events():
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/tuned")
+    @compression(minimum_size=100_000)
+    async def tuned():
+        return PlainTextResponse(BODY)
+
+    @app.get("/off")
+    @compression(enabled=False)
+    async def off():
+        return PlainTextResponse(BODY)
+
+    return TestClient(app)
+
+
+def raw_get(client: TestClient, path: str, accept_encoding: str) -> tuple[dict, bytes]:
+    """Gets a response's headers and its body as sent, still encoded."""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response.headers, b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, zstd", "zstd" if zstandard else "gzip"),
+    ("gzip, zstd;q=0.5", "gzip"),
+    ("*", "zstd" if zstandard else "br" if "br" in COMPRESSORS else "gzip"),
+    ("*, zstd;q=0", "br" if "br" in COMPRESSORS else "gzip"),
+    ("gzip;q=0", None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_compresses_large_responses():
+    client = make_client()
+
+    headers, body = raw_get(client, "/large", "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-length"] == str(len(body))
+    assert headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(body).decode() == BODY
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+def test_compresses_with_zstd():
+    headers, body = raw_get(make_client(), "/large", "zstd")
+    assert headers["content-encoding"] == "zstd"
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(body).decode() == BODY
+
+
+def test_leaves_small_and_unaccepted_responses():
+    client = make_client()
+
+    headers, body = raw_get(client, "/small", "gzip")
+    assert "content-encoding" not in headers
+    assert body.decode() == BODY[:100]
+
+    headers, body = raw_get(client, "/large", "identity")
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert body.decode() == BODY
+
+
+def test_compresses_streams_chunk_by_chunk():
+    client = make_client()
+
+    headers, body = raw_get(client, "/stream", "gzip")
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(body).decode() == BODY * 3
+
+
+def test_event_streams_and_tuned_routes():
+    """Test that event streams are never compressed, and routes can raise the threshold or opt out."""
+    client = make_client()
+
+    for path in ("/events", "/tuned", "/off"):
+        headers, body = raw_get(client, path, "gzip")
+        assert "content-encoding" not in headers, path
+        assert BODY in body.decode()
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from starlette.requests import Request
+
+from src.base.conditional import is_conditional, not_modified, validator_headers
+
+
+UPDATED_AT = datetime(2025, 4, 30, 8, 57, 12, 345678)
+
+
+def make_request(**headers: str) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_validator_headers():
+    """Test that validators change with any shown row's version."""
+    headers = validator_headers([(1, UPDATED_AT), (2, UPDATED_AT - timedelta(days=1))])
+
+    assert headers["ETag"].startswith('W/"')
+    assert headers["Last-Modified"] == "Wed, 30 Apr 2025 08:57:12 GMT"
+    assert headers == validator_headers([(1, UPDATED_AT), (2, UPDATED_AT - timedelta(days=1))])
+    assert headers["ETag"] != validator_headers([(1, UPDATED_AT)])["ETag"]
+    assert headers["ETag"] != validator_headers(
+        [(1, UPDATED_AT + timedelta(microseconds=1)), (2, UPDATED_AT - timedelta(days=1))])["ETag"]
+    assert "Last-Modified" not in validator_headers([])
+
+
+def test_not_modified_if_none_match():
+    """Test weak comparison of If-None-Match lists."""
+    headers = validator_headers([(1, UPDATED_AT)])
+    strong = headers["ETag"].removeprefix("W/")
+
+    assert not is_conditional(make_request())
+    assert is_conditional(make_request(if_none_match=strong))
+    assert not_modified(make_request(if_none_match=headers["ETag"]), headers)
+    assert not_modified(make_request(if_none_match=f'"other", {strong}'), headers)
+    assert not_modified(make_request(if_none_match="*"), headers)
+    assert not not_modified(make_request(if_none_match='W/"other"'), headers)
+
+
+def test_not_modified_if_modified_since():
+    """Test If-Modified-Since at one second resolution, and its precedence."""
+    headers = validator_headers([(1, UPDATED_AT)])
+
+    assert not_modified(make_request(if_modified_since="Wed, 30 Apr 2025 08:57:12 GMT"), headers)
+    assert not not_modified(make_request(if_modified_since="Wed, 30 Apr 2025 08:57:11 GMT"), headers)
+    assert not not_modified(make_request(if_modified_since="yesterday"), headers)
+    assert not not_modified(make_request(
+        if_none_match='"other"', if_modified_since="Wed, 30 Apr 2025 08:57:12 GMT"), headers)
@@ -0,0 +1,130 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.base.events import NOTIFY_PAYLOAD_LIMIT, EventHub, PostgresEventRelay
+
+
+pytestmark = pytest.mark.asyncio
+
+OVERFLOW = "overflow"
+
+
+def drain(subscription) -> list:
+    """Takes everything queued on a subscription."""
+    messages = []
+    while not subscription._queue.empty():
+        messages.append(subscription._queue.get_nowait())
+    return messages
+
+
+def relay_for(hub: EventHub, outbox_size: int = 10) -> PostgresEventRelay:
+    return PostgresEventRelay(
+        hub, dsn="postgresql://unused", channel="events",
+        encode=str.upper, decode=str.lower, outbox_size=outbox_size,
+    )
+
+
+async def test_hub_fans_out_per_topic():
+    """Test that messages reach every subscriber of their topic only."""
+    hub = EventHub(queue_size=5, overflow=OVERFLOW)
+    with hub.subscribe("a") as first, hub.subscribe("a") as second, hub.subscribe("b") as other:
+        hub.publish("a", "m1")
+        hub.publish("c", "nobody")
+
+        assert await first.get() == await second.get() == "m1"
+        assert drain(other) == []
+
+
+async def test_hub_replaces_backlog_of_slow_subscriber():
+    """Test that a full queue is swapped for one overflow message without blocking the publisher."""
+    hub = EventHub(queue_size=2, overflow=OVERFLOW)
+    with hub.subscribe("a") as slow:
+        for message in ("m1", "m2", "m3", "m4"):
+            hub.publish("a", message)
+
+        assert drain(slow) == [OVERFLOW, "m4"]
+        assert slow.overflows == 1
+
+
+async def test_hub_forgets_topics_without_subscribers():
+    hub = EventHub(queue_size=2, overflow=OVERFLOW)
+    with hub.subscribe("a"):
+        assert "a" in hub
+    assert "a" not in hub
+
+
+async def test_hub_interrupt_reaches_every_subscriber():
+    hub = EventHub(queue_size=2, overflow=OVERFLOW)
+    with hub.subscribe("a") as first, hub.subscribe("b") as second:
+        hub.publish("a", "m1")
+        hub.interrupt()
+
+        assert drain(first) == drain(second) == [OVERFLOW]
+
+
+async def test_hub_listeners_hear_every_topic():
+    hub = EventHub(queue_size=2, overflow=OVERFLOW)
+    listener = MagicMock()
+    assert "a" not in hub
+    hub.add_listener(listener)
+
+    assert "a" in hub
+    hub.publish("a", "m1")
+    hub.interrupt()
+
+    assert [call.args for call in listener.call_args_list] == [("a", "m1"), (None, OVERFLOW)]
+
+
+async def test_hub_publishes_through_relay():
+    """Test that an attached relay, not the hub, delivers published messages."""
+    hub = EventHub(queue_size=2, overflow=OVERFLOW)
+    hub.relay = MagicMock()
+    with hub.subscribe("a") as subscription:
+        hub.publish("a", "m1")
+
+        hub.relay.send.assert_called_once_with("a", "m1")
+        assert drain(subscription) == []
+
+
+async def test_relay_delivers_notifications_to_subscribed_topics():
+    """Test that notifications are decoded and delivered only where someone listens."""
+    hub = EventHub(queue_size=2, overflow=OVERFLOW)
+    relay = relay_for(hub)
+    relay.decode = MagicMock(side_effect=str.lower)
+    with hub.subscribe("a") as subscription:
+        relay._on_notification(None, 1, "events", "a\tM1")
+        relay._on_notification(None, 1, "events", "b\tM2")
+
+        assert drain(subscription) == ["m1"]
+        relay.decode.assert_called_once_with("M1")
+
+
+async def test_relay_drops_when_outbox_full_or_payload_too_large():
+    relay = relay_for(EventHub(queue_size=2, overflow=OVERFLOW), outbox_size=1)
+
+    relay.send("a", "m1")
+    relay.send("a", "m2")
+    relay.send("a", "x" * NOTIFY_PAYLOAD_LIMIT)
+
+    assert relay._outbox.get_nowait() == ("events", "a\tM1")
+    assert relay.dropped == 2
+
+
+async def test_relay_stop_detaches_from_hub(monkeypatch):
+    """Test that stopping the relay cancels its tasks, even while it cannot connect."""
+    async def refuse(dsn):
+        raise ConnectionRefusedError
+    monkeypatch.setattr("src.base.events.asyncpg.connect", refuse)
+    hub = EventHub(queue_size=2, overflow=OVERFLOW)
+    relay = relay_for(hub)
+
+    await relay.start()
+    assert hub.relay is relay
+    hub.publish("a", "m1")
+    await asyncio.sleep(0)
+    await relay.stop()
+
+    assert hub.relay is None
+    assert not relay.listening.is_set()
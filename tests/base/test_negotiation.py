@@ -0,0 +1,35 @@
+import pytest
+
+from src.base import negotiation
+from src.base.negotiation import JSON, MSGPACK, is_msgpack, negotiate_media_type
+
+
+@pytest.mark.skipif(negotiation.msgpack is None, reason="msgpack is not installed")
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON),
+    ("*/*", JSON),
+    ("application/json", JSON),
+    ("application/msgpack", MSGPACK),
+    ("application/x-msgpack", MSGPACK),
+    ("application/msgpack, */*", MSGPACK),
+    ("application/msgpack;q=0.5, */*", JSON),
+    ("application/json, application/msgpack", JSON),
+    ("application/json;q=0.8, application/msgpack", MSGPACK),
+    ("application/msgpack;q=0, application/json", JSON),
+    ("text/html, application/msgpack;q=bad", JSON),
+])
+def test_negotiate_media_type(accept, expected):
+    assert negotiate_media_type(accept) == expected
+
+
+def test_negotiate_media_type_without_msgpack(monkeypatch):
+    monkeypatch.setattr(negotiation, "msgpack", None)
+
+    assert negotiate_media_type("application/msgpack") == JSON
+
+
+def test_is_msgpack():
+    assert is_msgpack("application/msgpack; charset=binary")
+    assert is_msgpack("Application/X-MsgPack")
+    assert not is_msgpack("application/json")
+    assert not is_msgpack(None)
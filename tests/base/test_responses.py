@@ -0,0 +1,67 @@
+from datetime import datetime
+from enum import Enum
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ValidationError
+
+from src.base.responses import SchemaResponse, type_adapter
+
+
+class Color(str, Enum):
+    RED = "red"
+
+
+class ItemSchema(BaseModel):
+    id: int
+    color: Color
+    seen_at: datetime
+
+
+SEEN_AT = datetime(2025, 4, 30, 8, 57, 12)
+EXPECTED = b'[{"id":1,"color":"red","seen_at":"2025-04-30T08:57:12"}]'
+
+
+def test_schema_response_reads_objects_dicts_and_instances():
+    """Test that attributes, keys and schema instances all serialize alike."""
+    item = ItemSchema(id=1, color=Color.RED, seen_at=SEEN_AT)
+
+    for content in (
+        [SimpleNamespace(id=1, color="red", seen_at=SEEN_AT, extra="dropped")],
+        [{"id": 1, "color": Color.RED, "seen_at": SEEN_AT}],
+        [item],
+    ):
+        response = SchemaResponse(content, list[ItemSchema], headers={"ETag": 'W/"1"'})
+
+        assert response.render_body() == EXPECTED
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["content-length"] == str(len(EXPECTED))
+        assert response.headers["ETag"] == 'W/"1"'
+
+
+def test_schema_response_encodes_when_sent():
+    """Test that content is validated on creation but only encoded when sent."""
+    item = SimpleNamespace(id=1, color="red", seen_at=SEEN_AT)
+    response = SchemaResponse([item], list[ItemSchema])
+    item.color = "changed after validation"
+
+    assert response.body is None
+    assert "content-length" not in response.headers
+
+    app = FastAPI()
+    app.get("/")(lambda: response)
+    sent = TestClient(app).get("/")
+
+    assert sent.content == EXPECTED
+    assert sent.headers["content-length"] == str(len(EXPECTED))
+
+
+def test_schema_response_rejects_content_not_matching_schema():
+    with pytest.raises(ValidationError):
+        SchemaResponse([{"id": 1}], list[ItemSchema])
+
+
+def test_type_adapter_is_cached():
+    assert type_adapter(list[ItemSchema]) is type_adapter(list[ItemSchema])
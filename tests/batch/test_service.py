@@ -0,0 +1,85 @@
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from unittest.mock import AsyncMock, MagicMock
+
+from src.base.exceptions import BadRequestException, NotFoundException
+from src.batch import BatchService
+from src.batch.schemas import BatchOperationSchema
+from src.batch.service import check_operations
+from src.db import get_session
+
+
+SCOPE = {
+    "type": "http",
+    "scheme": "http",
+    "server": ("test", 80),
+    "client": ("client", 1234),
+    "root_path": "",
+    "headers": [(b"authorization", b"Bearer token"), (b"accept-encoding", b"gzip"), (b"content-length", b"999")],
+}
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/tasks/echo")
+    async def echo(request: Request, session=Depends(get_session)):
+        return {
+            "body": await request.json(),
+            "query": request.query_params.get("q"),
+            "authorization": request.headers.get("authorization"),
+            "accept_encoding": request.headers.get("accept-encoding"),
+            "shared_session": session is request.scope["db_session"],
+        }
+
+    @app.get("/tasks/missing")
+    async def missing():
+        raise NotFoundException("Task not found")
+
+    @app.get("/tasks/text")
+    async def plain_text():
+        return PlainTextResponse("plain", headers={"X-Extra": "1"})
+
+    return app
+
+
+def test_check_operations():
+    check_operations([BatchOperationSchema(method="GET", path="/tasks/list?page=2")])
+    for path in ("/user/logout", "/batch", "/tasks/stream", "/tasks/export?format=csv", "/tasks/import"):
+        with pytest.raises(BadRequestException):
+            check_operations([BatchOperationSchema(method="POST", path=path)])
+    with pytest.raises(BadRequestException):
+        check_operations([BatchOperationSchema(method="GET", path="/tasks/list")] * 51)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_operation_on_the_batch_session():
+    """Test that an operation is a request of its own, with the batch's session and user."""
+    service = BatchService(make_app(), MagicMock())
+    session = AsyncMock()
+
+    result = await service._dispatch(
+        BatchOperationSchema(method="POST", path="/tasks/echo?q=1", body={"title": "New"}), SCOPE, session)
+
+    assert result.status == 200
+    assert result.body == {
+        "body": {"title": "New"},
+        "query": "1",
+        "authorization": "Bearer token",
+        "accept_encoding": None,
+        "shared_session": True,
+    }
+    assert "content-length" not in result.headers
+    session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_reports_errors_and_other_bodies():
+    service = BatchService(make_app(), MagicMock())
+
+    missing = await service._dispatch(BatchOperationSchema(method="GET", path="/tasks/missing"), SCOPE, AsyncMock())
+    text = await service._dispatch(BatchOperationSchema(method="GET", path="/tasks/text"), SCOPE, AsyncMock())
+
+    assert (missing.status, missing.body) == (404, {"detail": "Task not found"})
+    assert (text.status, text.body, text.headers) == (200, "plain", {"x-extra": "1"})
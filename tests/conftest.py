@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime
 from typing import Generator, Any
 from unittest.mock import AsyncMock, MagicMock
 
@@ -6,8 +7,12 @@ from fastapi import Request
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.base.cache import Generations, LRUCache, MemoryCache
+from src.base.events import EventHub
+from src.config import Settings
 from src.main import app as actual_app
 from src.tasks import TaskRepository, TaskService, Task as TaskModel
+from src.tasks.schemas import TaskEventSchema, TaskEventType
 from src.users import User as UserModel
 from src.users.service import UserService
 from src.users.repository import UserRepository
@@ -17,6 +22,11 @@ from src.dependencies import get_user_service, get_task_service, get_current_use
 TEST_USER_ID = 1
 
 
+async def run_callback(callback) -> None:
+    """Runs an ``after_commit`` or ``after_transaction`` callback right away, as outside a batch."""
+    await callback()
+
+
 @pytest.fixture(scope="session")
 def anyio_backend():
     return "asyncio"
@@ -86,10 +96,12 @@ def mock_session() -> AsyncMock:
     mock_execute_result.scalars = MagicMock(return_value=mock_scalars_result)
     mock_scalars_result.first = MagicMock()  # Configure return_value in tests
     mock_scalars_result.all = MagicMock()   # Configure return_value in tests
+    mock_execute_result.mappings = MagicMock()  # Column queries; configure in tests
     session.commit = AsyncMock()
     session.add = MagicMock()
     session.refresh = AsyncMock()
     session.delete = AsyncMock()
+    session.info = {}
     return session
 
 
@@ -112,6 +124,7 @@ def override_settings(monkeypatch):
     """Override settings for testing."""
     monkeypatch.setattr("src.config.Settings.SECRET_KEY", "test_secret")
     monkeypatch.setattr("src.config.Settings.ALGORITHM", "HS256")
+    monkeypatch.setattr("src.config.Settings.TASKS_EVENTS_BACKEND", "local")
     monkeypatch.setattr("src.config.Settings.ACCESS_TOKEN_EXPIRE_MINUTES", 15)
     monkeypatch.setattr(
         "src.config.Settings.REFRESH_TOKEN_EXPIRE_MINUTES", 1440)
@@ -135,19 +148,50 @@ def mock_task_repository() -> MagicMock:
     """Fixture for a mocked TaskRepository."""
     mock = MagicMock(spec=TaskRepository)
     mock.get_task = AsyncMock()
+    mock.get_task_updated_at = AsyncMock()
+    mock.get_tasks_by_ids = AsyncMock()
     mock.get_tasks = AsyncMock()
     mock.get_tasks_by_status = AsyncMock()
+    mock.after_commit = AsyncMock(side_effect=run_callback)
+    mock.after_transaction = AsyncMock(side_effect=run_callback)
     mock.get_user_tasks = AsyncMock()
+    mock.search_tasks = AsyncMock()
+    mock.suggest_tasks = AsyncMock()
+    mock.get_change_horizon = AsyncMock()
+    mock.get_changed_tasks = AsyncMock()
+    mock.get_task_tombstones = AsyncMock()
+    mock.delete_task_tombstones = AsyncMock()
+    mock.get_task_status_counts = AsyncMock()
+    mock.get_task_daily_counts = AsyncMock()
+    mock.reconcile_task_counts = AsyncMock()
+    mock.get_task_owner = AsyncMock()
+    mock.get_existing_task_ids = AsyncMock()
     mock.add_task = AsyncMock()
+    mock.add_tasks = AsyncMock()
     mock.update_task = AsyncMock()
+    mock.update_tasks_status = AsyncMock()
     mock.delete_task = AsyncMock()
+    mock.delete_tasks = AsyncMock()
+    mock.stream_user_tasks = MagicMock()  # Async generator; configure in tests
+    mock.copy_tasks = AsyncMock()
+    mock.commit = AsyncMock()
+    mock.rollback = AsyncMock()
+    mock.detached = MagicMock()
+    mock.detached.return_value.__aenter__.return_value = mock
     return mock
 
 
 @pytest.fixture
 def task_service(mock_task_repository: TaskRepository) -> TaskService:
     """Fixture for TaskService instance with mocked repository."""
-    return TaskService(task_repository=mock_task_repository)
+    return TaskService(
+        task_repository=mock_task_repository,
+        suggestion_cache=LRUCache(Settings.TASKS_SUGGEST_CACHE_USERS),
+        task_cache=MemoryCache(maxsize=100, max_bytes=1 << 20, ttl=60),
+        list_cache=MemoryCache(maxsize=100, max_bytes=1 << 20, ttl=60),
+        list_generations=Generations(100),
+        events=EventHub(queue_size=3, overflow=TaskEventSchema(type=TaskEventType.RESYNC)),
+    )
 
 
 @pytest.fixture
@@ -155,11 +199,23 @@ def mock_task_service() -> MagicMock:
     """Fixture for a mocked TaskService used in router tests."""
     mock = MagicMock(spec=TaskService)
     mock.get_task = AsyncMock()
+    mock.get_task_updated_at = AsyncMock()
+    mock.get_tasks_by_ids = AsyncMock()
     mock.get_tasks = AsyncMock()
     mock.get_user_tasks = AsyncMock()
+    mock.search_tasks = AsyncMock()
+    mock.suggest_tasks = AsyncMock()
+    mock.get_task_changes = AsyncMock()
+    mock.get_task_stats = AsyncMock()
+    mock.stream_task_events = MagicMock()  # Async generator; configure in tests
     mock.create_task = AsyncMock()
+    mock.create_tasks = AsyncMock()
     mock.update_task = AsyncMock()
+    mock.update_tasks_status = AsyncMock()
     mock.delete_task = AsyncMock()
+    mock.delete_tasks = AsyncMock()
+    mock.export_user_tasks = MagicMock()  # Async generator; configure in tests
+    mock.import_tasks = AsyncMock()
     return mock
 
 # --- Reusable Mock Session (from user tests) ---
@@ -204,3 +260,14 @@ def mock_task_list(mock_user: UserModel) -> list[TaskModel]:
         TaskModel(id=103, title="Task 3", description="Desc 3",
                   status="new", user_id=999),
     ]
+
+
+@pytest.fixture
+def mock_task_rows(mock_task_list: list[TaskModel]) -> list[dict]:
+    """Provides the column rows of ``mock_task_list`` as returned by Core queries."""
+    timestamp = datetime(2025, 4, 30, 8, 57)
+    return [
+        {"title": t.title, "description": t.description, "status": t.status, "id": t.id,
+         "updated_at": timestamp, "created_at": timestamp, "user_id": t.user_id}
+        for t in mock_task_list
+    ]
@@ -0,0 +1,139 @@
+"""
+Batches: task operations run through the application on one session, in one
+transaction committed at the end.
+"""
+import asyncio
+from typing import AsyncGenerator
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.batch import BatchService
+from src.dependencies import get_batch_service, get_current_user
+from src.main import app
+from src.tasks import TaskRepository
+from src.tasks.events import TASK_EVENTS, task_events_topic
+from src.tasks.schemas import TaskEventType
+from src.users import TokenData
+
+from tests.integration.conftest import requires_database
+
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+
+@pytest_asyncio.fixture(loop_scope="package")
+async def batch_user(db_engine: AsyncEngine) -> AsyncGenerator[int, None]:
+    """A user without tasks, removed again with their tasks afterwards."""
+    async with db_engine.begin() as connection:
+        user_id = await connection.scalar(text(
+            "INSERT INTO users (first_name, last_name, username, password) "
+            "VALUES ('Batch', 'User', 'batch-user', '-') RETURNING id"
+        ))
+
+    yield user_id
+
+    async with db_engine.begin() as connection:
+        await connection.execute(text("DELETE FROM tasks WHERE user_id = :user_id"), {"user_id": user_id})
+        await connection.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+
+
+@pytest_asyncio.fixture(loop_scope="package")
+async def batch_client(db_engine: AsyncEngine, batch_user: int) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Client of the application, signed in as ``batch_user``, with batches on ``db_engine``."""
+    app.dependency_overrides[get_current_user] = lambda: TokenData(user_id=batch_user, action="auth")
+
+    def get_test_batch_service(request: Request) -> BatchService:
+        return BatchService(request.app, db_engine)
+
+    app.dependency_overrides[get_batch_service] = get_test_batch_service
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides = {}
+
+
+async def titles(engine: AsyncEngine, user_id: int) -> list[str]:
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text("SELECT title FROM tasks WHERE user_id = :user_id ORDER BY id"), {"user_id": user_id})
+        return list(result.scalars())
+
+
+async def test_batch_runs_operations_in_one_transaction(
+        db_engine: AsyncEngine, batch_client: httpx.AsyncClient, batch_user: int):
+    """Test that later operations see earlier ones, and a failed one is rolled back alone."""
+    with TASK_EVENTS.subscribe(task_events_topic(batch_user)) as subscription:
+        response = await batch_client.post("/batch", json={"operations": [
+            {"method": "POST", "path": "/tasks/create", "body": {"title": "First", "description": ""}},
+            {"method": "POST", "path": "/tasks/create", "body": {"title": "Second", "description": ""}},
+            {"method": "GET", "path": "/tasks/user/me?fields=title"},
+            {"method": "PUT", "path": "/tasks/update", "body": {"id": 0, "title": "Missing"}},
+            {"method": "POST", "path": "/tasks/create", "body": {"title": ""}},
+        ]})
+        events = [await asyncio.wait_for(subscription.get(), 1) for _ in range(2)]
+
+    assert response.status_code == 200
+    batch = response.json()
+    assert batch["committed"] is True
+    assert [result["status"] for result in batch["results"]] == [200, 200, 200, 404, 422]
+    assert batch["results"][2]["body"] == [{"title": "First"}, {"title": "Second"}]
+    assert "etag" in batch["results"][2]["headers"]
+    assert await titles(db_engine, batch_user) == ["First", "Second"]
+    assert [event.type for event in events] == [TaskEventType.CREATED, TaskEventType.CREATED]
+
+
+async def test_atomic_batch_rolls_back_on_failure(
+        db_engine: AsyncEngine, batch_client: httpx.AsyncClient, batch_user: int):
+    """Test that an atomic batch undoes everything and skips the rest once an operation fails."""
+    with TASK_EVENTS.subscribe(task_events_topic(batch_user)) as subscription:
+        response = await batch_client.post("/batch", json={"atomic": True, "operations": [
+            {"method": "POST", "path": "/tasks/create", "body": {"title": "Undone", "description": ""}},
+            {"method": "DELETE", "path": "/tasks/0"},
+            {"method": "POST", "path": "/tasks/create", "body": {"title": "Skipped", "description": ""}},
+        ]})
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(subscription.get(), 0.2)
+
+    batch = response.json()
+    assert batch["committed"] is False
+    assert [result["status"] for result in batch["results"]] == [200, 404, 424]
+    assert await titles(db_engine, batch_user) == []
+
+
+async def test_failed_operation_is_rolled_back_whole(
+        db_engine: AsyncEngine, batch_client: httpx.AsyncClient, batch_user: int,
+        monkeypatch: pytest.MonkeyPatch):
+    """Test that an operation failing after its route committed leaves none of its writes."""
+    add_task = TaskRepository.add_task
+
+    async def add_task_then_fail(self, task):
+        task = await add_task(self, task)
+        if task.title == "Broken":
+            raise RuntimeError("failed after commit")
+        return task
+
+    monkeypatch.setattr(TaskRepository, "add_task", add_task_then_fail)
+    with TASK_EVENTS.subscribe(task_events_topic(batch_user)) as subscription:
+        response = await batch_client.post("/batch", json={"operations": [
+            {"method": "POST", "path": "/tasks/create", "body": {"title": "Broken", "description": ""}},
+            {"method": "POST", "path": "/tasks/create", "body": {"title": "Kept", "description": ""}},
+        ]})
+        event = await asyncio.wait_for(subscription.get(), 1)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(subscription.get(), 0.2)
+
+    batch = response.json()
+    assert batch["committed"] is True
+    assert [result["status"] for result in batch["results"]] == [500, 200]
+    assert await titles(db_engine, batch_user) == ["Kept"]
+    assert event.ids == [batch["results"][1]["body"]["id"]]
+
+
+async def test_batch_rejects_other_routes(batch_client: httpx.AsyncClient):
+    for path in ("/user/logout", "/tasks/export", "/batch"):
+        response = await batch_client.post("/batch", json={"operations": [{"method": "GET", "path": path}]})
+        assert response.status_code == 400, path
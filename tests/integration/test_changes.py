@@ -0,0 +1,109 @@
+"""
+The change feed: resuming from a cursor, delete tombstones, and writes that
+commit after a cursor was handed out.
+"""
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.tasks.repository import TaskRepository
+from src.tasks.schemas import BulkTaskSelectionSchema, TaskChangesSchema, UpdateTaskSchema
+from src.tasks.service import TaskService
+
+from tests.integration.conftest import requires_database
+
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+
+@pytest_asyncio.fixture(loop_scope="package")
+async def changes_user(db_engine: AsyncEngine) -> AsyncGenerator[tuple[int, list[int]], None]:
+    """A user owning four committed tasks, removed again (with them) afterwards."""
+    async with db_engine.begin() as connection:
+        user_id = await connection.scalar(text(
+            "INSERT INTO users (first_name, last_name, username, password) "
+            "VALUES ('Changes', 'User', 'changes-user', '-') RETURNING id"
+        ))
+        task_ids = list(await connection.scalars(text(
+            "INSERT INTO tasks (title, description, status, user_id) "
+            "SELECT 'Task ' || n, '', 'new', :user_id FROM generate_series(1, 4) AS n "
+            "RETURNING id"
+        ), {"user_id": user_id}))
+
+    yield user_id, sorted(task_ids)
+
+    async with db_engine.begin() as connection:
+        await connection.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+
+
+async def run(db_engine: AsyncEngine, action):
+    """Runs ``action`` on a service over a session of its own, like a request."""
+    async with AsyncSession(db_engine, expire_on_commit=False) as session:
+        result = await action(TaskService(TaskRepository(session)))
+        await session.commit()
+        return result
+
+
+async def sync(db_engine: AsyncEngine, user_id: int, since: str = None, page_size: int = 100) -> TaskChangesSchema:
+    return await run(db_engine, lambda service: service.get_task_changes(
+        user_id, since=since, elements_per_page=page_size))
+
+
+async def test_changes_resume_with_tombstones(db_engine: AsyncEngine, changes_user):
+    user_id, task_ids = changes_user
+
+    first = await sync(db_engine, user_id, page_size=3)
+    second = await sync(db_engine, user_id, since=first.cursor, page_size=3)
+    assert first.has_more and not second.has_more
+    assert [task.id for task in first.changed + second.changed] == task_ids
+    assert (await sync(db_engine, user_id, since=second.cursor)).changed == []
+
+    await run(db_engine, lambda service: service.update_task(
+        UpdateTaskSchema(id=task_ids[0], title="Renamed"), user_id))
+    await run(db_engine, lambda service: service.delete_task(task_ids[1], user_id))
+    await run(db_engine, lambda service: service.delete_tasks(
+        BulkTaskSelectionSchema(ids=[task_ids[2]]), user_id))
+
+    changes = await sync(db_engine, user_id, since=second.cursor)
+    assert [(task.id, task.title) for task in changes.changed] == [(task_ids[0], "Renamed")]
+    assert changes.deleted == task_ids[1:3]
+
+
+async def test_changes_wait_for_open_transactions(db_engine: AsyncEngine, changes_user):
+    """A write committing after a later one is not skipped by cursors handed out meanwhile."""
+    user_id, task_ids = changes_user
+    cursor = (await sync(db_engine, user_id)).cursor
+
+    async with db_engine.connect() as slow_writer:
+        await slow_writer.execute(
+            text("UPDATE tasks SET title = 'Slow', updated_at = now() WHERE id = :id"), {"id": task_ids[0]})
+        await run(db_engine, lambda service: service.update_task(
+            UpdateTaskSchema(id=task_ids[1], title="Fast"), user_id))
+
+        blocked = await sync(db_engine, user_id, since=cursor)
+        assert blocked.changed == []
+        await slow_writer.commit()
+
+    changes = await sync(db_engine, user_id, since=blocked.cursor)
+    assert [task.title for task in changes.changed] == ["Slow", "Fast"]
+
+
+async def test_changes_skip_detached_readers(db_engine: AsyncEngine, changes_user):
+    """An open export does not hold the feed back, and can not write."""
+    user_id, task_ids = changes_user
+    cursor = (await sync(db_engine, user_id)).cursor
+
+    async with AsyncSession(db_engine) as session:
+        async with TaskRepository(session).detached() as reader:
+            await reader.get_task_updated_at(task_ids[0])
+            await run(db_engine, lambda service: service.update_task(
+                UpdateTaskSchema(id=task_ids[0], title="Renamed"), user_id))
+
+            changes = await sync(db_engine, user_id, since=cursor)
+            assert [task.title for task in changes.changed] == ["Renamed"]
+            with pytest.raises(DBAPIError, match="read-only transaction"):
+                await reader.session.execute(text("DELETE FROM tasks WHERE id = :id"), {"id": task_ids[1]})
@@ -0,0 +1,61 @@
+"""
+Checks the statements sent when creating rows: generated columns come back
+through ``INSERT ... RETURNING`` instead of a follow-up SELECT.
+"""
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.tasks.models import Task
+from src.tasks.repository import TaskRepository
+from src.users.models import User
+from src.users.repository import UserRepository
+
+from tests.integration.conftest import capture_statements, requires_database
+
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+
+def sent_sql(statements: list[tuple[str, tuple]]) -> list[str]:
+    """Normalizes captured statements to single-line SQL."""
+    return [" ".join(statement.split()) for statement, _ in statements]
+
+
+async def test_add_task_inserts_with_returning(db_session: AsyncSession):
+    task = Task(title="Created", description="Once", status="new", user_id=1)
+
+    with capture_statements(db_session.bind) as statements:
+        await TaskRepository(db_session).add_task(task)
+        # Generated columns must already be loaded, not expired.
+        values = (task.id, task.created_at, task.updated_at)
+
+    try:
+        sql = sent_sql(statements)
+        # The task, then the counters of ``/tasks/stats`` in one upsert.
+        assert len(sql) == 2
+        assert sql[0].startswith("INSERT INTO tasks")
+        assert sql[0].endswith("RETURNING tasks.created_at, tasks.updated_at, tasks.id")
+        assert sql[1].startswith("WITH status_counts AS (INSERT INTO task_status_counts")
+        assert all(value is not None for value in values)
+    finally:
+        await db_session.execute(delete(Task).where(Task.id == task.id))
+        await db_session.commit()
+
+
+async def test_create_user_inserts_with_returning(db_session: AsyncSession):
+    user = User(first_name="New", last_name="User", username="created-user", password="-")
+
+    with capture_statements(db_session.bind) as statements:
+        await UserRepository(db_session).create_user(user)
+        values = (user.id, user.created_at, user.updated_at)
+
+    try:
+        sql = sent_sql(statements)
+        assert len(sql) == 1
+        assert sql[0].startswith("INSERT INTO users")
+        assert sql[0].endswith("RETURNING users.created_at, users.updated_at, users.id")
+        assert all(value is not None for value in values)
+    finally:
+        await db_session.execute(delete(User).where(User.id == user.id))
+        await db_session.commit()
@@ -0,0 +1,68 @@
+"""
+Task events relayed between two hubs, standing in for two workers, over
+Postgres ``LISTEN``/``NOTIFY``.
+"""
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+from src.base.events import EventHub, PostgresEventRelay
+from src.tasks.events import TASK_EVENTS_CHANNEL
+from src.tasks.schemas import TaskEventSchema, TaskEventType
+
+from tests.integration.conftest import TEST_DATABASE_URL, requires_database
+
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+RESYNC = TaskEventSchema(type=TaskEventType.RESYNC)
+
+
+@pytest_asyncio.fixture(loop_scope="package")
+async def workers() -> AsyncGenerator[list[EventHub[TaskEventSchema]], None]:
+    """Two hubs, each relaying through a connection of its own."""
+    hubs = [EventHub(queue_size=10, overflow=RESYNC) for _ in range(2)]
+    relays = [
+        PostgresEventRelay(
+            hub,
+            dsn=TEST_DATABASE_URL.replace("+asyncpg", ""),
+            channel=TASK_EVENTS_CHANNEL,
+            encode=TaskEventSchema.model_dump_json,
+            decode=TaskEventSchema.model_validate_json,
+        )
+        for hub in hubs
+    ]
+    for relay in relays:
+        await relay.start()
+    await asyncio.wait_for(asyncio.gather(*(relay.listening.wait() for relay in relays)), 5)
+
+    yield hubs
+
+    for relay in relays:
+        await relay.stop()
+
+
+async def test_events_reach_subscribers_of_every_worker(workers):
+    publisher, other = workers
+    event = TaskEventSchema(type=TaskEventType.UPDATED, ids=[1, 2])
+    with publisher.subscribe("7") as local, other.subscribe("7") as remote, other.subscribe("8") as unrelated:
+        publisher.publish("7", event)
+
+        assert await asyncio.wait_for(local.get(), 5) == event
+        assert await asyncio.wait_for(remote.get(), 5) == event
+        await asyncio.sleep(0.1)
+        assert unrelated._queue.empty()
+
+
+async def test_listeners_hear_events_of_other_workers(workers):
+    """Test that a worker's listeners hear writes made on another worker, e.g. to drop caches."""
+    publisher, other = workers
+    heard = asyncio.Queue()
+    other.add_listener(lambda topic, event: heard.put_nowait((topic, event)))
+    event = TaskEventSchema(type=TaskEventType.DELETED, ids=[3])
+
+    publisher.publish("9", event)
+
+    assert await asyncio.wait_for(heard.get(), 5) == ("9", event)
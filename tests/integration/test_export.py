@@ -0,0 +1,112 @@
+"""
+Streams a large task export through the application and checks that the
+process memory stays flat while it does.
+"""
+import asyncio
+import json
+import os
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.dependencies import get_current_user, get_task_repository
+from src.main import app
+from src.tasks import TaskRepository
+from src.users import TokenData
+from tests.integration.conftest import requires_database
+
+
+EXPORT_ROWS = 1_000_000
+# Allowed growth of the resident set while the export streams; buffering
+# the whole export would take several hundred megabytes.
+RSS_CEILING_BYTES = 64 * 1024 * 1024
+
+pytestmark = [
+    requires_database,
+    pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc"),
+    pytest.mark.asyncio(loop_scope="package"),
+]
+
+
+def current_rss() -> int:
+    """Current resident set size of this process, in bytes."""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="package")
+async def export_user_id(db_engine: AsyncEngine) -> AsyncGenerator[int, None]:
+    """A user owning ``EXPORT_ROWS`` tasks, removed again afterwards."""
+    async with db_engine.begin() as connection:
+        user_id = await connection.scalar(text(
+            "INSERT INTO users (first_name, last_name, username, password) "
+            "VALUES ('Export', 'User', 'export-user', '-') RETURNING id"
+        ))
+        await connection.execute(text(
+            "INSERT INTO tasks (title, description, status, user_id, created_at, updated_at) "
+            "SELECT 'Task ' || n, 'Description ' || n, "
+            "(ARRAY['new', 'in_progress', 'completed'])[1 + n % 3], "
+            ":user_id, now() - make_interval(secs => n), now() - make_interval(secs => n) "
+            "FROM generate_series(1, :rows) AS n"
+        ), {"user_id": user_id, "rows": EXPORT_ROWS})
+
+    yield user_id
+
+    async with db_engine.begin() as connection:
+        await connection.execute(
+            text("DELETE FROM tasks WHERE user_id = :user_id"), {"user_id": user_id})
+        await connection.execute(
+            text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+    async with db_engine.connect() as connection:
+        await connection.execute(text("ANALYZE tasks"))
+
+
+async def test_export_streams_in_constant_memory(db_session: AsyncSession, export_user_id: int):
+    app.dependency_overrides[get_current_user] = lambda: TokenData(user_id=export_user_id, action="auth")
+    app.dependency_overrides[get_task_repository] = lambda: TaskRepository(db_session)
+    finished = asyncio.Event()
+    request_sent = False
+    start_message = {}
+    rows = 0
+    tail = b""
+    baseline = current_rss()
+    peak = baseline
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal rows, tail, peak
+        if message["type"] == "http.response.start":
+            start_message.update(message)
+            return
+        body = message.get("body", b"")
+        rows += body.count(b"\n")
+        if body:
+            tail = body
+        peak = max(peak, current_rss())
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/tasks/export", "raw_path": b"/tasks/export",
+        "root_path": "", "query_string": b"format=ndjson", "headers": [],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    try:
+        await app(scope, receive, send)
+    finally:
+        finished.set()
+        app.dependency_overrides = {}
+
+    assert start_message["status"] == 200
+    assert rows == EXPORT_ROWS
+    assert json.loads(tail.splitlines()[-1])["user_id"] == export_user_id
+    assert peak - baseline < RSS_CEILING_BYTES
@@ -0,0 +1,73 @@
+"""
+Imports tasks through the COPY path against a real Postgres.
+"""
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.base.exceptions import BadRequestException
+from src.tasks.importer import iter_import_records
+from src.tasks.models import Task
+from src.tasks.repository import TaskRepository
+from src.tasks.schemas import TaskFileFormat
+from src.tasks.service import TaskService
+
+from tests.integration.conftest import requires_database
+
+
+IMPORT_USER_ID = 3
+IMPORT_ROWS = 25_000
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+
+async def csv_body(rows: int, invalid_at: int = None):
+    """Yields a CSV import file in chunks of 1000 rows."""
+    yield b"title,description,status\n"
+    for start in range(0, rows, 1000):
+        yield b"".join(
+            b"Imported %d,\"line one\nline two\",%s\n"
+            % (n, b"bogus" if n == invalid_at else b"completed")
+            for n in range(start, min(start + 1000, rows))
+        )
+
+
+async def count_imported(session: AsyncSession) -> int:
+    return await session.scalar(
+        select(func.count()).select_from(Task)
+        .where(Task.user_id == IMPORT_USER_ID, Task.title.startswith("Imported ")))
+
+
+async def test_import_tasks_with_copy(db_session: AsyncSession, monkeypatch):
+    monkeypatch.setattr("src.config.Settings.TASKS_IMPORT_CHUNK_SIZE", 10_000)
+    service = TaskService(TaskRepository(db_session))
+
+    try:
+        result = await service.import_tasks(
+            records=iter_import_records(csv_body(IMPORT_ROWS), TaskFileFormat.CSV),
+            user_id=IMPORT_USER_ID,
+        )
+
+        assert (result.imported, result.failed, result.chunks) == (IMPORT_ROWS, 0, 3)
+        assert await count_imported(db_session) == IMPORT_ROWS
+        task = await db_session.scalar(select(Task).where(Task.title == "Imported 7"))
+        assert (task.description, task.status, task.user_id) == (
+            "line one\nline two", "completed", IMPORT_USER_ID)
+        assert task.created_at is not None
+    finally:
+        await db_session.execute(delete(Task).where(
+            Task.user_id == IMPORT_USER_ID, Task.title.startswith("Imported ")))
+        await db_session.commit()
+
+
+async def test_import_tasks_rolls_back_on_invalid_row(db_session: AsyncSession, monkeypatch):
+    monkeypatch.setattr("src.config.Settings.TASKS_IMPORT_CHUNK_SIZE", 1000)
+    service = TaskService(TaskRepository(db_session))
+
+    with pytest.raises(BadRequestException):
+        await service.import_tasks(
+            records=iter_import_records(csv_body(5000, invalid_at=4500), TaskFileFormat.CSV),
+            user_id=IMPORT_USER_ID,
+        )
+
+    assert await count_imported(db_session) == 0
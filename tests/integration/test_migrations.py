@@ -0,0 +1,32 @@
+"""
+Checks that the Alembic migrations build the schema the models declare.
+"""
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.tasks.models import Task
+
+from tests.integration.conftest import requires_database
+
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+
+async def test_migrated_task_indexes_match_model(db_engine: AsyncEngine):
+    """Fails when a task index is declared on the model but not migrated, or vice versa."""
+    async with db_engine.connect() as connection:
+        migrated = await connection.run_sync(
+            lambda sync_connection: inspect(sync_connection).get_indexes("tasks"))
+        # Indexes needing an extension the server lacks are skipped by both.
+        available = set(await connection.scalars(text("SELECT name FROM pg_available_extensions")))
+
+    assert {
+        index["name"]: (index["column_names"], bool(index["dialect_options"].get("postgresql_where")))
+        for index in migrated
+    } == {
+        index.name: ([column.name for column in index.columns],
+                     index.dialect_options["postgresql"]["where"] is not None)
+        for index in Task.__table__.indexes
+        if index.info.get("extension") in available | {None}
+    }
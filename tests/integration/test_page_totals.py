@@ -0,0 +1,68 @@
+"""
+Page totals: counted in the statement that reads the page, whichever page it
+is, and estimated without running the query.
+"""
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.base.pagination import TotalMode
+from src.tasks.repository import TaskRepository
+from src.tasks.schemas import TaskStatus
+
+from tests.integration.conftest import capture_statements, requires_database
+
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+TASKS = 25
+
+
+@pytest_asyncio.fixture(loop_scope="package")
+async def totals_user(db_engine: AsyncEngine) -> AsyncGenerator[int, None]:
+    """A user owning ``TASKS`` tasks, one in five completed, removed again afterwards."""
+    async with db_engine.begin() as connection:
+        user_id = await connection.scalar(text(
+            "INSERT INTO users (first_name, last_name, username, password) "
+            "VALUES ('Totals', 'User', 'totals-user', '-') RETURNING id"
+        ))
+        await connection.execute(text(
+            "INSERT INTO tasks (title, description, status, user_id) "
+            "SELECT 'Task ' || n, '', CASE WHEN n % 5 = 0 THEN 'completed' ELSE 'new' END, :user_id "
+            "FROM generate_series(1, :tasks) AS n"
+        ), {"user_id": user_id, "tasks": TASKS})
+
+    yield user_id
+
+    async with db_engine.begin() as connection:
+        await connection.execute(text("DELETE FROM tasks WHERE user_id = :user_id"), {"user_id": user_id})
+        await connection.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+
+
+async def test_exact_total_in_one_statement(db_engine: AsyncEngine, totals_user: int):
+    async with AsyncSession(db_engine) as session:
+        repo = TaskRepository(session)
+        with capture_statements(db_engine) as statements:
+            page = await repo.get_user_tasks(user_id=totals_user, limit=10, offset=20, total=TotalMode.EXACT)
+        by_status = await repo.get_user_tasks(
+            user_id=totals_user, status=TaskStatus.COMPLETED.value, limit=2, total=TotalMode.EXACT)
+        past_end = await repo.get_user_tasks(user_id=totals_user, limit=10, offset=100, total=TotalMode.EXACT)
+
+    assert len(statements) == 1
+    assert [task.title for task in page] == [f"Task {n}" for n in range(21, TASKS + 1)]
+    assert page.total == TASKS
+    assert len(by_status) == 2 and by_status.total == TASKS // 5
+    assert past_end == [] and past_end.total == TASKS
+
+
+async def test_estimated_total(db_engine: AsyncEngine, totals_user: int):
+    async with AsyncSession(db_engine) as session:
+        await session.execute(text("ANALYZE tasks"))
+        page = await TaskRepository(session).get_user_tasks(
+            user_id=totals_user, limit=10, total=TotalMode.ESTIMATE)
+
+    assert len(page) == 10
+    assert page.total > 0
@@ -0,0 +1,94 @@
+"""
+Query-plan regression suite: every ``TaskRepository`` query must be served
+by an index on the seeded ``tasks`` table.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.base.pagination import TotalMode
+from src.tasks.repository import TaskRepository
+from src.tasks.schemas import TaskStatus
+
+from tests.integration.conftest import (
+    capture_statements, explain, requires_database, seq_scanned_relations)
+
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+AFTER = (datetime.now() - timedelta(hours=1), 1)
+# Writes target rows that do not exist so the seeded data stays untouched.
+MISSING_ID = 10 ** 9
+# Statements EXPLAIN accepts; DDL and TRUNCATE sent along the way are skipped.
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+async def drain(batches) -> None:
+    """Consumes a streamed query."""
+    async for _ in batches:
+        pass
+
+
+REPOSITORY_QUERIES = {
+    "get_task": lambda repo: repo.get_task(42),
+    "get_tasks_by_ids": lambda repo: repo.get_tasks_by_ids([42, 7, 1000]),
+    "get_task_fields": lambda repo: repo.get_task(42, fields=("id", "title", "updated_at")),
+    "get_task_updated_at": lambda repo: repo.get_task_updated_at(42),
+    "get_tasks": lambda repo: repo.get_tasks(limit=10, offset=100),
+    "get_tasks_after_cursor": lambda repo: repo.get_tasks(limit=10, after=AFTER),
+    "get_tasks_by_status": lambda repo: repo.get_tasks_by_status(
+        limit=10, offset=100, status=TaskStatus.IN_PROGRESS.value),
+    "get_tasks_by_status_after_cursor": lambda repo: repo.get_tasks_by_status(
+        limit=10, status=TaskStatus.NEW.value, after=AFTER),
+    "get_user_tasks": lambda repo: repo.get_user_tasks(user_id=7, limit=10, offset=20),
+    "get_user_tasks_by_status": lambda repo: repo.get_user_tasks(
+        user_id=7, status=TaskStatus.COMPLETED.value, limit=10, offset=20),
+    "get_user_tasks_after_cursor": lambda repo: repo.get_user_tasks(
+        user_id=7, limit=10, after=AFTER),
+    "get_user_tasks_with_total": lambda repo: repo.get_user_tasks(
+        user_id=7, status=TaskStatus.NEW.value, limit=10, offset=20, total=TotalMode.EXACT),
+    "get_tasks_with_estimated_total": lambda repo: repo.get_tasks(
+        limit=10, after=AFTER, total=TotalMode.ESTIMATE),
+    "get_user_task_versions": lambda repo: repo.get_user_tasks(
+        user_id=7, limit=10, after=AFTER, fields=("id", "created_at", "updated_at")),
+    "search_tasks": lambda repo: repo.search_tasks("42", limit=10),
+    "search_user_tasks_after_cursor": lambda repo: repo.search_tasks(
+        "task 42", user_id=3, status=TaskStatus.NEW.value, limit=10, after=(0.1, 10 ** 6)),
+    "suggest_tasks": lambda repo: repo.suggest_tasks(user_id=7, prefix="ask 4", limit=10),
+    "get_change_horizon": lambda repo: repo.get_change_horizon(),
+    "get_changed_tasks": lambda repo: repo.get_changed_tasks(
+        user_id=7, before=datetime.now(), after=AFTER, limit=10),
+    "get_task_tombstones": lambda repo: repo.get_task_tombstones(
+        user_id=7, before=datetime.now(), after=AFTER, limit=10),
+    "delete_task_tombstones": lambda repo: repo.delete_task_tombstones(before=AFTER[0]),
+    "stream_user_tasks": lambda repo: drain(repo.stream_user_tasks(user_id=7, batch_size=50)),
+    "get_task_owner": lambda repo: repo.get_task_owner(42),
+    "get_existing_task_ids": lambda repo: repo.get_existing_task_ids([1, 2, 3]),
+    "copy_tasks": lambda repo: repo.copy_tasks([]),
+    "update_task": lambda repo: repo.update_task(task_id=MISSING_ID, user_id=7, title="x"),
+    "delete_task": lambda repo: repo.delete_task(task_id=MISSING_ID, user_id=7),
+    "update_task_status": lambda repo: repo.update_task(
+        task_id=MISSING_ID, user_id=7, status=TaskStatus.COMPLETED.value),
+    "get_task_status_counts": lambda repo: repo.get_task_status_counts(user_id=7),
+    "get_task_daily_counts": lambda repo: repo.get_task_daily_counts(user_id=7, days=30),
+    "reconcile_user_task_counts": lambda repo: repo.reconcile_task_counts(user_id=7),
+    "update_tasks_status": lambda repo: repo.update_tasks_status(
+        user_id=7, status=TaskStatus.COMPLETED.value, ids=[MISSING_ID]),
+    "delete_tasks_by_status": lambda repo: repo.delete_tasks(
+        user_id=MISSING_ID, status_filter=TaskStatus.NEW.value),
+}
+
+
+@pytest.mark.parametrize("query", REPOSITORY_QUERIES.values(), ids=REPOSITORY_QUERIES.keys())
+async def test_repository_query_uses_index(db_session: AsyncSession, query):
+    """Fails when the planner falls back to a sequential scan of ``tasks``."""
+    with capture_statements(db_session.bind) as statements:
+        await query(TaskRepository(db_session))
+
+    assert statements
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(EXPLAINABLE):
+            continue
+        plan = await explain(db_session, statement, parameters)
+        assert "tasks" not in seq_scanned_relations(plan), statement
@@ -0,0 +1,77 @@
+"""
+Full-text search against the generated ``search_vector`` column, and title
+suggestions.
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.base.cache import LRUCache
+from src.tasks.models import Task
+from src.tasks.repository import TaskRepository
+from src.tasks.service import TaskService, next_search_cursor
+
+from tests.integration.conftest import requires_database
+
+
+SEARCH_USER_ID = 5
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+
+@pytest_asyncio.fixture(loop_scope="package")
+async def search_service(db_session: AsyncSession) -> TaskService:
+    """Service over a session holding a few searchable tasks (rolled back afterwards)."""
+    await db_session.execute(insert(Task), [
+        {"title": "Buy oat milk", "description": "From the corner shop", "status": "new", "user_id": SEARCH_USER_ID},
+        {"title": "Groceries", "description": "Oat milk, bread and eggs", "status": "new", "user_id": SEARCH_USER_ID},
+        {"title": "Groceries", "description": "Milk and bread", "status": "completed", "user_id": SEARCH_USER_ID},
+        {"title": "Call the bakery", "description": "Ask about bread", "status": "new", "user_id": SEARCH_USER_ID + 1},
+        {"title": "Pay 100% of the rent", "description": "", "status": "new", "user_id": SEARCH_USER_ID},
+    ])
+    return TaskService(TaskRepository(db_session), suggestion_cache=LRUCache(10))
+
+
+async def test_search_ranks_title_matches_first(search_service: TaskService):
+    results = await search_service.search_tasks("oat milk", user_id=SEARCH_USER_ID)
+
+    assert [result.title for result in results] == ["Buy oat milk", "Groceries"]
+    assert results[0].rank > results[1].rank
+    assert "<b>Oat</b> <b>milk</b>" in results[1].headline
+
+
+async def test_search_filters_and_operators(search_service: TaskService):
+    results = await search_service.search_tasks("bread -oat", user_id=SEARCH_USER_ID)
+    assert [result.description for result in results] == ["Milk and bread"]
+
+    results = await search_service.search_tasks("bread", user_id=SEARCH_USER_ID, status="new")
+    assert [result.description for result in results] == ["Oat milk, bread and eggs"]
+
+
+async def test_search_pages_with_cursor(search_service: TaskService):
+    first = await search_service.search_tasks("milk", user_id=SEARCH_USER_ID, elements_per_page=2)
+    cursor = next_search_cursor(first, 2)
+    second = await search_service.search_tasks(
+        "milk", user_id=SEARCH_USER_ID, elements_per_page=2, cursor=cursor)
+
+    assert len(first) == 2 and len(second) == 1
+    assert {task.id for task in first}.isdisjoint(task.id for task in second)
+
+
+async def test_suggest_lists_prefix_matches_first(search_service: TaskService):
+    suggestions = await search_service.suggest_tasks(SEARCH_USER_ID, "GRO")
+    assert [task.title for task in suggestions] == ["Groceries", "Groceries"]
+
+    suggestions = await search_service.suggest_tasks(SEARCH_USER_ID, "milk")
+    assert [task.title for task in suggestions] == ["Buy oat milk"]
+
+    suggestions = await search_service.suggest_tasks(SEARCH_USER_ID + 1, "ba")
+    assert [task.title for task in suggestions] == ["Call the bakery"]
+
+
+async def test_suggest_matches_wildcards_literally(search_service: TaskService):
+    suggestions = await search_service.suggest_tasks(SEARCH_USER_ID, "0%")
+    assert [task.title for task in suggestions] == ["Pay 100% of the rent"]
+
+    assert await search_service.suggest_tasks(SEARCH_USER_ID, "o_t") == []
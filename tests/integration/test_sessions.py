@@ -0,0 +1,119 @@
+"""
+Request sessions: reads run in autocommit, writes in a committed
+transaction, and no connection is checked out before the first query.
+"""
+from collections import Counter
+from typing import AsyncGenerator
+
+import httpx
+import pytest
+import pytest_asyncio
+from asyncpg.transaction import Transaction
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src import db
+from src.dependencies import get_current_user
+from src.main import app
+from src.tasks import TaskRepository
+from src.users import TokenData
+
+from tests.integration.conftest import capture_statements, requires_database
+
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+
+@pytest_asyncio.fixture(loop_scope="package")
+async def session_task(db_engine: AsyncEngine) -> AsyncGenerator[tuple[int, int], None]:
+    """A user owning one task, removed again afterwards."""
+    async with db_engine.begin() as connection:
+        user_id = await connection.scalar(text(
+            "INSERT INTO users (first_name, last_name, username, password) "
+            "VALUES ('Session', 'User', 'session-user', '-') RETURNING id"
+        ))
+        task_id = await connection.scalar(text(
+            "INSERT INTO tasks (title, description, status, user_id) "
+            "VALUES ('Session', '', 'new', :user_id) RETURNING id"
+        ), {"user_id": user_id})
+
+    yield user_id, task_id
+
+    async with db_engine.begin() as connection:
+        await connection.execute(text("DELETE FROM tasks WHERE user_id = :user_id"), {"user_id": user_id})
+        await connection.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+
+
+@pytest_asyncio.fixture(loop_scope="package")
+async def session_client(
+        db_engine: AsyncEngine, session_task: tuple[int, int], monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Client of the application, signed in as the owner of ``session_task``, with sessions on ``db_engine``."""
+    monkeypatch.setattr(db, "SessionLocal", sessionmaker(
+        bind=db_engine, class_=AsyncSession, expire_on_commit=False))
+    monkeypatch.setattr(db, "read_engine", db_engine.execution_options(isolation_level="AUTOCOMMIT"))
+    app.dependency_overrides[get_current_user] = lambda: TokenData(user_id=session_task[0], action="auth")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides = {}
+
+
+@pytest.fixture
+def round_trips(db_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch) -> Counter:
+    """Counts pool checkouts and the BEGINs and COMMITs asyncpg sends."""
+    counts = Counter()
+
+    def counted(name: str):
+        original = getattr(Transaction, name)
+
+        async def count(self) -> None:
+            counts[name] += 1
+            await original(self)
+
+        return count
+
+    def checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        counts["checkout"] += 1
+
+    for name in ("start", "commit"):
+        monkeypatch.setattr(Transaction, name, counted(name))
+    event.listen(db_engine.sync_engine.pool, "checkout", checkout)
+    yield counts
+    event.remove(db_engine.sync_engine.pool, "checkout", checkout)
+
+
+async def test_read_runs_in_autocommit(
+        db_engine: AsyncEngine, session_client: httpx.AsyncClient, round_trips: Counter):
+    with capture_statements(db_engine) as statements:
+        response = await session_client.get("/tasks/user/me", params={"fields": "id,title"})
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": response.json()[0]["id"], "title": "Session"}]
+    assert len(statements) == 1
+    assert round_trips == {"checkout": 1}
+
+
+async def test_write_commits(session_client: httpx.AsyncClient, session_task, round_trips: Counter):
+    response = await session_client.put("/tasks/update", json={"id": session_task[1], "title": "Renamed"})
+
+    assert response.status_code == 200
+    assert round_trips == {"checkout": 1, "start": 1, "commit": 1}
+
+
+async def test_rejected_request_checks_out_no_connection(
+        session_client: httpx.AsyncClient, round_trips: Counter):
+    response = await session_client.get("/tasks/user/me", params={"fields": "nope"})
+
+    assert response.status_code == 400
+    assert round_trips == {}
+
+
+async def test_detached_streams_from_autocommit_session(db_engine: AsyncEngine, session_task):
+    """Test that a server-side cursor still gets the transaction it needs."""
+    read_engine = db_engine.execution_options(isolation_level="AUTOCOMMIT")
+    async with AsyncSession(read_engine) as session:
+        async with TaskRepository(session).detached() as repository:
+            batches = [rows async for rows in repository.stream_user_tasks(session_task[0], batch_size=10)]
+
+    assert [row["title"] for rows in batches for row in rows] == ["Session"]
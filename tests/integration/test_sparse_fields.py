@@ -0,0 +1,60 @@
+"""
+Sparse fieldsets: tasks read with only some columns, through the ORM and
+through column queries.
+"""
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.base.cache import MemoryCache
+from src.tasks.repository import TaskRepository
+from src.tasks.service import TaskService, task_query_fields
+
+from tests.integration.conftest import capture_statements, requires_database
+
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+
+@pytest_asyncio.fixture(loop_scope="package")
+async def sparse_task(db_engine: AsyncEngine) -> AsyncGenerator[tuple[int, int], None]:
+    """A user owning one task with a long description, removed again afterwards."""
+    async with db_engine.begin() as connection:
+        user_id = await connection.scalar(text(
+            "INSERT INTO users (first_name, last_name, username, password) "
+            "VALUES ('Sparse', 'User', 'sparse-user', '-') RETURNING id"
+        ))
+        task_id = await connection.scalar(text(
+            "INSERT INTO tasks (title, description, status, user_id) "
+            "VALUES ('Sparse', repeat('x', 100000), 'new', :user_id) RETURNING id"
+        ), {"user_id": user_id})
+
+    yield user_id, task_id
+
+    async with db_engine.begin() as connection:
+        await connection.execute(text("DELETE FROM tasks WHERE user_id = :user_id"), {"user_id": user_id})
+        await connection.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+
+
+async def test_sparse_task_skips_description(db_engine: AsyncEngine, sparse_task):
+    user_id, task_id = sparse_task
+    fields = task_query_fields(("id", "title", "status"))
+
+    async with AsyncSession(db_engine) as session:
+        service = TaskService(
+            TaskRepository(session),
+            task_cache=MemoryCache(maxsize=10, max_bytes=1 << 20, ttl=60),
+            list_cache=MemoryCache(maxsize=10, max_bytes=1 << 20, ttl=60),
+        )
+        with capture_statements(db_engine) as statements:
+            task = await service.get_task(task_id, fields=fields)
+            page = await service.get_user_tasks(user_id, fields=fields)
+
+    assert (task.id, task.title, task.status) == (task_id, "Sparse", "new")
+    assert [(row.id, row.title) for row in page] == [(task_id, "Sparse")]
+    assert "description" not in task.model_fields_set | page[0].model_fields_set
+    assert len(statements) == 2
+    assert all("description" not in statement for statement, _ in statements)
@@ -0,0 +1,112 @@
+"""
+Task stats: the counters follow every kind of write, concurrent ones
+included, and reconciliation finds and repairs drift.
+"""
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.tasks.repository import TaskRepository
+from src.tasks.schemas import (
+    BulkCreateTaskSchema, BulkTaskSelectionSchema, BulkUpdateStatusSchema, CreateTaskSchema,
+    TaskStatus, UpdateTaskSchema,
+)
+from src.tasks.service import TaskService
+
+from tests.integration.conftest import requires_database
+
+
+pytestmark = [requires_database, pytest.mark.asyncio(loop_scope="package")]
+
+
+@pytest_asyncio.fixture(loop_scope="package")
+async def stats_user(db_engine: AsyncEngine) -> AsyncGenerator[int, None]:
+    """A user without tasks, removed again (with its tasks) afterwards."""
+    async with db_engine.begin() as connection:
+        user_id = await connection.scalar(text(
+            "INSERT INTO users (first_name, last_name, username, password) "
+            "VALUES ('Stats', 'User', 'stats-user', '-') RETURNING id"
+        ))
+
+    yield user_id
+
+    async with db_engine.begin() as connection:
+        await connection.execute(text("DELETE FROM tasks WHERE user_id = :user_id"), {"user_id": user_id})
+        await connection.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+
+
+async def run(db_engine: AsyncEngine, action):
+    """Runs ``action`` on a service over a session of its own, like a request."""
+    async with AsyncSession(db_engine, expire_on_commit=False) as session:
+        result = await action(TaskService(TaskRepository(session)))
+        await session.commit()
+        return result
+
+
+async def records(count: int, status: str) -> AsyncGenerator[dict, None]:
+    for n in range(count):
+        yield {"title": f"Imported {n}", "description": "", "status": status}
+
+
+async def test_stats_follow_writes(db_engine: AsyncEngine, stats_user: int):
+    user_id = stats_user
+    task = await run(db_engine, lambda service: service.create_task(
+        CreateTaskSchema(title="One", description="", status=TaskStatus.NEW), user_id))
+    await run(db_engine, lambda service: service.create_tasks(BulkCreateTaskSchema(items=[
+        {"title": "Two", "description": "", "status": "new"},
+        {"title": "Three", "description": "", "status": "completed"}]), user_id))
+    await run(db_engine, lambda service: service.import_tasks(records(3, "in_progress"), user_id))
+    await run(db_engine, lambda service: service.update_task(
+        UpdateTaskSchema(id=task.id, status=TaskStatus.COMPLETED), user_id))
+    await run(db_engine, lambda service: service.update_tasks_status(BulkUpdateStatusSchema(
+        status_filter=TaskStatus.IN_PROGRESS, status=TaskStatus.NEW), user_id))
+    await run(db_engine, lambda service: service.delete_tasks(
+        BulkTaskSelectionSchema(ids=[task.id]), user_id))
+
+    stats = await run(db_engine, lambda service: service.get_task_stats(user_id, days=1))
+    assert stats.by_status == {TaskStatus.NEW: 4, TaskStatus.IN_PROGRESS: 0, TaskStatus.COMPLETED: 1}
+    assert stats.total == 5
+    assert [(day.created, day.completed) for day in stats.daily] == [(5, 1)]
+    drift = await run(db_engine, lambda service: service.reconcile_task_stats(user_id))
+    assert drift == {"task_status_counts": [], "task_daily_counts": []}
+
+
+async def test_stats_survive_concurrent_status_changes(db_engine: AsyncEngine, stats_user: int):
+    """Writes racing on the same tasks leave the counters exact."""
+    user_id = stats_user
+    created = await run(db_engine, lambda service: service.create_tasks(BulkCreateTaskSchema(
+        items=[{"title": f"Task {n}", "description": "", "status": "new"} for n in range(10)]), user_id))
+    ids = [task.id for task in created.created]
+
+    await asyncio.gather(*(
+        run(db_engine, lambda service, status=status: service.update_tasks_status(
+            BulkUpdateStatusSchema(ids=ids, status=status), user_id))
+        for status in list(TaskStatus) * 5
+    ))
+
+    drift = await run(db_engine, lambda service: service.reconcile_task_stats(user_id))
+    assert drift == {"task_status_counts": [], "task_daily_counts": []}
+
+
+async def test_reconcile_repairs_drift(db_engine: AsyncEngine, stats_user: int):
+    """Tasks written behind the counters' back are found and counted."""
+    user_id = stats_user
+    async with db_engine.begin() as connection:
+        await connection.execute(text(
+            "INSERT INTO tasks (title, status, user_id) "
+            "SELECT 'Raw ' || n, 'completed', :user_id FROM generate_series(1, 3) AS n"
+        ), {"user_id": user_id})
+
+    drift = await run(db_engine, lambda service: service.reconcile_task_stats(user_id))
+    assert [dict(row) for row in drift["task_status_counts"]] == [
+        {"user_id": user_id, "status": "completed", "stored_count": 0, "count": 3}]
+    assert [(row["stored_completed"], row["completed"]) for row in drift["task_daily_counts"]] == [(0, 3)]
+
+    stats = await run(db_engine, lambda service: service.get_task_stats(user_id))
+    assert stats.by_status[TaskStatus.COMPLETED] == 3
+    assert await run(db_engine, lambda service: service.reconcile_task_stats(user_id)) == {
+        "task_status_counts": [], "task_daily_counts": []}
@@ -0,0 +1,23 @@
+from datetime import date, datetime
+
+from src.tasks.repository import task_counts_delta
+
+from tests.conftest import TEST_USER_ID
+
+
+def test_task_counts_delta():
+    """Test that changes are netted per counter row, and rows left unchanged dropped."""
+    created_at, completed_at = datetime(2026, 1, 1, 9), datetime(2026, 1, 3, 9)
+    status_rows, day_rows = task_counts_delta([
+        (TEST_USER_ID, None, ("new", created_at, None), 2),
+        (TEST_USER_ID, ("new", created_at, None), ("completed", created_at, completed_at), 1),
+        (TEST_USER_ID, ("completed", created_at, None), None, 1),
+    ])
+
+    assert status_rows == [
+        {"user_id": TEST_USER_ID, "status": "new", "count": 1},
+    ]
+    assert day_rows == [
+        {"user_id": TEST_USER_ID, "day": date(2026, 1, 1), "created": 1, "completed": -1},
+        {"user_id": TEST_USER_ID, "day": date(2026, 1, 3), "created": 0, "completed": 1},
+    ]
@@ -0,0 +1,42 @@
+import pytest
+
+from src.tasks.importer import iter_csv_records, iter_lines, iter_ndjson_records
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def chunked(data: bytes, size: int):
+    """Yields ``data`` in chunks of ``size`` bytes."""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def test_iter_lines_across_chunks():
+    """Test that lines and multi-byte characters split over chunks are rejoined."""
+    data = "first\nsécond\nlast".encode()
+
+    lines = [line async for line in iter_lines(chunked(data, 3))]
+
+    assert lines == ["first\n", "sécond\n", "last"]
+
+
+async def test_iter_ndjson_records():
+    """Test that blank lines are skipped and invalid JSON is passed on as text."""
+    data = b'{"title": "a", "description": "b"}\n\n{broken\n{"title": "c"}\n'
+
+    records = [record async for record in iter_ndjson_records(chunked(data, 5))]
+
+    assert records == [{"title": "a", "description": "b"}, "{broken", {"title": "c"}]
+
+
+async def test_iter_csv_records_with_quoted_newlines():
+    """Test that quoted fields spanning lines stay in one record."""
+    data = b'title,description,status\r\n"Multi","line\none, ""quoted""",new\r\nPlain,text,completed\r\n'
+
+    records = [record async for record in iter_csv_records(chunked(data, 4))]
+
+    assert records == [
+        {"title": "Multi", "description": 'line\none, "quoted"', "status": "new"},
+        {"title": "Plain", "description": "text", "status": "completed"},
+    ]
@@ -0,0 +1,19 @@
+import pytest
+
+from src.base.exceptions import BadRequestException
+from src.tasks.service import parse_task_fields, parse_task_ids, task_query_fields
+
+
+def test_parse_task_fields():
+    assert parse_task_fields(None) is None
+    assert parse_task_fields("title, id,title") == ("title", "id")
+    assert task_query_fields(("title", "id")) == ("title", "id", "created_at", "updated_at")
+    for invalid in ("", " , ", "title,secret"):
+        with pytest.raises(BadRequestException):
+            parse_task_fields(invalid)
+
+
+def test_parse_task_ids():
+    assert parse_task_ids("3, 1,,2") == [3, 1, 2]
+    with pytest.raises(BadRequestException):
+        parse_task_ids("1,two")
@@ -1,11 +1,16 @@
 import pytest
-from unittest.mock import AsyncMock
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
-from sqlalchemy.sql import Select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Delete, Insert, Select, Update
 
+from src.base.pagination import TotalMode
+from src.base.repository import DEFERRED, Deferred
 from src.tasks.repository import TaskRepository
 from src.tasks.models import Task as TaskModel
-from src.tasks.schemas import TaskStatus
+from src.tasks.schemas import TaskResponseSchema, TaskStatus
 
 from tests.conftest import TEST_USER_ID
 
@@ -13,6 +18,13 @@ from tests.conftest import TEST_USER_ID
 pytestmark = pytest.mark.asyncio
 
 
+def deleted_row(task_id: int, status: str) -> SimpleNamespace:
+    """A row of the tasks a delete removed, as its statement returns them."""
+    return SimpleNamespace(
+        id=task_id, user_id=TEST_USER_ID, status=status,
+        created_at=datetime(2026, 1, 1, 9), completed_at=None)
+
+
 async def test_repo_get_task_found(task_repository: TaskRepository, mock_session: AsyncMock, mock_task: TaskModel):
     task_id = mock_task.id
     mock_session.execute.return_value.scalars.return_value.first.return_value = mock_task
@@ -25,13 +37,66 @@ async def test_repo_get_task_found(task_repository: TaskRepository, mock_session
         call_args.compile(compile_kwargs={"literal_binds": True}))
 
 
-async def test_repo_get_tasks(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_list: list):
+async def test_repo_get_task_fields(task_repository: TaskRepository, mock_session: AsyncMock, mock_task: TaskModel):
+    """Test that only the requested columns of a task are loaded."""
+    mock_session.execute.return_value.scalars.return_value.first.return_value = mock_task
+
+    await task_repository.get_task(mock_task.id, fields=("id", "title", "updated_at"))
+
+    compiled = str(mock_session.execute.call_args[0][0].compile(compile_kwargs={"literal_binds": True}))
+    assert compiled.startswith("SELECT tasks.title, tasks.updated_at, tasks.id \nFROM tasks \nWHERE")
+
+
+async def test_repo_after_commit(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test that callbacks run right away, or wait for the batch sharing the session."""
+    on_commit, on_end = AsyncMock(), AsyncMock()
+    await task_repository.after_commit(on_commit)
+    await task_repository.after_transaction(on_end)
+    on_commit.assert_awaited_once()
+    on_end.assert_awaited_once()
+
+    on_commit.reset_mock()
+    on_end.reset_mock()
+    mock_session.info = {DEFERRED: Deferred()}
+    await task_repository.after_commit(on_commit)
+    await task_repository.after_transaction(on_end)
+    on_commit.assert_not_awaited()
+    on_end.assert_not_awaited()
+    assert mock_session.info[DEFERRED] == Deferred(on_commit=[on_commit], on_end=[on_end])
+
+
+async def test_repo_commit_in_batch_flushes(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test that a batch's session is only flushed, leaving the batch to end the operation."""
+    await task_repository.commit()
+    mock_session.commit.assert_awaited_once()
+
+    mock_session.commit.reset_mock()
+    mock_session.info = {DEFERRED: Deferred()}
+    await task_repository.commit()
+    mock_session.flush.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
+
+
+async def test_repo_get_tasks_by_ids(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_rows: list):
+    """Test that tasks are read by ID with one ``= ANY`` query."""
+    mock_session.execute.return_value.mappings.return_value.all.return_value = mock_task_rows
+
+    result = await task_repository.get_tasks_by_ids([3, 1, 2])
+
+    assert [task.id for task in result] == [row["id"] for row in mock_task_rows]
+    query = mock_session.execute.call_args[0][0]
+    compiled = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "WHERE tasks.id = ANY (ARRAY[3, 1, 2])" in compiled
+    mock_session.execute.assert_awaited_once()
+
+
+async def test_repo_get_tasks(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_rows: list):
     """Test getting all tasks with limit and offset."""
     limit = 5
     offset = 10
-    mock_session.execute.return_value.scalars.return_value.all.return_value = mock_task_list
+    mock_session.execute.return_value.mappings.return_value.all.return_value = mock_task_rows
     result = await task_repository.get_tasks(limit=limit, offset=offset)
-    assert result == mock_task_list
+    assert [task.model_dump() for task in result] == mock_task_rows
     mock_session.execute.assert_awaited_once()
     call_args = mock_session.execute.call_args[0][0]
     assert isinstance(call_args, Select)
@@ -39,16 +104,16 @@ async def test_repo_get_tasks(task_repository: TaskRepository, mock_session: Asy
     assert call_args._offset_clause.value == offset
 
 
-async def test_repo_get_tasks_by_status(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_list: list):
+async def test_repo_get_tasks_by_status(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_rows: list):
     """Test getting tasks by status."""
     limit = 20
     offset = 0
     status_filter = TaskStatus.NEW.value
-    expected_tasks = [t for t in mock_task_list if t.status == status_filter]
-    mock_session.execute.return_value.scalars.return_value.all.return_value = expected_tasks
+    expected_rows = [t for t in mock_task_rows if t["status"] == status_filter]
+    mock_session.execute.return_value.mappings.return_value.all.return_value = expected_rows
 
     result = await task_repository.get_tasks_by_status(limit=limit, offset=offset, status=status_filter)
-    assert result == expected_tasks
+    assert [task.id for task in result] == [t["id"] for t in expected_rows]
     mock_session.execute.assert_awaited_once()
     call_args = mock_session.execute.call_args[0][0]
     assert isinstance(call_args, Select)
@@ -59,16 +124,16 @@ async def test_repo_get_tasks_by_status(task_repository: TaskRepository, mock_se
 
 
 # --- Test get_user_tasks ---
-async def test_repo_get_user_tasks(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_list: list):
+async def test_repo_get_user_tasks(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_rows: list):
     """Test getting tasks for a specific user."""
     user_id = TEST_USER_ID
     limit = 15
     offset = 5
-    expected_tasks = [t for t in mock_task_list if t.user_id == user_id]
-    mock_session.execute.return_value.scalars.return_value.all.return_value = expected_tasks
+    expected_rows = [t for t in mock_task_rows if t["user_id"] == user_id]
+    mock_session.execute.return_value.mappings.return_value.all.return_value = expected_rows
 
     result = await task_repository.get_user_tasks(user_id=user_id, limit=limit, offset=offset)
-    assert result == expected_tasks
+    assert [task.id for task in result] == [t["id"] for t in expected_rows]
     mock_session.execute.assert_awaited_once()
     call_args = mock_session.execute.call_args[0][0]
     assert isinstance(call_args, Select)
@@ -79,6 +144,172 @@ async def test_repo_get_user_tasks(task_repository: TaskRepository, mock_session
         call_args.compile(compile_kwargs={"literal_binds": True}))
 
 
+async def test_repo_get_user_tasks_with_total(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_rows: list):
+    """Test that the exact total is counted in the statement of the page."""
+    rows = [{**row, "total": 42, "position": n} for n, row in enumerate(mock_task_rows, 1)]
+    mock_session.execute.return_value.mappings.return_value.all.return_value = rows
+
+    result = await task_repository.get_user_tasks(user_id=TEST_USER_ID, limit=3, total=TotalMode.EXACT)
+
+    assert [task.model_dump() for task in result] == mock_task_rows
+    assert result.total == 42
+    mock_session.execute.assert_awaited_once()
+    compiled = str(mock_session.execute.call_args[0][0].compile(compile_kwargs={"literal_binds": True}))
+    assert compiled.startswith("SELECT total.total, page.")
+    assert f"FROM (SELECT count(*) AS total \nFROM tasks \nWHERE tasks.user_id = {TEST_USER_ID}) AS total" in compiled
+    assert "LEFT OUTER JOIN LATERAL" in compiled
+    assert "row_number() OVER (ORDER BY tasks.created_at, tasks.id) AS position" in compiled
+    assert compiled.endswith("ON true ORDER BY page.position")
+
+
+async def test_repo_get_user_tasks_with_estimated_total_past_end(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test that a page past the end still carries the planner's estimate."""
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [
+        {"total": 40, "id": None, "title": None, "position": None}]
+
+    result = await task_repository.get_user_tasks(
+        user_id=TEST_USER_ID, status=TaskStatus.NEW.value, offset=100, fields=("id", "title"),
+        total=TotalMode.ESTIMATE)
+
+    assert result == [] and result.total == 40
+    compiled = str(mock_session.execute.call_args[0][0].compile(compile_kwargs={"literal_binds": True}))
+    assert (
+        "(SELECT count_estimate('SELECT tasks.id, tasks.title \nFROM tasks \n"
+        f"WHERE tasks.user_id = {TEST_USER_ID} AND tasks.status = ''new''') AS total) AS total"
+    ) in compiled
+
+
+async def test_repo_get_user_tasks_after_cursor(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_rows: list):
+    """Test keyset pagination of a user's tasks."""
+    after = (datetime(2025, 4, 30, 8, 57), 101)
+    mock_session.execute.return_value.mappings.return_value.all.return_value = mock_task_rows
+
+    await task_repository.get_user_tasks(user_id=TEST_USER_ID, status=TaskStatus.NEW.value, limit=10, after=after)
+
+    call_args = mock_session.execute.call_args[0][0]
+    compiled = str(call_args.compile(compile_kwargs={"literal_binds": True}))
+    assert "(tasks.created_at, tasks.id) > ('2025-04-30 08:57:00', 101)" in compiled
+    assert f"tasks.status = '{TaskStatus.NEW.value}'" in compiled
+    assert "ORDER BY tasks.created_at, tasks.id" in compiled
+    assert call_args._offset_clause.value == 0
+
+
+async def test_repo_list_selects_columns_not_entities(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_rows: list):
+    """Test that list reads bypass the ORM and build responses from rows."""
+    mock_session.execute.return_value.mappings.return_value.all.return_value = mock_task_rows
+
+    result = await task_repository.get_user_tasks(user_id=TEST_USER_ID)
+
+    call_args = mock_session.execute.call_args[0][0]
+    assert [c["name"] for c in call_args.column_descriptions] == list(TaskResponseSchema.model_fields)
+    assert all(isinstance(task, TaskResponseSchema) for task in result)
+    assert result[0].status is TaskStatus.NEW
+    mock_session.execute.return_value.scalars.assert_not_called()
+
+
+async def test_repo_stream_user_tasks(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_rows: list):
+    """Test that exports stream batches through a server-side cursor."""
+    async def partitions():
+        yield mock_task_rows[:2]
+        yield mock_task_rows[2:]
+    mock_session.stream.return_value.mappings = MagicMock()
+    mock_session.stream.return_value.mappings.return_value.partitions.return_value = partitions()
+
+    batches = [rows async for rows in task_repository.stream_user_tasks(
+        user_id=TEST_USER_ID, status=TaskStatus.NEW.value, batch_size=2)]
+
+    assert batches == [mock_task_rows[:2], mock_task_rows[2:]]
+    call_args = mock_session.stream.call_args[0][0]
+    compiled = str(call_args.compile(compile_kwargs={"literal_binds": True}))
+    assert f"tasks.user_id = {TEST_USER_ID}" in compiled
+    assert "ORDER BY tasks.created_at, tasks.id" in compiled
+    assert call_args.get_execution_options()["yield_per"] == 2
+    mock_session.execute.assert_not_called()
+
+
+async def test_repo_copy_tasks(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test that imports COPY into the staging table and merge with one INSERT."""
+    records = [("Imported", "Desc", "new", TEST_USER_ID)]
+    driver_connection = mock_session.connection.return_value.get_raw_connection.return_value.driver_connection
+    mock_session.execute.return_value.rowcount = 1
+    mock_session.execute.return_value.all = MagicMock(
+        return_value=[(TEST_USER_ID, "new", datetime(2026, 1, 1, 9), 1)])
+
+    inserted = await task_repository.copy_tasks(records)
+
+    assert inserted == 1
+    driver_connection.copy_records_to_table.assert_awaited_once_with(
+        "task_import_staging", records=records, columns=("title", "description", "status", "user_id"))
+    statements = [str(call.args[0]) for call in mock_session.execute.await_args_list]
+    assert statements[0].startswith("\nCREATE TEMPORARY TABLE IF NOT EXISTS task_import_staging")
+    assert statements[1].startswith("INSERT INTO tasks (title, description, status, user_id")
+    assert "FROM task_import_staging" in statements[1]
+    # The counters are bumped from the staged rows, grouped.
+    assert "GROUP BY task_import_staging.user_id, task_import_staging.status" in statements[2]
+    assert "INSERT INTO task_daily_counts" in statements[3]
+    assert statements[4] == "TRUNCATE task_import_staging"
+    mock_session.commit.assert_not_called()
+
+
+async def test_repo_search_tasks(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_rows: list):
+    """Test that search matches the tsvector, ranks, filters and pages by (rank, id)."""
+    rows = [{**row, "rank": 0.5, "headline": "<b>Task</b> 1"} for row in mock_task_rows]
+    mock_session.execute.return_value.mappings.return_value.all.return_value = rows
+
+    result = await task_repository.search_tasks(
+        "task", user_id=TEST_USER_ID, status=TaskStatus.NEW.value, limit=2, after=(0.75, 103))
+
+    compiled = mock_session.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+    assert "tasks.search_vector @@ websearch_to_tsquery(" in sql
+    assert "tasks.user_id = %(user_id_1)s" in sql
+    assert "(ts_rank_cd(tasks.search_vector, websearch_to_tsquery(" in sql
+    assert ", tasks.id) < (%(param_1)s, %(param_2)s)" in sql
+    assert sql.endswith("DESC, tasks.id DESC LIMIT %(param_3)s")
+    assert "task" in compiled.params.values()
+    assert (compiled.params["param_1"], compiled.params["param_2"]) == (0.75, 103)
+    assert [(task.id, task.rank, task.headline) for task in result] == [
+        (row["id"], 0.5, "<b>Task</b> 1") for row in rows]
+
+
+async def test_repo_suggest_tasks(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test that suggestions escape LIKE wildcards and list prefix matches first."""
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [
+        {"id": 1, "title": "100% done", "status": "new"}]
+
+    result = await task_repository.suggest_tasks(user_id=TEST_USER_ID, prefix="100%", limit=5)
+
+    compiled = mock_session.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+    assert "tasks.user_id = %(user_id_1)s AND tasks.title ILIKE %(title_1)s" in sql
+    assert "ORDER BY tasks.title ILIKE %(title_2)s DESC, length(tasks.title), tasks.id DESC" in sql
+    assert (compiled.params["title_1"], compiled.params["title_2"]) == ("%100\\%%", "100\\%%")
+    assert [(task.id, task.title, task.status) for task in result] == [(1, "100% done", TaskStatus.NEW)]
+
+
+async def test_repo_get_task_updated_at(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test that only the task's updated_at is selected."""
+    mock_session.scalar.return_value = datetime(2025, 4, 30, 8, 57)
+
+    result = await task_repository.get_task_updated_at(101)
+
+    statement = mock_session.scalar.call_args[0][0]
+    assert [column.name for column in statement.selected_columns] == ["updated_at"]
+    assert result == datetime(2025, 4, 30, 8, 57)
+
+
+async def test_repo_list_selects_requested_fields(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test that ``fields`` narrows the selected columns."""
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [
+        {"id": 101, "updated_at": datetime(2025, 4, 30, 8, 57)}]
+
+    result = await task_repository.get_user_tasks(user_id=TEST_USER_ID, fields=("id", "updated_at"))
+
+    statement = mock_session.execute.call_args[0][0]
+    assert [column.name for column in statement.selected_columns] == ["id", "updated_at"]
+    assert (result[0].id, result[0].updated_at) == (101, datetime(2025, 4, 30, 8, 57))
+
+
 async def test_repo_get_task_not_found(task_repository: TaskRepository, mock_session: AsyncMock):
     """Test getting task by ID when not found."""
     task_id = 999
@@ -94,32 +325,254 @@ async def test_repo_add_task(task_repository: TaskRepository, mock_session: Asyn
     """Test adding a task."""
     new_task = TaskModel(
         title="Repo Add", description="Testing add", status="new")
+    new_task.user_id = TEST_USER_ID
     expected_id = 555
 
-    async def refresh_side_effect(obj):
-        obj.id = expected_id
-    mock_session.refresh.side_effect = refresh_side_effect
+    async def flush_side_effect():
+        # The INSERT ... RETURNING issued on flush fills in generated columns.
+        new_task.id = expected_id
+        new_task.created_at = datetime(2026, 1, 1, 9)
+    mock_session.flush.side_effect = flush_side_effect
 
     result = await task_repository.add_task(new_task)
 
     mock_session.add.assert_called_once_with(new_task)
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(new_task)
+    mock_session.refresh.assert_not_called()
     assert result == new_task
     assert result.id == expected_id
+    # The counters are bumped in the same transaction.
+    compiled = str(mock_session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("WITH status_counts AS \n(INSERT INTO task_status_counts")
+    assert "ON CONFLICT (user_id, day) DO UPDATE SET created = (task_daily_counts.created" in compiled
+
+
+async def test_repo_add_tasks(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_list: list):
+    """Test adding many tasks with one INSERT ... RETURNING."""
+    values = [{"title": t.title, "description": t.description, "status": t.status, "user_id": t.user_id}
+              for t in mock_task_list]
+    for task in mock_task_list:
+        task.created_at = datetime(2026, 1, 1, 9)
+    mock_session.execute.return_value.scalars.return_value.all.return_value = mock_task_list
+
+    result = await task_repository.add_tasks(values)
+
+    assert result == mock_task_list
+    assert mock_session.execute.await_count == 2
+    statement, params = mock_session.execute.await_args_list[0].args
+    assert isinstance(statement, Insert)
+    assert params == values
+    mock_session.commit.assert_awaited_once()
+
+
+async def test_repo_add_tasks_empty(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test that adding no tasks does not touch the database."""
+    assert await task_repository.add_tasks([]) == []
+    mock_session.execute.assert_not_called()
+
+async def test_repo_get_task_owner(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test getting the owner of a task."""
+    mock_session.execute.return_value.scalars.return_value.first.return_value = TEST_USER_ID
+
+    result = await task_repository.get_task_owner(101)
+
+    assert result == TEST_USER_ID
+    call_args = mock_session.execute.call_args[0][0]
+    assert "SELECT tasks.user_id" in str(call_args)
 
 
-async def test_repo_update_task(task_repository: TaskRepository, mock_session: AsyncMock):
-    """Test updating a task (commit only)."""
-    await task_repository.update_task()
+async def test_repo_update_task(task_repository: TaskRepository, mock_session: AsyncMock, mock_task: TaskModel):
+    """Test updating a task with a single conditional UPDATE ... RETURNING."""
+    mock_session.execute.return_value.scalars.return_value.first.return_value = mock_task
+
+    result = await task_repository.update_task(
+        task_id=mock_task.id, user_id=TEST_USER_ID, title="Renamed")
+
+    assert result == mock_task
+    mock_session.execute.assert_awaited_once()
+    call_args = mock_session.execute.call_args[0][0]
+    assert isinstance(call_args, Update)
+    compiled = str(call_args.compile(compile_kwargs={"literal_binds": True}))
+    assert "SET title='Renamed', updated_at=now()" in compiled
+    assert f"WHERE tasks.id = {mock_task.id} AND tasks.user_id = {TEST_USER_ID}" in compiled
+    assert "RETURNING" in compiled
     mock_session.commit.assert_awaited_once()
 
 
+async def test_repo_update_task_no_match(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test updating a task that is missing or owned by someone else."""
+    mock_session.execute.return_value.scalars.return_value.first.return_value = None
+
+    result = await task_repository.update_task(task_id=999, user_id=TEST_USER_ID, title="Renamed")
+
+    assert result is None
+
+
 async def test_repo_delete_task(task_repository: TaskRepository, mock_session: AsyncMock, mock_task: TaskModel):
-    """Test deleting a task."""
-    task_to_delete = mock_task
+    """Test deleting a task and leaving its tombstone in a single statement."""
+    mock_session.execute.return_value.all = MagicMock(return_value=[
+        deleted_row(mock_task.id, "completed")])
+
+    result = await task_repository.delete_task(task_id=mock_task.id, user_id=TEST_USER_ID)
+
+    assert result == mock_task.id
+    call_args = mock_session.execute.await_args_list[0].args[0]
+    assert isinstance(call_args, Select)
+    compiled = str(call_args.compile(compile_kwargs={"literal_binds": True}))
+    assert compiled.startswith("WITH deleted_tasks AS \n(DELETE FROM tasks")
+    assert f"WHERE tasks.id = {mock_task.id} AND tasks.user_id = {TEST_USER_ID}" in compiled
+    assert "tombstones AS \n(INSERT INTO task_tombstones (id, user_id)" in compiled
+    assert "RETURNING tasks.id, tasks.user_id, tasks.status, tasks.created_at, tasks.completed_at" in compiled
+    assert mock_session.execute.await_count == 2
+    mock_session.delete.assert_not_called()
+    mock_session.commit.assert_awaited_once()
+
+
+async def test_repo_update_tasks_status_by_ids(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test the set-based status update of selected tasks."""
+    created_at = datetime(2026, 1, 1, 9)
+    mock_session.execute.return_value.all = MagicMock(return_value=[
+        SimpleNamespace(id=task_id, created_at=created_at, completed_at=datetime(2026, 1, 2, 9),
+                        previous_status="new", previous_completed_at=None)
+        for task_id in (101, 102)
+    ])
+
+    result = await task_repository.update_tasks_status(
+        user_id=TEST_USER_ID, status=TaskStatus.COMPLETED.value, ids=[101, 102, 103])
+
+    assert result == [101, 102]
+    call_args = mock_session.execute.await_args_list[0].args[0]
+    assert isinstance(call_args, Update)
+    compiled = str(call_args.compile(dialect=postgresql.dialect()))
+    assert "WHERE tasks.user_id = %(user_id_1)s AND tasks.id = ANY (%(param_1)s::INTEGER[]) FOR UPDATE" in compiled
+    assert "completed_at=CASE WHEN (tasks.status = %(status_1)s) THEN tasks.completed_at ELSE now() END" in compiled
+    assert "RETURNING tasks.id, tasks.created_at, tasks.completed_at, previous.status" in compiled
+    counts = str(mock_session.execute.await_args_list[1].args[0].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert f"VALUES ({TEST_USER_ID}, 'completed', 2), ({TEST_USER_ID}, 'new', -2)" in counts
+    assert f"VALUES ({TEST_USER_ID}, '2026-01-02', 0, 2)" in counts
+    mock_session.commit.assert_awaited_once()
+
+
+async def test_repo_delete_tasks_by_status(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test the set-based delete of tasks matching a status."""
+    mock_session.execute.return_value.all = MagicMock(return_value=[deleted_row(101, "new")])
+
+    result = await task_repository.delete_tasks(user_id=TEST_USER_ID, status_filter=TaskStatus.NEW.value)
+
+    assert result == [101]
+    call_args = mock_session.execute.await_args_list[0].args[0]
+    assert isinstance(call_args, Select)
+    compiled = str(call_args.compile(compile_kwargs={"literal_binds": True}))
+    assert f"WHERE tasks.user_id = {TEST_USER_ID} AND tasks.status = 'new'" in compiled
+    assert "INSERT INTO task_tombstones (id, user_id)" in compiled
+    mock_session.commit.assert_awaited_once()
+
+
+async def test_repo_get_changed_tasks(task_repository: TaskRepository, mock_session: AsyncMock, mock_task_rows: list):
+    """Test the change feed query orders by the ``(updated_at, id)`` keyset below the horizon."""
+    before = datetime(2026, 1, 2)
+    mock_session.execute.return_value.mappings.return_value.all.return_value = mock_task_rows
+
+    result = await task_repository.get_changed_tasks(
+        user_id=TEST_USER_ID, before=before, after=(datetime(2026, 1, 1), 5), limit=3)
+
+    assert [task.id for task in result] == [t["id"] for t in mock_task_rows]
+    call_args = mock_session.execute.call_args[0][0]
+    compiled = str(call_args.compile(compile_kwargs={"literal_binds": True}))
+    assert f"WHERE tasks.user_id = {TEST_USER_ID} AND tasks.updated_at < '2026-01-02 00:00:00'" in compiled
+    assert "(tasks.updated_at, tasks.id) > ('2026-01-01 00:00:00', 5)" in compiled
+    assert "ORDER BY tasks.updated_at, tasks.id" in compiled
+    assert call_args._limit_clause.value == 3
+
+
+async def test_repo_get_task_tombstones(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test reading tombstones without a keyset reads from the start."""
+    mock_session.execute.return_value.all = MagicMock(return_value=[(7, datetime(2026, 1, 1))])
+
+    result = await task_repository.get_task_tombstones(
+        user_id=TEST_USER_ID, before=datetime(2026, 1, 2), limit=3)
+
+    assert result == [(7, datetime(2026, 1, 1))]
+    compiled = str(mock_session.execute.call_args[0][0].compile(compile_kwargs={"literal_binds": True}))
+    assert "FROM task_tombstones" in compiled
+    assert f"WHERE task_tombstones.user_id = {TEST_USER_ID} AND task_tombstones.deleted_at <" in compiled
+    assert ") >" not in compiled
+    assert "ORDER BY task_tombstones.deleted_at, task_tombstones.id" in compiled
+
+
+async def test_repo_delete_task_tombstones(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test pruning tombstones older than a cutoff."""
+    mock_session.execute.return_value.rowcount = 4
+
+    result = await task_repository.delete_task_tombstones(before=datetime(2026, 1, 1))
+
+    assert result == 4
+    call_args = mock_session.execute.call_args[0][0]
+    assert isinstance(call_args, Delete)
+    assert "WHERE task_tombstones.deleted_at < '2026-01-01 00:00:00'" in str(
+        call_args.compile(compile_kwargs={"literal_binds": True}))
+    mock_session.commit.assert_awaited_once()
+
+
+async def test_repo_update_task_status(task_repository: TaskRepository, mock_session: AsyncMock, mock_task: TaskModel):
+    """Test that a status change locks and returns the previous state for the counters."""
+    mock_task.status, mock_task.created_at = "in_progress", datetime(2026, 1, 1, 9)
+    mock_session.execute.return_value.first = MagicMock(return_value=(mock_task, "new", None))
+
+    result = await task_repository.update_task(
+        task_id=mock_task.id, user_id=TEST_USER_ID, status=TaskStatus.IN_PROGRESS)
+
+    assert result == mock_task
+    update_statement, counts = (call.args[0] for call in mock_session.execute.await_args_list)
+    compiled = str(update_statement.compile(compile_kwargs={"literal_binds": True}))
+    assert f"WHERE tasks.id = {mock_task.id} AND tasks.user_id = {TEST_USER_ID} FOR UPDATE) AS previous" in compiled
+    assert "completed_at=NULL" in compiled
+    assert "RETURNING" in compiled and "previous.status" in compiled
+    assert str(counts).startswith("INSERT INTO task_status_counts")
+    mock_session.commit.assert_awaited_once()
+
+
+async def test_repo_get_task_status_counts(task_repository: TaskRepository, mock_session: AsyncMock):
+    mock_session.execute.return_value.all = MagicMock(return_value=[("new", 3), ("completed", 1)])
+
+    result = await task_repository.get_task_status_counts(TEST_USER_ID)
+
+    assert result == {"new": 3, "completed": 1}
+    compiled = str(mock_session.execute.call_args[0][0].compile(compile_kwargs={"literal_binds": True}))
+    assert f"FROM task_status_counts \nWHERE task_status_counts.user_id = {TEST_USER_ID}" in compiled
+
+
+async def test_repo_get_task_daily_counts(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test that daily counts are read for the last days only, skipping empty days."""
+    rows = [(date(2026, 1, 1), 2, 1)]
+    mock_session.execute.return_value.all = MagicMock(return_value=rows)
+
+    result = await task_repository.get_task_daily_counts(TEST_USER_ID, days=7)
+
+    assert result == rows
+    compiled = str(mock_session.execute.call_args[0][0].compile(compile_kwargs={"literal_binds": True}))
+    assert "task_daily_counts.day > CURRENT_DATE - 7" in compiled
+    assert "(task_daily_counts.created != 0 OR task_daily_counts.completed != 0)" in compiled
+    assert compiled.endswith("ORDER BY task_daily_counts.day")
+
+
+async def test_repo_reconcile_task_counts(task_repository: TaskRepository, mock_session: AsyncMock):
+    """Test that each counter table is recounted with one GROUP BY and its drift returned."""
+    drift = [{"user_id": TEST_USER_ID, "status": "new", "stored_count": 4, "count": 3}]
+    mock_session.execute.return_value.mappings.return_value.all.return_value = drift
 
-    await task_repository.delete_task(task_to_delete)
+    result = await task_repository.reconcile_task_counts(user_id=TEST_USER_ID)
 
-    mock_session.delete.assert_awaited_once_with(task_to_delete)
+    assert result == {"task_status_counts": drift, "task_daily_counts": drift}
+    lock, by_status, by_day = (
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in mock_session.execute.await_args_list)
+    assert lock == "LOCK TABLE task_status_counts, task_daily_counts IN EXCLUSIVE MODE"
+    for compiled in (by_status, by_day):
+        assert compiled.count("GROUP BY") == 1
+        assert "FULL OUTER JOIN" in compiled
+        assert "ON CONFLICT" in compiled
+    assert "GROUP BY tasks.user_id, tasks.status" in by_status
+    assert "coalesce(tasks.completed_at, tasks.created_at) AS DATE" in by_day
     mock_session.commit.assert_awaited_once()
@@ -1,9 +1,18 @@
+import gzip
 import pytest
+from datetime import datetime
 from fastapi import status
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 
-from src.tasks.schemas import TaskStatus
+from src.base import negotiation
+from src.base.pagination import Page, TotalMode, encode_cursor
+from src.base.exceptions import GoneException
+from src.tasks.schemas import (
+    ImportTaskResultSchema, TaskBatchResponseSchema, TaskChangesSchema, TaskResponseSchema, TaskSearchResultSchema, TaskStatus,
+    TaskStatsSchema, TaskSuggestionSchema,
+)
+from src.tasks.service import TASK_VERSION_FIELDS
 
 from tests.conftest import TEST_USER_ID
 
@@ -12,9 +21,6 @@ CREATE_TASK_DATA = {"title": "New API Task",
                     "description": "Create via API", "status": TaskStatus.NEW}
 UPDATE_TASK_DATA = {"id": 101, "title": "Updated Title",
                     "status": TaskStatus.IN_PROGRESS}
-UPDATED_TASK_RESPONSE_EXPECTED = {
-    "id": 101, "title": "Updated Title", "description": "Description for task 1", "status": "in_progress",
-}
 TASK_RESPONSE_EXPECTED = {
     "id": 101,
     "title": "Test Task 1",
@@ -24,10 +30,14 @@ TASK_RESPONSE_EXPECTED = {
     "updated_at": "2025-04-30T08:57:00+04:00",
     "user_id": 1
 }
+UPDATED_TASK_RESPONSE_EXPECTED = {**TASK_RESPONSE_EXPECTED, "title": "Updated Title", "status": "in_progress"}
 TASK_LIST_RESPONSE_EXPECTED = [TASK_RESPONSE_EXPECTED]
 
 pytestmark = pytest.mark.asyncio
 
+requires_msgpack = pytest.mark.skipif(negotiation.msgpack is None, reason="msgpack is not installed")
+msgpack = negotiation.msgpack
+
 
 async def test_get_task_success(client: TestClient, mock_task_service: MagicMock):
     """Test successfully getting a task by ID."""
@@ -39,7 +49,47 @@ async def test_get_task_success(client: TestClient, mock_task_service: MagicMock
 
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == TASK_RESPONSE_EXPECTED
-    mock_task_service.get_task.assert_awaited_once_with(task_id)
+    mock_task_service.get_task.assert_awaited_once_with(task_id, fields=None)
+
+
+async def test_get_task_fields(client: TestClient, mock_task_service: MagicMock):
+    """Test that only the requested fields are returned, while versions are still read."""
+    mock_task_service.get_task.return_value = TASK_RESPONSE_EXPECTED
+
+    response = client.get("/tasks/101", params={"fields": "title,status"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"title": "Test Task 1", "status": "new"}
+    assert "ETag" in response.headers
+    mock_task_service.get_task.assert_awaited_once_with(
+        101, fields=("title", "status", "id", "created_at", "updated_at"))
+
+
+async def test_get_tasks_batch(client: TestClient, mock_task_service: MagicMock):
+    """Test that tasks are fetched by a list of IDs, by query string or body."""
+    mock_task_service.get_tasks_by_ids.return_value = TaskBatchResponseSchema(
+        tasks=[TASK_RESPONSE_EXPECTED], missing=[404])
+
+    response = client.get("/tasks/batch", params={"ids": "101,404"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"tasks": [TASK_RESPONSE_EXPECTED], "missing": [404]}
+    mock_task_service.get_tasks_by_ids.assert_awaited_once_with([101, 404], fields=None)
+
+    mock_task_service.get_tasks_by_ids.reset_mock()
+    response = client.post("/tasks/batch", params={"fields": "title"}, json={"ids": [101, 404]})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"tasks": [{"title": "Test Task 1"}], "missing": [404]}
+    mock_task_service.get_tasks_by_ids.assert_awaited_once_with(
+        [101, 404], fields=("title", "id", "created_at", "updated_at"))
+
+
+async def test_get_tasks_batch_invalid_ids(client: TestClient, mock_task_service: MagicMock):
+    response = client.get("/tasks/batch", params={"ids": "101,abc"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_task_service.get_tasks_by_ids.assert_not_awaited()
 
 
 async def test_get_task_not_found(client: TestClient, mock_task_service: MagicMock):
@@ -51,61 +101,191 @@ async def test_get_task_not_found(client: TestClient, mock_task_service: MagicMo
     response = client.get(f"/tasks/{task_id}")
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
-    mock_task_service.get_task.assert_awaited_once_with(task_id)
+    mock_task_service.get_task.assert_awaited_once_with(task_id, fields=None)
+
+
+async def test_get_task_conditional(client: TestClient, mock_task_service: MagicMock):
+    """Test that a current ETag gets a 304 without loading the task."""
+    mock_task_service.get_task.return_value = TASK_RESPONSE_EXPECTED
+    etag = client.get("/tasks/101").headers["ETag"]
+    mock_task_service.get_task.reset_mock()
+    mock_task_service.get_task_updated_at.return_value = datetime.fromisoformat(
+        TASK_RESPONSE_EXPECTED["updated_at"])
+
+    response = client.get("/tasks/101", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    mock_task_service.get_task_updated_at.assert_awaited_once_with(101)
+    mock_task_service.get_task.assert_not_called()
+
+
+async def test_get_task_conditional_changed(client: TestClient, mock_task_service: MagicMock):
+    """Test that a stale ETag gets the task with its new validators."""
+    mock_task_service.get_task_updated_at.return_value = datetime(2025, 5, 1)
+    mock_task_service.get_task.return_value = TASK_RESPONSE_EXPECTED
+
+    response = client.get("/tasks/101", headers={"If-None-Match": 'W/"stale"'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == TASK_RESPONSE_EXPECTED
+    assert response.headers["ETag"] != 'W/"stale"'
+    assert response.headers["Last-Modified"] == "Wed, 30 Apr 2025 04:57:00 GMT"
+
+
+async def test_list_my_tasks_conditional(client: TestClient, mock_task_service: MagicMock):
+    """Test that an unchanged page is answered from its versions alone."""
+    mock_task_service.get_user_tasks.return_value = Page(TASK_LIST_RESPONSE_EXPECTED)
+    etag = client.get("/tasks/user/me").headers["ETag"]
+    mock_task_service.get_user_tasks.reset_mock()
+    versions = TaskResponseSchema.model_validate(TASK_RESPONSE_EXPECTED)
+    mock_task_service.get_user_tasks.return_value = Page([versions])
+
+    response = client.get("/tasks/user/me?status=new", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    mock_task_service.get_user_tasks.assert_awaited_once_with(
+        user_id=TEST_USER_ID, status="new", page=1, elements_per_page=10, cursor=None,
+        total=None, fields=TASK_VERSION_FIELDS)
+
+
+async def test_list_my_tasks_conditional_carries_total(client: TestClient, mock_task_service: MagicMock):
+    """Test that a 304 still reports the current total."""
+    versions = TaskResponseSchema.model_validate(TASK_RESPONSE_EXPECTED)
+    mock_task_service.get_user_tasks.return_value = Page([versions], total=3)
+    etag = client.get("/tasks/user/me?total=exact").headers["ETag"]
+    mock_task_service.get_user_tasks.return_value = Page([versions], total=4)
+
+    response = client.get("/tasks/user/me?total=exact", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["X-Total-Count"] == "4"
+
+
+async def test_list_tasks_conditional_changed(client: TestClient, mock_task_service: MagicMock):
+    """Test that a changed page is fetched in full after its versions."""
+    mock_task_service.get_tasks.return_value = Page([TaskResponseSchema.model_validate(TASK_RESPONSE_EXPECTED)])
+
+    response = client.get("/tasks/list", headers={"If-Modified-Since": "Tue, 29 Apr 2025 00:00:00 GMT"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == TASK_LIST_RESPONSE_EXPECTED
+    assert [call.kwargs.get("fields") for call in mock_task_service.get_tasks.await_args_list] == [
+        TASK_VERSION_FIELDS, None]
 
 
 async def test_list_tasks_success(client: TestClient, mock_task_service: MagicMock):
     """Test successfully listing tasks."""
-    mock_task_service.get_tasks.return_value = TASK_LIST_RESPONSE_EXPECTED
+    mock_task_service.get_tasks.return_value = Page(TASK_LIST_RESPONSE_EXPECTED)
 
     response = client.get("/tasks/list?page=1&elements_per_page=5")
 
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == TASK_LIST_RESPONSE_EXPECTED
     mock_task_service.get_tasks.assert_awaited_once_with(
-        page=1, elements_per_page=5, status=None)
+        page=1, elements_per_page=5, status=None, cursor=None, total=None, fields=None)
+
+
+async def test_list_tasks_with_total(client: TestClient, mock_task_service: MagicMock):
+    """Test that a counted total is returned in X-Total-Count."""
+    mock_task_service.get_tasks.return_value = Page(TASK_LIST_RESPONSE_EXPECTED, total=42)
+
+    response = client.get("/tasks/list?total=estimate")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == TASK_LIST_RESPONSE_EXPECTED
+    assert response.headers["X-Total-Count"] == "42"
+    mock_task_service.get_tasks.assert_awaited_once_with(
+        page=1, elements_per_page=10, status=None, cursor=None, total=TotalMode.ESTIMATE, fields=None)
+
+
+async def test_list_my_tasks_fields(client: TestClient, mock_task_service: MagicMock, mock_task_list: list):
+    """Test that sparse pages read and return only the requested fields, and still page by cursor."""
+    for task in mock_task_list:
+        task.created_at = task.updated_at = datetime(2025, 4, 30, 8, 57)
+    mock_task_service.get_user_tasks.return_value = Page(mock_task_list)
+
+    response = client.get(
+        "/tasks/user/me", params={"fields": "id,title", "elements_per_page": len(mock_task_list)})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{"id": task.id, "title": task.title} for task in mock_task_list]
+    assert response.headers["X-Next-Cursor"] == encode_cursor(
+        mock_task_list[-1].created_at, mock_task_list[-1].id)
+    assert mock_task_service.get_user_tasks.call_args.kwargs["fields"] == (
+        "id", "title", "created_at", "updated_at")
+
+
+async def test_list_tasks_invalid_fields(client: TestClient, mock_task_service: MagicMock):
+    response = client.get("/tasks/list", params={"fields": "id,password"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_task_service.get_tasks.assert_not_awaited()
+
+
+async def test_list_tasks_invalid_total(client: TestClient, mock_task_service: MagicMock):
+    response = client.get("/tasks/list?total=some")
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    mock_task_service.get_tasks.assert_not_awaited()
+
+
+@requires_msgpack
+async def test_list_tasks_msgpack(client: TestClient, mock_task_service: MagicMock):
+    """Test that lists are MessagePack only when asked for by name."""
+    mock_task_service.get_tasks.return_value = Page(TASK_LIST_RESPONSE_EXPECTED)
+
+    packed = client.get("/tasks/list", headers={"Accept": "application/msgpack, application/json;q=0.5"})
+    default = client.get("/tasks/list", headers={"Accept": "*/*"})
+
+    assert packed.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(packed.content) == TASK_LIST_RESPONSE_EXPECTED
+    assert len(packed.content) < len(default.content)
+    assert default.headers["content-type"] == "application/json"
+    assert default.json() == TASK_LIST_RESPONSE_EXPECTED
 
 
 async def test_list_tasks_with_status(client: TestClient, mock_task_service: MagicMock):
     """Test successfully listing tasks with a status filter."""
-    mock_task_service.get_tasks.return_value = [TASK_RESPONSE_EXPECTED]
+    mock_task_service.get_tasks.return_value = Page([TASK_RESPONSE_EXPECTED])
     test_status = TaskStatus.NEW
 
     response = client.get(f"/tasks/list?status={test_status.value}")
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == [TASK_RESPONSE_EXPECTED]
     mock_task_service.get_tasks.assert_awaited_once_with(
-        page=1, elements_per_page=10, status=test_status.value)
+        page=1, elements_per_page=10, status=test_status.value, cursor=None, total=None, fields=None)
 
 
 async def test_list_user_tasks_success(client: TestClient, mock_task_service: MagicMock):
     """Test listing tasks for a specific user."""
     user_id_to_test = TEST_USER_ID
-    mock_task_service.get_user_tasks.return_value = TASK_LIST_RESPONSE_EXPECTED
+    mock_task_service.get_user_tasks.return_value = Page(TASK_LIST_RESPONSE_EXPECTED)
 
     response = client.get(f"/tasks/user/{user_id_to_test}?page=2")
 
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == TASK_LIST_RESPONSE_EXPECTED
     mock_task_service.get_user_tasks.assert_awaited_once_with(
-        user_id=user_id_to_test, status=None, page=2, elements_per_page=10)
+        user_id=user_id_to_test, status=None, page=2, elements_per_page=10, cursor=None, total=None, fields=None)
 
 
 async def test_list_my_tasks_success(client: TestClient, mock_task_service: MagicMock):
     """Test successfully listing the current user's tasks."""
-    mock_task_service.get_user_tasks.return_value = TASK_LIST_RESPONSE_EXPECTED
+    mock_task_service.get_user_tasks.return_value = Page(TASK_LIST_RESPONSE_EXPECTED)
 
     response = client.get("/tasks/user/me")
 
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == TASK_LIST_RESPONSE_EXPECTED
     mock_task_service.get_user_tasks.assert_awaited_once_with(
-        user_id=TEST_USER_ID, status=None, page=1, elements_per_page=10)
+        user_id=TEST_USER_ID, status=None, page=1, elements_per_page=10, cursor=None, total=None, fields=None)
 
 
 async def test_list_my_tasks_with_pagination(client: TestClient, mock_task_service: MagicMock):
     """Test listing current user's tasks with pagination parameters."""
-    mock_task_service.get_user_tasks.return_value = TASK_LIST_RESPONSE_EXPECTED
+    mock_task_service.get_user_tasks.return_value = Page(TASK_LIST_RESPONSE_EXPECTED)
     page = 2
     elements = 5
 
@@ -114,12 +294,12 @@ async def test_list_my_tasks_with_pagination(client: TestClient, mock_task_servi
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == TASK_LIST_RESPONSE_EXPECTED
     mock_task_service.get_user_tasks.assert_awaited_once_with(
-        user_id=TEST_USER_ID, status=None, page=page, elements_per_page=elements)
+        user_id=TEST_USER_ID, status=None, page=page, elements_per_page=elements, cursor=None, total=None, fields=None)
 
 
 async def test_list_my_tasks_with_status(client: TestClient, mock_task_service: MagicMock):
     """Test listing current user's tasks filtered by status."""
-    mock_task_service.get_user_tasks.return_value = TASK_LIST_RESPONSE_EXPECTED
+    mock_task_service.get_user_tasks.return_value = Page(TASK_LIST_RESPONSE_EXPECTED)
     test_status = TaskStatus.IN_PROGRESS
 
     response = client.get(f"/tasks/user/me?status={test_status.value}")
@@ -127,19 +307,43 @@ async def test_list_my_tasks_with_status(client: TestClient, mock_task_service:
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == TASK_LIST_RESPONSE_EXPECTED
     mock_task_service.get_user_tasks.assert_awaited_once_with(
-        user_id=TEST_USER_ID, status=test_status.value, page=1, elements_per_page=10)
+        user_id=TEST_USER_ID, status=test_status.value, page=1, elements_per_page=10, cursor=None, total=None, fields=None)
+
+
+async def test_list_my_tasks_next_cursor(client: TestClient, mock_task_service: MagicMock, mock_task_list: list):
+    """Test that a full page exposes the cursor of the following page."""
+    for task in mock_task_list:
+        task.created_at = task.updated_at = datetime(2025, 4, 30, 8, 57)
+    mock_task_service.get_user_tasks.return_value = Page(mock_task_list)
+
+    response = client.get(f"/tasks/user/me?elements_per_page={len(mock_task_list)}")
+
+    assert response.status_code == status.HTTP_200_OK
+    last = mock_task_list[-1]
+    assert response.headers["X-Next-Cursor"] == encode_cursor(last.created_at, last.id)
+
+
+async def test_list_my_tasks_with_cursor(client: TestClient, mock_task_service: MagicMock):
+    """Test that the cursor is passed through and a short page has no next cursor."""
+    mock_task_service.get_user_tasks.return_value = Page(TASK_LIST_RESPONSE_EXPECTED)
 
+    response = client.get("/tasks/user/me?cursor=abc")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "X-Next-Cursor" not in response.headers
+    mock_task_service.get_user_tasks.assert_awaited_once_with(
+        user_id=TEST_USER_ID, status=None, page=1, elements_per_page=10, cursor="abc", total=None, fields=None)
 
 async def test_list_my_tasks_empty_result(client: TestClient, mock_task_service: MagicMock):
     """Test listing current user's tasks when no tasks exist."""
-    mock_task_service.get_user_tasks.return_value = []
+    mock_task_service.get_user_tasks.return_value = Page([])
 
     response = client.get("/tasks/user/me")
 
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == []
     mock_task_service.get_user_tasks.assert_awaited_once_with(
-        user_id=TEST_USER_ID, status=None, page=1, elements_per_page=10)
+        user_id=TEST_USER_ID, status=None, page=1, elements_per_page=10, cursor=None, total=None, fields=None)
 
 
 async def test_create_task_success(client: TestClient, mock_task_service: MagicMock):
@@ -156,6 +360,76 @@ async def test_create_task_success(client: TestClient, mock_task_service: MagicM
     assert response.json() == TASK_RESPONSE_EXPECTED
 
 
+async def test_create_task_serializes_orm_task(client: TestClient, mock_task_service: MagicMock, mock_task):
+    """Test that a created ORM task is returned as a TaskResponseSchema."""
+    mock_task.created_at = mock_task.updated_at = datetime(2025, 4, 30, 8, 57)
+    mock_task.completed_at = None
+    mock_task_service.create_task.return_value = mock_task
+
+    response = client.post("/tasks/create", json=CREATE_TASK_DATA)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        **TASK_RESPONSE_EXPECTED,
+        "title": mock_task.title,
+        "created_at": "2025-04-30T08:57:00",
+        "updated_at": "2025-04-30T08:57:00",
+    }
+
+
+@requires_msgpack
+async def test_create_task_msgpack(client: TestClient, mock_task_service: MagicMock):
+    """Test that MessagePack is read and, when accepted, answered with."""
+    mock_task_service.create_task.return_value = TASK_RESPONSE_EXPECTED
+
+    response = client.post(
+        "/tasks/create", content=msgpack.packb(CREATE_TASK_DATA),
+        headers={"Content-Type": "application/msgpack", "Accept": "application/msgpack"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/msgpack"
+    assert response.headers["vary"] == "Accept"
+    assert msgpack.unpackb(response.content) == TASK_RESPONSE_EXPECTED
+    assert mock_task_service.create_task.call_args.kwargs["schema"].model_dump() == CREATE_TASK_DATA
+
+
+@requires_msgpack
+async def test_create_task_invalid_msgpack(client: TestClient, mock_task_service: MagicMock):
+    response = client.post(
+        "/tasks/create", content=b"\xc1", headers={"Content-Type": "application/msgpack"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_task_service.create_task.assert_not_awaited()
+
+
+async def test_msgpack_unavailable(client: TestClient, mock_task_service: MagicMock, monkeypatch):
+    """Test that without ``msgpack`` responses stay JSON and MessagePack bodies are refused."""
+    monkeypatch.setattr(negotiation, "msgpack", None)
+    mock_task_service.get_tasks.return_value = Page(TASK_LIST_RESPONSE_EXPECTED)
+
+    listed = client.get("/tasks/list", headers={"Accept": "application/msgpack"})
+    created = client.post(
+        "/tasks/create", content=b"\x80", headers={"Content-Type": "application/msgpack"})
+
+    assert listed.headers["content-type"] == "application/json"
+    assert listed.json() == TASK_LIST_RESPONSE_EXPECTED
+    assert created.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    mock_task_service.create_task.assert_not_awaited()
+
+
+async def test_create_tasks_bulk_success(client: TestClient, mock_task_service: MagicMock):
+    """Test creating tasks in bulk."""
+    mock_task_service.create_tasks.return_value = {"created": [TASK_RESPONSE_EXPECTED], "errors": []}
+
+    response = client.post("/tasks/bulk", json={"items": [CREATE_TASK_DATA], "skip_invalid": True})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"created": [TASK_RESPONSE_EXPECTED], "errors": []}
+    call_kwargs = mock_task_service.create_tasks.call_args.kwargs
+    assert call_kwargs['schema'].items == [CREATE_TASK_DATA]
+    assert call_kwargs['schema'].skip_invalid is True
+    assert call_kwargs['user_id'] == TEST_USER_ID
+
 async def test_update_task_success(client: TestClient, mock_task_service: MagicMock):
     """Test successful task update."""
     mock_task_service.update_task.return_value = UPDATED_TASK_RESPONSE_EXPECTED
@@ -235,3 +509,173 @@ async def test_delete_task_unauthorized(client: TestClient, mock_task_service: M
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     mock_task_service.delete_task.assert_awaited_once_with(
         task_id=task_id_to_delete, user_id=TEST_USER_ID)
+
+
+async def test_update_tasks_status_bulk(client: TestClient, mock_task_service: MagicMock):
+    """Test the bulk status transition endpoint."""
+    result = {"affected": [101], "missing": [999], "not_owned": []}
+    mock_task_service.update_tasks_status.return_value = result
+
+    response = client.put("/tasks/bulk/status", json={"ids": [101, 999], "status": "completed"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == result
+    call_kwargs = mock_task_service.update_tasks_status.call_args.kwargs
+    assert call_kwargs['schema'].ids == [101, 999]
+    assert call_kwargs['schema'].status == TaskStatus.COMPLETED
+    assert call_kwargs['user_id'] == TEST_USER_ID
+
+
+async def test_delete_tasks_bulk_requires_one_selection(client: TestClient, mock_task_service: MagicMock):
+    """Test that a bulk delete must select by IDs or by status, not both."""
+    response = client.post("/tasks/bulk/delete", json={"ids": [1], "status_filter": "new"})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    mock_task_service.delete_tasks.assert_not_called()
+
+
+async def test_delete_tasks_bulk_by_status(client: TestClient, mock_task_service: MagicMock):
+    """Test the bulk delete endpoint with a status filter."""
+    mock_task_service.delete_tasks.return_value = {"affected": [101, 102], "missing": [], "not_owned": []}
+
+    response = client.post("/tasks/bulk/delete", json={"status_filter": "in_progress"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["affected"] == [101, 102]
+    call_kwargs = mock_task_service.delete_tasks.call_args.kwargs
+    assert call_kwargs['schema'].status_filter == TaskStatus.IN_PROGRESS
+
+
+async def test_search_tasks(client: TestClient, mock_task_service: MagicMock):
+    """Test that a full page of search results exposes a (rank, id) cursor."""
+    result = {**TASK_RESPONSE_EXPECTED, "rank": 0.5, "headline": "<b>Test</b> task"}
+    mock_task_service.search_tasks.return_value = [TaskSearchResultSchema(**result)]
+
+    response = client.get("/tasks/search", params={"q": "test", "status": "new", "elements_per_page": 1})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [result]
+    assert response.headers["X-Next-Cursor"] == encode_cursor(0.5, 101)
+    mock_task_service.search_tasks.assert_awaited_once_with(
+        query="test", user_id=None, status="new", elements_per_page=1, cursor=None)
+
+
+async def test_suggest_tasks(client: TestClient, mock_task_service: MagicMock):
+    """Test that suggestions are scoped to the current user."""
+    mock_task_service.suggest_tasks.return_value = [
+        TaskSuggestionSchema(id=1, title="Buy milk", status=TaskStatus.NEW)]
+
+    response = client.get("/tasks/suggest", params={"prefix": "bu"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{"id": 1, "title": "Buy milk", "status": "new"}]
+    mock_task_service.suggest_tasks.assert_awaited_once_with(
+        user_id=TEST_USER_ID, prefix="bu", limit=None)
+
+
+async def test_list_my_task_changes(client: TestClient, mock_task_service: MagicMock):
+    """Test that a page of the change feed is returned with its cursor."""
+    mock_task_service.get_task_changes.return_value = TaskChangesSchema(
+        changed=[TaskResponseSchema(**TASK_RESPONSE_EXPECTED)], deleted=[55], cursor="next", has_more=False)
+
+    response = client.get("/tasks/changes", params={"since": "prev", "elements_per_page": 50})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "changed": TASK_LIST_RESPONSE_EXPECTED, "deleted": [55], "cursor": "next", "has_more": False}
+    mock_task_service.get_task_changes.assert_awaited_once_with(
+        user_id=TEST_USER_ID, since="prev", elements_per_page=50)
+
+
+async def test_list_my_task_changes_expired(client: TestClient, mock_task_service: MagicMock):
+    """Test that an expired cursor answers 410 Gone."""
+    mock_task_service.get_task_changes.side_effect = GoneException("Change cursor expired")
+
+    response = client.get("/tasks/changes", params={"since": "old"})
+
+    assert response.status_code == status.HTTP_410_GONE
+
+
+async def test_get_my_task_stats(client: TestClient, mock_task_service: MagicMock):
+    mock_task_service.get_task_stats.return_value = TaskStatsSchema(
+        total=1, by_status={"new": 1, "in_progress": 0, "completed": 0}, daily=None)
+
+    response = client.get("/tasks/stats", params={"days": 7})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "total": 1, "by_status": {"new": 1, "in_progress": 0, "completed": 0}, "daily": None}
+    mock_task_service.get_task_stats.assert_awaited_once_with(user_id=TEST_USER_ID, days=7)
+
+
+async def test_stream_my_task_events(client: TestClient, mock_task_service: MagicMock):
+    """Test that task events are streamed as Server-Sent Events."""
+    async def events():
+        yield b": connected\n\n"
+        yield b'event: deleted\ndata: {"type":"deleted","ids":[7]}\n\n'
+    mock_task_service.stream_task_events.return_value = events()
+
+    response = client.get("/tasks/stream")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.text.endswith('event: deleted\ndata: {"type":"deleted","ids":[7]}\n\n')
+    mock_task_service.stream_task_events.assert_called_once_with(user_id=TEST_USER_ID)
+
+
+async def test_export_my_tasks(client: TestClient, mock_task_service: MagicMock):
+    """Test that the export is streamed with the format's media type."""
+    async def chunks():
+        yield b'{"id":101}\n'
+        yield b'{"id":102}\n'
+    mock_task_service.export_user_tasks.return_value = chunks()
+
+    response = client.get("/tasks/export", params={"status": "new"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="tasks.ndjson"'
+    assert response.content == b'{"id":101}\n{"id":102}\n'
+    mock_task_service.export_user_tasks.assert_called_once_with(
+        user_id=TEST_USER_ID, export_format="ndjson", status="new")
+
+
+async def test_export_my_tasks_compressed(client: TestClient, mock_task_service: MagicMock):
+    """Test that the export is compressed as it streams, at the route's own gzip level."""
+    async def chunks():
+        yield b'{"id":101}\n' * 100
+    mock_task_service.export_user_tasks.return_value = chunks()
+
+    with client.stream("GET", "/tasks/export", headers={"Accept-Encoding": "gzip"}) as response:
+        body = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert body[:2] == b"\x1f\x8b" and body[8] == 4  # gzip header: fastest compression
+    assert gzip.decompress(body) == b'{"id":101}\n' * 100
+
+
+async def test_export_my_tasks_invalid_format(client: TestClient, mock_task_service: MagicMock):
+    """Test that unknown export formats are rejected before streaming."""
+    response = client.get("/tasks/export", params={"format": "xml"})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    mock_task_service.export_user_tasks.assert_not_called()
+
+
+async def test_import_tasks(client: TestClient, mock_task_service: MagicMock):
+    """Test that the request body is parsed incrementally and handed to the service."""
+    received = []
+
+    async def import_tasks(records, user_id, skip_invalid):
+        received.extend([record async for record in records])
+        return ImportTaskResultSchema(imported=len(received), chunks=1)
+    mock_task_service.import_tasks.side_effect = import_tasks
+
+    response = client.post(
+        "/tasks/import", params={"format": "csv", "skip_invalid": True},
+        content=b"title,description\r\nFirst,One\r\n")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"imported": 1, "failed": 0, "chunks": 1, "errors": []}
+    assert received == [{"title": "First", "description": "One"}]
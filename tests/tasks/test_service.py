@@ -1,10 +1,31 @@
+import json
 import pytest
-from unittest.mock import MagicMock, AsyncMock
-
-from src.tasks.service import TaskService
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+
+from src.base.cache import LRUCache
+from src.tasks.events import TASK_EVENTS, task_events_topic
+from src.tasks.service import (
+    SUGGESTION_CACHE, TASK_CACHE, TASK_LIST_GENERATIONS, TaskService, task_cache_key,
+)
 from src.tasks.models import Task as TaskModel
-from src.tasks.schemas import CreateTaskSchema, UpdateTaskSchema, TaskStatus
-from src.base.exceptions import NotFoundException, UnAuthorizedException
+from src.tasks.repository import task_from_row
+from src.tasks.schemas import (
+    BulkCreateTaskSchema,
+    BulkTaskSelectionSchema,
+    BulkUpdateStatusSchema,
+    CreateTaskSchema,
+    TaskEventSchema,
+    TaskEventType,
+    TaskFileFormat,
+    TaskResponseSchema,
+    TaskStatus,
+    TaskSuggestionSchema,
+    UpdateTaskSchema,
+)
+from src.base.exceptions import (
+    BadRequestException, GoneException, NotFoundException, UnAuthorizedException)
+from src.base.pagination import Page, TotalMode, decode_cursor, encode_cursor
 
 from tests.conftest import TEST_USER_ID
 
@@ -12,6 +33,175 @@ from tests.conftest import TEST_USER_ID
 pytestmark = pytest.mark.asyncio
 
 
+async def test_get_task_reads_through_cache(task_service: TaskService, mock_task_repository: MagicMock, mock_task: TaskModel):
+    """Test that a task is fetched once and then served from the cache."""
+    mock_task.created_at = mock_task.updated_at = datetime(2025, 4, 30, 8, 57)
+    mock_task_repository.get_task.return_value = mock_task
+
+    first = await task_service.get_task(mock_task.id)
+    second = await task_service.get_task(mock_task.id)
+
+    assert first == second
+    assert (second.id, second.title, second.status) == (mock_task.id, mock_task.title, TaskStatus.NEW)
+    mock_task_repository.get_task.assert_awaited_once_with(mock_task.id, fields=None)
+    assert (task_service.task_cache.stats.hits, task_service.task_cache.stats.misses) == (1, 1)
+
+
+async def test_events_drop_cached_tasks_of_any_worker():
+    """Test that task events, relayed from whichever worker wrote, drop this worker's caches."""
+    async def cache_everything() -> int:
+        await TASK_CACHE.set(task_cache_key(7), b"{}")
+        SUGGESTION_CACHE.set(TEST_USER_ID, LRUCache(1))
+        return TASK_LIST_GENERATIONS.get(TEST_USER_ID)
+
+    generation = await cache_everything()
+    TASK_EVENTS.deliver(task_events_topic(TEST_USER_ID), TaskEventSchema(type=TaskEventType.UPDATED, ids=[7]))
+
+    assert await TASK_CACHE.get(task_cache_key(7)) is None
+    assert TEST_USER_ID not in SUGGESTION_CACHE
+    assert TASK_LIST_GENERATIONS.get(TEST_USER_ID) != generation
+
+    generation = await cache_everything()
+    TASK_EVENTS.interrupt()
+
+    assert await TASK_CACHE.get(task_cache_key(7)) is None
+    assert TEST_USER_ID not in SUGGESTION_CACHE
+    assert TASK_LIST_GENERATIONS.get(TEST_USER_ID) != generation
+
+
+async def test_get_task_fields(task_service: TaskService, mock_task_repository: MagicMock, mock_task: TaskModel):
+    """Test that a task of only some fields is read narrowly on a miss and not cached."""
+    mock_task.updated_at = datetime(2025, 4, 30, 8, 57)
+    mock_task_repository.get_task.return_value = mock_task
+
+    task = await task_service.get_task(mock_task.id, fields=("id", "title", "updated_at"))
+
+    assert task.model_dump(exclude_unset=True) == {
+        "id": mock_task.id, "title": mock_task.title, "updated_at": mock_task.updated_at}
+    mock_task_repository.get_task.assert_awaited_once_with(mock_task.id, fields=("id", "title", "updated_at"))
+    assert task_service.task_cache.stats.entries == 0
+
+
+async def test_get_tasks_by_ids(task_service: TaskService, mock_task_repository: MagicMock, mock_task_rows: list):
+    """Test that only uncached tasks are read, in one query, and returned in the order asked."""
+    first, second = (TaskResponseSchema.model_validate(row) for row in mock_task_rows[:2])
+    mock_task_repository.get_tasks_by_ids.return_value = [second, first]
+
+    batch = await task_service.get_tasks_by_ids([second.id, 404, first.id, second.id])
+
+    assert [task.id for task in batch.tasks] == [second.id, first.id]
+    assert batch.missing == [404]
+    mock_task_repository.get_tasks_by_ids.assert_awaited_once_with([second.id, 404, first.id], fields=None)
+
+    mock_task_repository.get_tasks_by_ids.reset_mock(return_value=True)
+    mock_task_repository.get_tasks_by_ids.return_value = []
+    batch = await task_service.get_tasks_by_ids([first.id, 404, second.id])
+
+    assert [task.id for task in batch.tasks] == [first.id, second.id]
+    mock_task_repository.get_tasks_by_ids.assert_awaited_once_with([404], fields=None)
+
+
+async def test_get_tasks_by_ids_fields_not_cached(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that tasks of only some fields are read narrowly and not cached."""
+    mock_task_repository.get_tasks_by_ids.return_value = [TaskResponseSchema.model_construct(id=1, title="One")]
+
+    batch = await task_service.get_tasks_by_ids([1], fields=("id", "title"))
+
+    assert [task.title for task in batch.tasks] == ["One"]
+    mock_task_repository.get_tasks_by_ids.assert_awaited_once_with([1], fields=("id", "title"))
+    assert task_service.task_cache.stats.entries == 0
+
+
+async def test_get_tasks_by_ids_limit(task_service: TaskService, mock_task_repository: MagicMock):
+    with pytest.raises(BadRequestException):
+        await task_service.get_tasks_by_ids(list(range(1001)))
+    mock_task_repository.get_tasks_by_ids.assert_not_awaited()
+
+
+async def test_get_task_updated_at(task_service: TaskService, mock_task_repository: MagicMock, mock_task: TaskModel):
+    """Test that versions come from the task cache, else from a narrow query."""
+    updated_at = datetime(2025, 4, 30, 8, 57)
+    mock_task_repository.get_task_updated_at.return_value = updated_at
+    assert await task_service.get_task_updated_at(mock_task.id) == updated_at
+
+    mock_task.created_at = mock_task.updated_at = datetime(2025, 5, 1)
+    mock_task_repository.get_task.return_value = mock_task
+    await task_service.get_task(mock_task.id)
+    assert await task_service.get_task_updated_at(mock_task.id) == datetime(2025, 5, 1)
+
+    mock_task_repository.get_task_updated_at.assert_awaited_once_with(mock_task.id)
+    mock_task_repository.get_task_updated_at.return_value = None
+    with pytest.raises(NotFoundException):
+        await task_service.get_task_updated_at(404)
+
+
+async def test_get_user_tasks_fields_cached_apart(
+        task_service: TaskService, mock_task_repository: MagicMock, mock_task_rows: list):
+    """Test that partial pages are read narrowly once, then served from the cache with only their fields."""
+    fields = ("id", "status", "updated_at")
+    mock_task_repository.get_user_tasks.return_value = Page(
+        [task_from_row({name: row[name] for name in fields}) for row in mock_task_rows[:2]])
+
+    first = await task_service.get_user_tasks(user_id=TEST_USER_ID, fields=fields)
+    second = await task_service.get_user_tasks(user_id=TEST_USER_ID, fields=fields)
+    await task_service.get_user_tasks(user_id=TEST_USER_ID, fields=("id",))
+
+    assert second == first
+    assert [task.model_fields_set for task in second] == [set(fields)] * 2
+    assert isinstance(second[0].status, TaskStatus) and isinstance(second[0].updated_at, datetime)
+    assert mock_task_repository.get_user_tasks.await_count == 2
+    mock_task_repository.get_user_tasks.assert_any_await(
+        user_id=TEST_USER_ID, offset=0, status=None, limit=10, after=None, fields=fields)
+    assert task_service.list_cache.stats.entries == 2
+
+
+async def test_get_user_tasks_total_bypasses_cache(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that counted pages are passed through with their total and never cached."""
+    mock_task_repository.get_user_tasks.return_value = Page([], total=7)
+
+    result = await task_service.get_user_tasks(user_id=TEST_USER_ID, total=TotalMode.EXACT)
+
+    assert result.total == 7
+    mock_task_repository.get_user_tasks.assert_awaited_once_with(
+        user_id=TEST_USER_ID, offset=0, status=None, limit=10, after=None, fields=None,
+        total=TotalMode.EXACT)
+    assert task_service.list_cache.stats.entries == 0
+
+
+async def test_get_task_not_found_is_not_cached(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that missing tasks are looked up again."""
+    mock_task_repository.get_task.return_value = None
+
+    for _ in range(2):
+        with pytest.raises(NotFoundException):
+            await task_service.get_task(404)
+
+    assert mock_task_repository.get_task.await_count == 2
+    assert task_service.task_cache.stats.entries == 0
+
+
+async def test_task_writes_invalidate_cache(task_service: TaskService, mock_task_repository: MagicMock, mock_task: TaskModel):
+    """Test that updates, deletes and bulk writes drop the cached tasks."""
+    mock_task.created_at = mock_task.updated_at = datetime(2025, 4, 30, 8, 57)
+    mock_task_repository.get_task.return_value = mock_task
+    mock_task_repository.update_task.return_value = mock_task
+    mock_task_repository.delete_task.return_value = mock_task.id
+    mock_task_repository.update_tasks_status.return_value = [mock_task.id]
+    writes = [
+        lambda: task_service.update_task(UpdateTaskSchema(id=mock_task.id, title="New"), TEST_USER_ID),
+        lambda: task_service.delete_task(mock_task.id, TEST_USER_ID),
+        lambda: task_service.update_tasks_status(
+            BulkUpdateStatusSchema(ids=[mock_task.id], status=TaskStatus.COMPLETED), TEST_USER_ID),
+    ]
+
+    for write in writes:
+        await task_service.get_task(mock_task.id)
+        await write()
+        assert task_service.task_cache.stats.entries == 0
+
+    assert mock_task_repository.get_task.await_count == len(writes)
+
+
 async def test_get_tasks_no_status(task_service: TaskService, mock_task_repository: MagicMock, mock_task_list: list):
     """Test getting tasks without status filter."""
     page = 2
@@ -23,7 +213,7 @@ async def test_get_tasks_no_status(task_service: TaskService, mock_task_reposito
 
     assert result == mock_task_list[:per_page]
     mock_task_repository.get_tasks.assert_awaited_once_with(
-        offset=expected_offset, limit=per_page)
+        offset=expected_offset, limit=per_page, after=None, fields=None, total=None)
     mock_task_repository.get_tasks_by_status.assert_not_called()
 
 
@@ -40,7 +230,7 @@ async def test_get_tasks_with_status(task_service: TaskService, mock_task_reposi
 
     assert result == expected_tasks
     mock_task_repository.get_tasks_by_status.assert_awaited_once_with(
-        offset=expected_offset, limit=per_page, status=status_filter
+        offset=expected_offset, limit=per_page, status=status_filter, after=None, fields=None, total=None
     )
     mock_task_repository.get_tasks.assert_not_called()
 
@@ -52,16 +242,395 @@ async def test_get_user_tasks(task_service: TaskService, mock_task_repository: M
     per_page = 10
     expected_offset = 0
     expected_tasks = [t for t in mock_task_list if t.user_id == user_id]
+    for task in expected_tasks:
+        task.created_at = task.updated_at = datetime(2025, 4, 30, 8, 57)
     mock_task_repository.get_user_tasks.return_value = expected_tasks
 
     result = await task_service.get_user_tasks(user_id=user_id, status=None, page=page, elements_per_page=per_page)
 
     assert result == expected_tasks
     mock_task_repository.get_user_tasks.assert_awaited_once_with(
-        user_id=user_id, status=None, offset=expected_offset, limit=per_page
+        user_id=user_id, status=None, offset=expected_offset, limit=per_page, after=None
     )
 
 
+async def test_get_user_tasks_cached_per_generation(task_service: TaskService, mock_task_repository: MagicMock, mock_task_rows: list):
+    """Test that pages are served from the cache until the user's tasks change."""
+    tasks = [TaskResponseSchema(**row) for row in mock_task_rows[:2]]
+    mock_task_repository.get_user_tasks.return_value = tasks
+    mock_task_repository.add_task.return_value = MagicMock()
+
+    first = await task_service.get_user_tasks(user_id=TEST_USER_ID, elements_per_page=2)
+    second = await task_service.get_user_tasks(user_id=TEST_USER_ID, elements_per_page=2)
+    await task_service.get_user_tasks(user_id=TEST_USER_ID, elements_per_page=2, status="new")
+    await task_service.get_user_tasks(user_id=TEST_USER_ID + 1, elements_per_page=2)
+    assert first == second == tasks
+    assert mock_task_repository.get_user_tasks.await_count == 3
+
+    await task_service.create_task(CreateTaskSchema(title="New", description=""), TEST_USER_ID + 1)
+    await task_service.get_user_tasks(user_id=TEST_USER_ID, elements_per_page=2)
+    await task_service.get_user_tasks(user_id=TEST_USER_ID + 1, elements_per_page=2)
+    assert mock_task_repository.get_user_tasks.await_count == 4
+    assert task_service.list_cache.stats.hit_ratio == 2 / 6
+
+
+async def test_get_user_tasks_page_ignored_with_cursor(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that pages requested with a cursor share a cache entry whatever ``page`` says."""
+    mock_task_repository.get_user_tasks.return_value = []
+    cursor = encode_cursor(datetime(2025, 4, 30, 8, 57), 101)
+
+    await task_service.get_user_tasks(user_id=TEST_USER_ID, page=3, cursor=cursor)
+    await task_service.get_user_tasks(user_id=TEST_USER_ID, page=4, cursor=cursor)
+
+    mock_task_repository.get_user_tasks.assert_awaited_once()
+
+
+async def test_get_tasks_with_cursor(task_service: TaskService, mock_task_repository: MagicMock, mock_task_list: list):
+    """Test that a cursor switches to keyset pagination and ignores the page."""
+    after = (datetime(2025, 4, 30, 8, 57), 102)
+    mock_task_repository.get_tasks.return_value = mock_task_list
+
+    await task_service.get_tasks(page=5000, elements_per_page=10, cursor=encode_cursor(*after))
+
+    mock_task_repository.get_tasks.assert_awaited_once_with(
+        offset=0, limit=10, after=after, fields=None, total=None)
+
+
+async def test_get_user_tasks_with_cursor(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test keyset pagination of a user's tasks."""
+    after = (datetime(2025, 4, 30, 8, 57), 101)
+    mock_task_repository.get_user_tasks.return_value = []
+
+    await task_service.get_user_tasks(user_id=TEST_USER_ID, page=3, cursor=encode_cursor(*after))
+
+    mock_task_repository.get_user_tasks.assert_awaited_once_with(
+        user_id=TEST_USER_ID, status=None, offset=0, limit=10, after=after
+    )
+
+
+async def test_get_tasks_invalid_cursor(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that a malformed cursor is rejected."""
+    with pytest.raises(BadRequestException):
+        await task_service.get_tasks(cursor="not-a-cursor")
+
+    mock_task_repository.get_tasks.assert_not_called()
+
+
+async def test_search_tasks(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that the search cursor is decoded into a (rank, id) keyset."""
+    mock_task_repository.search_tasks.return_value = []
+
+    await task_service.search_tasks(
+        "oat milk", user_id=TEST_USER_ID, elements_per_page=5, cursor=encode_cursor(0.25, 7))
+
+    mock_task_repository.search_tasks.assert_awaited_once_with(
+        query="oat milk", user_id=TEST_USER_ID, status=None, limit=5, after=(0.25, 7))
+
+
+async def test_search_tasks_empty_query(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that blank queries are rejected."""
+    with pytest.raises(BadRequestException):
+        await task_service.search_tasks("  ")
+
+    mock_task_repository.search_tasks.assert_not_called()
+
+
+async def test_suggest_tasks_cached_per_user(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that repeated prefixes are served from the user's cache, ignoring case."""
+    suggestions = [TaskSuggestionSchema(id=1, title="Buy milk", status=TaskStatus.NEW)]
+    mock_task_repository.suggest_tasks.return_value = suggestions
+
+    first = await task_service.suggest_tasks(TEST_USER_ID, " Bu ", limit=5)
+    second = await task_service.suggest_tasks(TEST_USER_ID, "bu", limit=5)
+    await task_service.suggest_tasks(TEST_USER_ID + 1, "bu", limit=5)
+
+    assert first == second == suggestions
+    assert mock_task_repository.suggest_tasks.await_count == 2
+    mock_task_repository.suggest_tasks.assert_any_await(user_id=TEST_USER_ID, prefix="Bu", limit=5)
+
+
+async def test_suggest_tasks_invalidated_by_writes(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that a write drops the writer's cached suggestions only."""
+    mock_task_repository.suggest_tasks.return_value = []
+    mock_task_repository.delete_task.return_value = 1
+    await task_service.suggest_tasks(TEST_USER_ID, "bu")
+    await task_service.suggest_tasks(TEST_USER_ID + 1, "bu")
+
+    await task_service.delete_task(task_id=1, user_id=TEST_USER_ID)
+    await task_service.suggest_tasks(TEST_USER_ID, "bu")
+    await task_service.suggest_tasks(TEST_USER_ID + 1, "bu")
+
+    assert mock_task_repository.suggest_tasks.await_count == 3
+
+
+async def test_suggest_tasks_empty_prefix(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that blank prefixes are rejected."""
+    with pytest.raises(BadRequestException):
+        await task_service.suggest_tasks(TEST_USER_ID, " ")
+
+    mock_task_repository.suggest_tasks.assert_not_called()
+
+
+HORIZON = datetime(2025, 5, 1, 12, 0)
+
+
+def changed_task(row: dict, minute: int) -> TaskResponseSchema:
+    """A task from ``row`` last changed ``minute`` minutes past eleven on the horizon's day."""
+    return TaskResponseSchema(**{**row, "updated_at": datetime(2025, 5, 1, 11, minute)})
+
+
+async def test_get_task_changes_merges_tombstones(task_service: TaskService, mock_task_repository: MagicMock, mock_task_rows: list):
+    """Test that changes and deletions are paged together in ``(changed_at, id)`` order."""
+    mock_task_repository.get_change_horizon.return_value = HORIZON
+    mock_task_repository.get_changed_tasks.return_value = [
+        changed_task(mock_task_rows[0], 1), changed_task(mock_task_rows[1], 3)]
+    mock_task_repository.get_task_tombstones.return_value = [
+        (55, datetime(2025, 5, 1, 11, 2)), (56, datetime(2025, 5, 1, 11, 4))]
+    since = encode_cursor(datetime(2025, 5, 1, 11, 0), 9)
+
+    changes = await task_service.get_task_changes(TEST_USER_ID, since=since, elements_per_page=3)
+
+    assert [task.id for task in changes.changed] == [101, 102]
+    assert changes.deleted == [55]
+    assert changes.has_more
+    assert decode_cursor(changes.cursor, datetime.fromisoformat, int) == (datetime(2025, 5, 1, 11, 3), 102)
+    window = dict(user_id=TEST_USER_ID, before=HORIZON, after=(datetime(2025, 5, 1, 11, 0), 9), limit=4)
+    mock_task_repository.get_changed_tasks.assert_awaited_once_with(**window)
+    mock_task_repository.get_task_tombstones.assert_awaited_once_with(**window)
+
+
+async def test_get_task_changes_caught_up(task_service: TaskService, mock_task_repository: MagicMock, mock_task_rows: list):
+    """Test that the last page resumes from the change horizon."""
+    mock_task_repository.get_change_horizon.return_value = HORIZON
+    mock_task_repository.get_changed_tasks.return_value = [changed_task(mock_task_rows[0], 1)]
+    mock_task_repository.get_task_tombstones.return_value = []
+
+    changes = await task_service.get_task_changes(TEST_USER_ID)
+
+    assert [task.id for task in changes.changed] == [101]
+    assert not changes.has_more
+    assert decode_cursor(changes.cursor, datetime.fromisoformat, int) == (HORIZON, 0)
+    mock_task_repository.get_changed_tasks.assert_awaited_once_with(
+        user_id=TEST_USER_ID, before=HORIZON, after=None, limit=101)
+
+
+async def test_get_task_changes_expired_cursor(task_service: TaskService, mock_task_repository: MagicMock, monkeypatch):
+    """Test that cursors older than the tombstone retention are refused."""
+    monkeypatch.setattr("src.config.Settings.TASKS_TOMBSTONE_RETENTION_DAYS", 30)
+    mock_task_repository.get_change_horizon.return_value = HORIZON
+
+    with pytest.raises(GoneException):
+        await task_service.get_task_changes(
+            TEST_USER_ID, since=encode_cursor(HORIZON - timedelta(days=31), 1))
+
+    mock_task_repository.get_changed_tasks.assert_not_called()
+
+
+async def test_get_task_changes_page_size(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that pages over the configured maximum are rejected."""
+    with pytest.raises(BadRequestException):
+        await task_service.get_task_changes(TEST_USER_ID, elements_per_page=10 ** 6)
+
+    mock_task_repository.get_change_horizon.assert_not_called()
+
+
+async def test_prune_task_tombstones(task_service: TaskService, mock_task_repository: MagicMock, monkeypatch):
+    """Test that tombstones are pruned relative to the change horizon."""
+    monkeypatch.setattr("src.config.Settings.TASKS_TOMBSTONE_RETENTION_DAYS", 30)
+    mock_task_repository.get_change_horizon.return_value = HORIZON
+    mock_task_repository.delete_task_tombstones.return_value = 3
+
+    assert await task_service.prune_task_tombstones() == 3
+    mock_task_repository.delete_task_tombstones.assert_awaited_once_with(
+        before=HORIZON - timedelta(days=30))
+
+
+async def test_get_task_stats(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that stats are read from the counters, with every status and the requested days."""
+    mock_task_repository.get_task_status_counts.return_value = {"new": 2, "completed": 1}
+    mock_task_repository.get_task_daily_counts.return_value = [(date(2026, 1, 1), 3, 1)]
+
+    stats = await task_service.get_task_stats(TEST_USER_ID, days=7)
+
+    assert stats.model_dump(mode="json") == {
+        "total": 3,
+        "by_status": {"new": 2, "in_progress": 0, "completed": 1},
+        "daily": [{"day": "2026-01-01", "created": 3, "completed": 1}],
+    }
+    mock_task_repository.get_task_daily_counts.assert_awaited_once_with(TEST_USER_ID, 7)
+
+
+async def test_get_task_stats_without_days(task_service: TaskService, mock_task_repository: MagicMock):
+    mock_task_repository.get_task_status_counts.return_value = {}
+
+    stats = await task_service.get_task_stats(TEST_USER_ID)
+
+    assert stats.total == 0 and stats.daily is None
+    mock_task_repository.get_task_daily_counts.assert_not_called()
+
+
+async def test_get_task_stats_rejects_days(task_service: TaskService, mock_task_repository: MagicMock, monkeypatch):
+    monkeypatch.setattr("src.config.Settings.TASKS_STATS_MAX_DAYS", 30)
+
+    with pytest.raises(BadRequestException):
+        await task_service.get_task_stats(TEST_USER_ID, days=31)
+    mock_task_repository.get_task_status_counts.assert_not_called()
+
+
+def queued_events(subscription) -> list[TaskEventSchema]:
+    """Takes the events queued on a subscription."""
+    events = []
+    while not subscription._queue.empty():
+        events.append(subscription._queue.get_nowait())
+    return events
+
+
+async def test_writes_publish_task_events(task_service: TaskService, mock_task_repository: MagicMock, mock_task_rows: list):
+    """Test that committed writes publish events to the writer's topic only."""
+    mock_task_repository.add_tasks.return_value = [TaskResponseSchema(**row) for row in mock_task_rows[:2]]
+    mock_task_repository.delete_task.return_value = 101
+    with task_service.events.subscribe(str(TEST_USER_ID)) as mine, \
+            task_service.events.subscribe(str(TEST_USER_ID + 1)) as theirs:
+        await task_service.create_tasks(BulkCreateTaskSchema(items=[
+            {"title": "A", "description": ""}, {"title": "B", "description": ""}]), TEST_USER_ID)
+        await task_service.delete_task(task_id=101, user_id=TEST_USER_ID)
+
+        assert queued_events(mine) == [
+            TaskEventSchema(type=TaskEventType.CREATED, ids=[101, 102]),
+            TaskEventSchema(type=TaskEventType.DELETED, ids=[101]),
+        ]
+        assert queued_events(theirs) == []
+
+
+async def test_bulk_write_events_are_split(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that large bulk writes are announced in several events."""
+    mock_task_repository.update_tasks_status.return_value = list(range(1, 1001))
+    with task_service.events.subscribe(str(TEST_USER_ID)) as subscription:
+        await task_service.update_tasks_status(
+            BulkUpdateStatusSchema(status_filter=TaskStatus.NEW, status=TaskStatus.COMPLETED), TEST_USER_ID)
+
+        events = queued_events(subscription)
+    assert [len(event.ids) for event in events] == [500, 500]
+    assert {event.type for event in events} == {TaskEventType.UPDATED}
+
+
+async def test_stream_task_events(task_service: TaskService, monkeypatch):
+    """Test that events are streamed as SSE, with keep-alives while idle."""
+    monkeypatch.setattr("src.config.Settings.TASKS_STREAM_KEEPALIVE_SECONDS", 0.01)
+    stream = task_service.stream_task_events(TEST_USER_ID)
+
+    assert await anext(stream) == b": connected\n\n"
+    assert await anext(stream) == b": keep-alive\n\n"
+    task_service.events.publish(str(TEST_USER_ID), TaskEventSchema(type=TaskEventType.DELETED, ids=[7]))
+    assert await anext(stream) == b'event: deleted\ndata: {"type":"deleted","ids":[7]}\n\n'
+
+    await stream.aclose()
+    assert str(TEST_USER_ID) not in task_service.events
+
+
+def stream_batches(*batches: list[dict]):
+    """Builds a replacement for ``stream_user_tasks`` yielding ``batches``."""
+    async def stream(**kwargs):
+        for batch in batches:
+            yield batch
+    return MagicMock(side_effect=stream)
+
+
+async def test_export_user_tasks_ndjson(task_service: TaskService, mock_task_repository: MagicMock, mock_task_rows: list):
+    """Test that every streamed batch becomes one NDJSON chunk."""
+    mock_task_repository.stream_user_tasks = stream_batches(mock_task_rows[:2], mock_task_rows[2:])
+
+    chunks = [chunk async for chunk in task_service.export_user_tasks(
+        user_id=TEST_USER_ID, export_format=TaskFileFormat.NDJSON)]
+
+    assert len(chunks) == 2
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [101, 102, 103]
+    assert json.loads(lines[0])["created_at"] == "2025-04-30T08:57:00"
+    mock_task_repository.detached.assert_called_once()
+    mock_task_repository.stream_user_tasks.assert_called_once_with(
+        user_id=TEST_USER_ID, status=None, batch_size=1000)
+
+
+async def test_export_user_tasks_csv(task_service: TaskService, mock_task_repository: MagicMock, mock_task_rows: list):
+    """Test that the CSV export writes the header once, before the first batch."""
+    mock_task_repository.stream_user_tasks = stream_batches(mock_task_rows[:1], mock_task_rows[1:])
+
+    chunks = [chunk async for chunk in task_service.export_user_tasks(
+        user_id=TEST_USER_ID, export_format=TaskFileFormat.CSV, status="new")]
+
+    lines = b"".join(chunks).decode().splitlines()
+    assert lines[0] == "title,description,status,id,updated_at,created_at,user_id"
+    assert lines[1] == "Task 1,Desc 1,new,101,2025-04-30T08:57:00,2025-04-30T08:57:00,1"
+    assert len(lines) == 4
+
+
+async def test_export_user_tasks_csv_empty(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that an empty CSV export still has its header."""
+    mock_task_repository.stream_user_tasks = stream_batches()
+
+    chunks = [chunk async for chunk in task_service.export_user_tasks(
+        user_id=TEST_USER_ID, export_format=TaskFileFormat.CSV)]
+
+    assert b"".join(chunks).decode().splitlines() == [
+        "title,description,status,id,updated_at,created_at,user_id"]
+
+
+
+async def records(*items):
+    """Yields ``items`` as an async stream of import records."""
+    for item in items:
+        yield item
+
+
+async def test_import_tasks_in_chunks(task_service: TaskService, mock_task_repository: MagicMock, monkeypatch):
+    """Test that valid records are copied in chunks and committed once."""
+    monkeypatch.setattr("src.config.Settings.TASKS_IMPORT_CHUNK_SIZE", 2)
+    mock_task_repository.copy_tasks.side_effect = lambda chunk: len(chunk)
+    progress = []
+
+    result = await task_service.import_tasks(
+        records=records(*({"title": f"T{n}", "description": "d"} for n in range(5))),
+        user_id=TEST_USER_ID,
+        on_progress=lambda summary: progress.append(summary.imported),
+    )
+
+    assert (result.imported, result.failed, result.chunks) == (5, 0, 3)
+    assert progress == [2, 4, 5]
+    first_chunk = mock_task_repository.copy_tasks.await_args_list[0].args[0]
+    assert first_chunk == [("T0", "d", "new", TEST_USER_ID), ("T1", "d", "new", TEST_USER_ID)]
+    mock_task_repository.commit.assert_awaited_once()
+
+
+async def test_import_tasks_invalid_record_aborts(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that an invalid record rolls the import back by default."""
+    with pytest.raises(BadRequestException) as exc_info:
+        await task_service.import_tasks(
+            records=records({"title": "ok", "description": "d"}, {"description": "no title"}),
+            user_id=TEST_USER_ID,
+        )
+
+    assert exc_info.value.detail[0]["index"] == 1
+    mock_task_repository.copy_tasks.assert_not_called()
+    mock_task_repository.rollback.assert_awaited_once()
+    mock_task_repository.commit.assert_not_called()
+
+
+async def test_import_tasks_skip_invalid(task_service: TaskService, mock_task_repository: MagicMock, monkeypatch):
+    """Test that skipped records are counted and reported up to the error limit."""
+    monkeypatch.setattr("src.config.Settings.TASKS_IMPORT_MAX_ERRORS", 1)
+    mock_task_repository.copy_tasks.side_effect = lambda chunk: len(chunk)
+
+    result = await task_service.import_tasks(
+        records=records("not json", {"title": "ok", "description": "d"}, {"status": "bogus"}),
+        user_id=TEST_USER_ID,
+        skip_invalid=True,
+    )
+
+    assert (result.imported, result.failed, result.chunks) == (1, 2, 1)
+    assert [error.index for error in result.errors] == [0]
+
+
 @pytest.fixture
 def mock_task() -> TaskModel:
     """Provides a mock Task instance for tests."""
@@ -105,6 +674,78 @@ async def test_create_task(
     assert result.id == 999
 
 
+async def test_create_tasks(task_service: TaskService, mock_task_repository: MagicMock, mock_task_list: list):
+    """Test creating tasks in bulk."""
+    schema = BulkCreateTaskSchema(items=[
+        {"title": "First", "description": "Desc"},
+        {"title": "Second", "description": "Desc", "status": "completed"},
+    ])
+    mock_task_repository.add_tasks.return_value = []
+
+    result = await task_service.create_tasks(schema=schema, user_id=TEST_USER_ID)
+
+    mock_task_repository.add_tasks.assert_awaited_once_with([
+        {"title": "First", "description": "Desc", "status": TaskStatus.NEW, "user_id": TEST_USER_ID},
+        {"title": "Second", "description": "Desc", "status": TaskStatus.COMPLETED, "user_id": TEST_USER_ID},
+    ])
+    assert result.errors == []
+
+
+async def test_create_tasks_returns_created_tasks(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that the tasks the repository returns are read by attribute into the response."""
+    timestamp = datetime(2026, 1, 1, 9)
+    mock_task_repository.add_tasks.return_value = [TaskModel(
+        id=7, title="First", description="Desc", status="new", user_id=TEST_USER_ID,
+        created_at=timestamp, updated_at=timestamp)]
+
+    result = await task_service.create_tasks(
+        schema=BulkCreateTaskSchema(items=[{"title": "First", "description": "Desc"}]),
+        user_id=TEST_USER_ID)
+
+    assert [(task.id, task.title, task.created_at) for task in result.created] == [(7, "First", timestamp)]
+
+
+async def test_create_tasks_invalid_item_aborts(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that an invalid item rejects the whole batch by default."""
+    schema = BulkCreateTaskSchema(items=[
+        {"title": "First", "description": "Desc"},
+        {"title": "No description"},
+    ])
+
+    with pytest.raises(BadRequestException) as exc_info:
+        await task_service.create_tasks(schema=schema, user_id=TEST_USER_ID)
+
+    assert exc_info.value.detail[0]["index"] == 1
+    assert exc_info.value.detail[0]["errors"][0]["loc"] == ("description",)
+    mock_task_repository.add_tasks.assert_not_called()
+
+
+async def test_create_tasks_skip_invalid(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that invalid items are reported while valid ones are created."""
+    schema = BulkCreateTaskSchema(items=[
+        {"title": "First", "description": "Desc", "status": "unknown"},
+        {"title": "Second", "description": "Desc"},
+    ], skip_invalid=True)
+    mock_task_repository.add_tasks.return_value = []
+
+    result = await task_service.create_tasks(schema=schema, user_id=TEST_USER_ID)
+
+    assert [error.index for error in result.errors] == [0]
+    values = mock_task_repository.add_tasks.call_args[0][0]
+    assert [value["title"] for value in values] == ["Second"]
+
+
+async def test_create_tasks_too_many(task_service: TaskService, mock_task_repository: MagicMock, monkeypatch):
+    """Test that batches over the configured maximum are rejected."""
+    monkeypatch.setattr("src.config.Settings.TASKS_BULK_MAX_ITEMS", 1)
+    schema = BulkCreateTaskSchema(items=[{"title": "a", "description": "b"}] * 2)
+
+    with pytest.raises(BadRequestException):
+        await task_service.create_tasks(schema=schema, user_id=TEST_USER_ID)
+
+    mock_task_repository.add_tasks.assert_not_called()
+
+
 @pytest.fixture
 def update_schema(mock_task: TaskModel) -> UpdateTaskSchema:
     return UpdateTaskSchema(id=mock_task.id, title="Updated Service Title", status=TaskStatus.COMPLETED)
@@ -112,16 +753,18 @@ def update_schema(mock_task: TaskModel) -> UpdateTaskSchema:
 
 async def test_update_task_success(task_service: TaskService, mock_task_repository: MagicMock, mock_task: TaskModel, update_schema: UpdateTaskSchema):
     """Test successfully updating a task."""
-    user_id = mock_task.user_id
-
-    mock_task_repository.get_task.return_value = mock_task
-
-    mock_task_repository.update_task = AsyncMock()
+    user_id = TEST_USER_ID
+    mock_task.title = update_schema.title
+    mock_task.status = update_schema.status
+    mock_task_repository.update_task.return_value = mock_task
 
     result = await task_service.update_task(schema=update_schema, user_id=user_id)
 
-    mock_task_repository.get_task.assert_awaited_once_with(update_schema.id)
-    mock_task_repository.update_task.assert_awaited_once()
+    mock_task_repository.update_task.assert_awaited_once_with(
+        task_id=update_schema.id, user_id=user_id,
+        title=update_schema.title, status=update_schema.status)
+    mock_task_repository.get_task.assert_not_called()
+    mock_task_repository.get_task_owner.assert_not_called()
 
     assert result == mock_task
     assert result.title == update_schema.title
@@ -131,64 +774,101 @@ async def test_update_task_success(task_service: TaskService, mock_task_reposito
 async def test_update_task_not_found(task_service: TaskService, mock_task_repository: MagicMock, update_schema: UpdateTaskSchema):
     """Test updating task when task not found."""
     user_id = TEST_USER_ID
-    mock_task_repository.get_task.return_value = None
+    mock_task_repository.update_task.return_value = None
+    mock_task_repository.get_task_owner.return_value = None
 
     with pytest.raises(NotFoundException):
         await task_service.update_task(schema=update_schema, user_id=user_id)
 
-    mock_task_repository.get_task.assert_awaited_once_with(update_schema.id)
-    mock_task_repository.update_task.assert_not_called()
+    mock_task_repository.get_task_owner.assert_awaited_once_with(update_schema.id)
 
 
-async def test_update_task_unauthorized(task_service: TaskService, mock_task_repository: MagicMock, mock_task: TaskModel, update_schema: UpdateTaskSchema):
+async def test_update_task_unauthorized(task_service: TaskService, mock_task_repository: MagicMock, update_schema: UpdateTaskSchema):
     """Test updating task when user is not authorized."""
     user_id = 999
-    assert mock_task.user_id != user_id
-    mock_task_repository.get_task.return_value = mock_task
+    mock_task_repository.update_task.return_value = None
+    mock_task_repository.get_task_owner.return_value = TEST_USER_ID
 
     with pytest.raises(UnAuthorizedException):
         await task_service.update_task(schema=update_schema, user_id=user_id)
 
-    mock_task_repository.get_task.assert_awaited_once_with(update_schema.id)
-    mock_task_repository.update_task.assert_not_called()
+    mock_task_repository.get_task_owner.assert_awaited_once_with(update_schema.id)
 
 
 async def test_delete_task_success(task_service: TaskService, mock_task_repository: MagicMock, mock_task: TaskModel):
     """Test successfully deleting a task."""
-    user_id = mock_task.user_id
+    user_id = TEST_USER_ID
     task_id_to_delete = mock_task.id
-
-    mock_task_repository.get_task.return_value = mock_task
-    mock_task_repository.delete_task = AsyncMock()
+    mock_task_repository.delete_task.return_value = task_id_to_delete
 
     await task_service.delete_task(task_id=task_id_to_delete, user_id=user_id)
 
-    mock_task_repository.get_task.assert_awaited_once_with(task_id_to_delete)
-    mock_task_repository.delete_task.assert_awaited_once_with(mock_task)
+    mock_task_repository.delete_task.assert_awaited_once_with(
+        task_id=task_id_to_delete, user_id=user_id)
+    mock_task_repository.get_task_owner.assert_not_called()
 
 
 async def test_delete_task_not_found(task_service: TaskService, mock_task_repository: MagicMock):
     """Test deleting task when task not found."""
     user_id = TEST_USER_ID
     task_id_to_delete = 999
-    mock_task_repository.get_task.return_value = None
+    mock_task_repository.delete_task.return_value = None
+    mock_task_repository.get_task_owner.return_value = None
 
     with pytest.raises(NotFoundException):
         await task_service.delete_task(task_id=task_id_to_delete, user_id=user_id)
 
-    mock_task_repository.get_task.assert_awaited_once_with(task_id_to_delete)
-    mock_task_repository.delete_task.assert_not_called()
+    mock_task_repository.get_task_owner.assert_awaited_once_with(task_id_to_delete)
 
 
 async def test_delete_task_unauthorized(task_service: TaskService, mock_task_repository: MagicMock, mock_task: TaskModel):
     """Test deleting task when user is not authorized."""
     user_id = 999
     task_id_to_delete = mock_task.id
-    assert mock_task.user_id != user_id
-    mock_task_repository.get_task.return_value = mock_task
+    mock_task_repository.delete_task.return_value = None
+    mock_task_repository.get_task_owner.return_value = TEST_USER_ID
 
     with pytest.raises(UnAuthorizedException):
         await task_service.delete_task(task_id=task_id_to_delete, user_id=user_id)
 
-    mock_task_repository.get_task.assert_awaited_once_with(task_id_to_delete)
-    mock_task_repository.delete_task.assert_not_called()
+    mock_task_repository.get_task_owner.assert_awaited_once_with(task_id_to_delete)
+
+
+async def test_update_tasks_status_reports_rejected_ids(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that skipped IDs are split into missing and not owned."""
+    schema = BulkUpdateStatusSchema(ids=[1, 2, 3, 3], status=TaskStatus.COMPLETED)
+    mock_task_repository.update_tasks_status.return_value = [1]
+    mock_task_repository.get_existing_task_ids.return_value = [3]
+
+    result = await task_service.update_tasks_status(schema=schema, user_id=TEST_USER_ID)
+
+    mock_task_repository.update_tasks_status.assert_awaited_once_with(
+        user_id=TEST_USER_ID, status=TaskStatus.COMPLETED, ids=[1, 2, 3, 3], status_filter=None)
+    mock_task_repository.get_existing_task_ids.assert_awaited_once_with([2, 3])
+    assert result.affected == [1]
+    assert result.missing == [2]
+    assert result.not_owned == [3]
+
+
+async def test_delete_tasks_by_status(task_service: TaskService, mock_task_repository: MagicMock):
+    """Test that filter-based deletes need no follow-up query."""
+    schema = BulkTaskSelectionSchema(status_filter=TaskStatus.COMPLETED)
+    mock_task_repository.delete_tasks.return_value = [4, 5]
+
+    result = await task_service.delete_tasks(schema=schema, user_id=TEST_USER_ID)
+
+    mock_task_repository.delete_tasks.assert_awaited_once_with(
+        user_id=TEST_USER_ID, ids=None, status_filter=TaskStatus.COMPLETED)
+    mock_task_repository.get_existing_task_ids.assert_not_called()
+    assert result.affected == [4, 5]
+    assert result.missing == result.not_owned == []
+
+
+async def test_delete_tasks_too_many(task_service: TaskService, mock_task_repository: MagicMock, monkeypatch):
+    """Test that selections over the configured maximum are rejected."""
+    monkeypatch.setattr("src.config.Settings.TASKS_BULK_MAX_ITEMS", 2)
+
+    with pytest.raises(BadRequestException):
+        await task_service.delete_tasks(schema=BulkTaskSelectionSchema(ids=[1, 2, 3]), user_id=TEST_USER_ID)
+
+    mock_task_repository.delete_tasks.assert_not_called()
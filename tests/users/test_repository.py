@@ -70,18 +70,19 @@ async def test_create_user(user_repository: UserRepository, mock_session: AsyncM
     new_user = User(username="newbie", password="pw",
                     first_name="New", last_name="Bie")
 
-    async def mock_refresh(obj):
-        obj.id = 5
+    async def mock_commit():
+        # The INSERT ... RETURNING issued on flush fills in generated columns.
+        new_user.id = 5
 
-    mock_session.refresh.side_effect = mock_refresh
+    mock_session.commit.side_effect = mock_commit
 
     created_user = await user_repository.create_user(new_user)
 
     mock_session.add.assert_called_once_with(new_user)
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(new_user)
+    mock_session.refresh.assert_not_called()
     assert created_user == new_user
-    assert created_user.id == 5  # Check if refresh worked
+    assert created_user.id == 5
 
 
 async def test_update_user(user_repository: UserRepository, mock_session: AsyncMock):
@@ -83,7 +83,7 @@ async def test_register_success(
 
     assert isinstance(response, JSONResponse)
     assert response.status_code == status.HTTP_201_CREATED
-    assert response.body == b'{"access_token":"fake_access_token"}'
+    assert response.render_body() == b'{"access_token":"fake_access_token"}'
     assert "refresh_token" in response.headers["set-cookie"]
 
 
@@ -172,7 +172,7 @@ async def test_refresh_success(
     assert response.status_code == status.HTTP_200_OK
 
     expected_content = {"access_token": "new_" + ACCESS_TOKEN}
-    assert json.loads(response.body.decode()) == expected_content
+    assert json.loads(response.render_body()) == expected_content
 
     assert f"refresh_token=new_{REFRESH_TOKEN}" in response.headers.get(
         "set-cookie", "")